@@ -0,0 +1,34 @@
+"""Add track catalog version table"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250315a002"
+down_revision: Union[str, Sequence[str], None] = "20250301a001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema with the catalog version stamp table."""
+    op.create_table(
+        "track_catalog_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("applied_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_track_catalog_versions_version", "track_catalog_versions", ["version"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema removing the catalog version stamp table."""
+    op.drop_index("ix_track_catalog_versions_version", table_name="track_catalog_versions")
+    op.drop_table("track_catalog_versions")
@@ -0,0 +1,24 @@
+"""Index gamification profiles by total XP for the leaderboard"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250320a003"
+down_revision: Union[str, Sequence[str], None] = "20250315a002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema with the leaderboard index."""
+    op.create_index(
+        "ix_gamification_profiles_total_xp", "gamification_profiles", ["total_xp"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema removing the leaderboard index."""
+    op.drop_index("ix_gamification_profiles_total_xp", table_name="gamification_profiles")
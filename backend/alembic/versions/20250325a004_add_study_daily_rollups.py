@@ -0,0 +1,46 @@
+"""Add per-day study rollup table"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250325a004"
+down_revision: Union[str, Sequence[str], None] = "20250320a003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema with study_daily_rollups, backfilled from study_sessions.
+
+    `python -m scripts.backfill_study_rollups` recomputes it later if needed.
+    """
+    op.create_table(
+        "study_daily_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # Reads move to the rollup, so fill it now or existing users would see
+    # zero hours and no streak until the backfill script runs
+    if op.get_bind().dialect.name == "postgresql":
+        day = "CAST(date_trunc('day', session_date) AS DATE)"
+    else:
+        day = "date(session_date)"
+    op.execute(
+        "INSERT INTO study_daily_rollups (user_id, day, minutes, sessions) "
+        f"SELECT user_id, {day}, SUM(duration_minutes), COUNT(*) "
+        f"FROM study_sessions GROUP BY user_id, {day}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema removing study_daily_rollups."""
+    op.drop_table("study_daily_rollups")
@@ -0,0 +1,39 @@
+"""Add composite indexes for per-user hot query paths"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250401a005"
+down_revision: Union[str, Sequence[str], None] = "20250325a004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_activity_logs_user_id_created_at", "activity_logs", ["user_id", "created_at"]),
+    ("ix_study_sessions_user_id_session_date", "study_sessions", ["user_id", "session_date"]),
+    ("ix_user_project_submissions_user_id_created_at", "user_project_submissions", ["user_id", "created_at"]),
+    ("ix_user_project_submissions_status_created_at", "user_project_submissions", ["status", "created_at"]),
+    ("ix_study_tasks_user_id", "study_tasks", ["user_id"]),
+    ("ix_user_rewards_user_id_created_at", "user_rewards", ["user_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema with the composite indexes, built without locking writes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema removing the composite indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
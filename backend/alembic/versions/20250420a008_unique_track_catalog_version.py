@@ -0,0 +1,36 @@
+"""Make track catalog version stamps unique"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250420a008"
+down_revision: Union[str, Sequence[str], None] = "20250415a007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: one row per catalog version.
+
+    Workers seeding concurrently could insert the same stamp twice; keep the
+    newest row of each version before adding the unique index.
+    """
+    op.execute(
+        "DELETE FROM track_catalog_versions WHERE id NOT IN "
+        "(SELECT MAX(id) FROM track_catalog_versions GROUP BY version)"
+    )
+    op.drop_index("ix_track_catalog_versions_version", table_name="track_catalog_versions")
+    op.create_index(
+        "ix_track_catalog_versions_version", "track_catalog_versions", ["version"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema back to a non-unique version index."""
+    op.drop_index("ix_track_catalog_versions_version", table_name="track_catalog_versions")
+    op.create_index(
+        "ix_track_catalog_versions_version", "track_catalog_versions", ["version"], unique=False
+    )
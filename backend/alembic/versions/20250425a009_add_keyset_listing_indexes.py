@@ -0,0 +1,36 @@
+"""Add (created_at, id) indexes for the unfiltered keyset listings"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20250425a009"
+down_revision: Union[str, Sequence[str], None] = "20250420a008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# /users/ and unfiltered /projects/all page by (created_at DESC, id DESC)
+INDEXES = [
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+    ("ix_user_project_submissions_created_at_id", "user_project_submissions", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema with the listing indexes, built without locking writes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema removing the listing indexes."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
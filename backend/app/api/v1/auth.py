@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form
-from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from fastapi.security import HTTPAuthorizationCredentials, OAuth2PasswordRequestForm
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Dict, Any, Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.core.security import security_service
-from app.core.auth import get_current_active_user
-from app.repositories.base import UserRepository
+from app.core.auth import get_current_active_user, security
+from app.core.principal_cache import principal_cache
+from app.repositories.base import RefreshTokenRepository, UserRepository
+from app.services.token_revocation import token_revocation
 from app.models.models import Token, LoginRequest, TokenRefresh, UserResponse
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import logging
+import secrets
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +21,14 @@ router = APIRouter()
 INVALID_TOKEN_MSG = "Invalid or expired token"
 
 
+def _refresh_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=security_service.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Authenticate user and return JWT tokens"""
     user_repo = UserRepository(session)
@@ -34,7 +41,7 @@ async def login(
         )
     
     # Authenticate user (username can be email or username)
-    user = user_repo.authenticate(form_data.username.lower().strip(), form_data.password)
+    user = await user_repo.authenticate(form_data.username.lower().strip(), form_data.password)
     if not user:
         # Generic error message to prevent user enumeration
         logger.warning(f"Failed login attempt for username: {form_data.username}")
@@ -56,9 +63,15 @@ async def login(
         data={"sub": str(user.id), "email": user.email, "role": user.role}
     )
     
-    # Create refresh token
+    # Create refresh token, starting a new rotation family
+    family_id = secrets.token_urlsafe(16)
+    jti = secrets.token_urlsafe(32)
+    expires_at = _refresh_expiry()
     refresh_token = security_service.create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data={"sub": str(user.id), "email": user.email, "fam": family_id}, jti=jti, expires_at=expires_at
+    )
+    await RefreshTokenRepository(session).create_family(
+        family_id, user.id, jti, security_service.token_digest(refresh_token), expires_at.replace(tzinfo=None)
     )
     
     logger.info(f"User {user.email} logged in successfully")
@@ -73,39 +86,52 @@ async def login(
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     refresh_data: TokenRefresh,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
-    """Refresh access token using refresh token"""
+    """Rotate the refresh token and issue a new access token.
+
+    Each refresh token is single use: the family row is swapped to the new
+    token in one indexed `UPDATE ... RETURNING`. Presenting a token that was
+    already rotated means it leaked, so the whole family is revoked.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    # Verify refresh token
+    # Verify refresh token (tokens issued before rotation have no family)
     payload = security_service.verify_token(refresh_data.refresh_token, "refresh")
-    if payload is None:
+    if payload is None or not payload.get("fam") or not payload.get("sub"):
         raise credentials_exception
+    family_id = payload["fam"]
     
-    # Get user ID from token
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
+    new_jti = secrets.token_urlsafe(32)
+    expires_at = _refresh_expiry()
+    new_refresh_token = security_service.create_refresh_token(
+        data={"sub": payload["sub"], "email": payload.get("email"), "fam": family_id},
+        jti=new_jti,
+        expires_at=expires_at,
+    )
     
-    # Get user from database
-    user_repo = UserRepository(session)
-    user = user_repo.get_by_id(int(user_id))
-    if user is None or not user.is_active:
+    repo = RefreshTokenRepository(session)
+    rotated = await repo.rotate(
+        family_id,
+        payload["jti"],
+        security_service.token_digest(refresh_data.refresh_token),
+        new_jti,
+        security_service.token_digest(new_refresh_token),
+        expires_at.replace(tzinfo=None),
+    )
+    if rotated is None:
+        if await repo.revoke_family(family_id, "reuse", stale_jti=payload["jti"]):
+            logger.warning(f"Refresh token reuse for user {payload['sub']}; token family revoked")
         raise credentials_exception
+    user_id, email, role = rotated
     
     # Create new access token
     access_token = security_service.create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role}
-    )
-    
-    # Create new refresh token
-    new_refresh_token = security_service.create_refresh_token(
-        data={"sub": str(user.id), "email": user.email}
+        data={"sub": str(user_id), "email": email, "role": role}
     )
     
     return Token(
@@ -116,21 +142,38 @@ async def refresh_token(
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard tokens)"""
-    # In a production app, you might want to blacklist the token
-    # For now, we'll just return success and let the client handle token removal
+async def logout(
+    refresh_data: Optional[TokenRefresh] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Logout user: revoke the access token and, when sent, the refresh token"""
+    payload = security_service.verify_token(credentials.credentials, "access")
+    if payload is None or await token_revocation.is_revoked(session, payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=INVALID_TOKEN_MSG,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    await token_revocation.revoke(session, credentials.credentials, "access")
+    if refresh_data is not None:
+        refresh_payload = security_service.verify_token(refresh_data.refresh_token, "refresh")
+        if refresh_payload is not None and refresh_payload.get("sub") == payload.get("sub") and refresh_payload.get("fam"):
+            await RefreshTokenRepository(session).revoke_family(refresh_payload["fam"], "logout")
+    
+    logger.info(f"User {payload.get('sub')} logged out")
     return {"message": "Successfully logged out"}
 
 
 @router.post("/forgot-password")
 async def forgot_password(
     email: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Request password reset"""
     user_repo = UserRepository(session)
-    user = user_repo.get_by_email(email)
+    user = await user_repo.get_by_email(email)
     
     # Always return success to prevent email enumeration
     if user and user.is_active:
@@ -143,7 +186,7 @@ async def forgot_password(
         
         # Store token in database (in production, you might want to hash this)
         user.password_reset_token = reset_token
-        session.commit()
+        await session.commit()
     
     return {"message": "If the email exists, a password reset link has been sent"}
 
@@ -152,7 +195,7 @@ async def forgot_password(
 async def reset_password(
     token: str,
     new_password: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Reset password using token"""
     # Verify reset token
@@ -165,7 +208,7 @@ async def reset_password(
     
     # Get user
     user_repo = UserRepository(session)
-    user = user_repo.get_by_email(email)
+    user = await user_repo.get_by_email(email)
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,11 +223,16 @@ async def reset_password(
         )
     
     # Update password
-    user.hashed_password = security_service.get_password_hash(new_password)
+    user_id, user_email = user.id, user.email
+    user.hashed_password = await security_service.get_password_hash_async(new_password)
     user.password_reset_token = None  # Clear the reset token
-    session.commit()
     
-    logger.info(f"Password reset successful for user: {user.email}")
+    # Sign out every existing session: a stolen refresh token must not
+    # survive the reset (commits the password change in the same transaction)
+    await RefreshTokenRepository(session).revoke_user_families(user_id, "password_reset")
+    principal_cache.invalidate_user(user_id)
+    
+    logger.info(f"Password reset successful for user: {user_email}")
     
     return {"message": "Password reset successful"}
 
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.core.auth import get_current_active_user
+from app.core.pagination import parse_cursor, set_next_cursor
 from app.services.gamification_service import GamificationService
 from app.models.models import (
     UserResponse,
@@ -18,6 +19,7 @@ from app.models.models import (
     UserRewardUpdate,
     UserRewardResponse,
     ProfileDetailsResponse,
+    LeaderboardPositionResponse,
 )
 import logging
 
@@ -29,11 +31,11 @@ router = APIRouter()
 @router.get("/profile", response_model=GamificationProfileResponse)
 async def get_gamification_profile(
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get current user's gamification profile"""
     gamification_service = GamificationService(session)
-    profile = gamification_service.get_user_profile(current_user.id)
+    profile = await gamification_service.get_user_profile(current_user.id)
     
     if not profile:
         raise HTTPException(
@@ -47,28 +49,28 @@ async def get_gamification_profile(
 @router.get("/dashboard", response_model=DashboardResponse)
 async def get_dashboard_data(
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Aggregate dashboard data for the current user"""
     gamification_service = GamificationService(session)
-    return gamification_service.get_dashboard_data(current_user.id)
+    return await gamification_service.get_dashboard_data(current_user.id)
 
 
 @router.put("/tasks", response_model=List[StudyTaskResponse])
 async def sync_tasks(
     tasks: List[StudyTaskCreate],
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Replace dashboard tasks (used for migration from localStorage)"""
     gamification_service = GamificationService(session)
 
     if tasks:
         payload = [task.model_dump() for task in tasks]
-        return gamification_service.replace_tasks(current_user.id, payload)
+        return await gamification_service.replace_tasks(current_user.id, payload)
 
     # No tasks provided - return existing tasks to keep defaults
-    return gamification_service.get_dashboard_data(current_user.id).tasks
+    return (await gamification_service.get_dashboard_data(current_user.id)).tasks
 
 
 @router.patch("/tasks/{task_id}", response_model=StudyTaskResponse)
@@ -76,11 +78,11 @@ async def update_task_completion(
     task_id: int,
     update: StudyTaskCompletionUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Toggle completion state of a dashboard task"""
     gamification_service = GamificationService(session)
-    updated = gamification_service.update_task_completion(
+    updated = await gamification_service.update_task_completion(
         user_id=current_user.id,
         task_id=task_id,
         completed=update.completed,
@@ -98,18 +100,18 @@ async def update_task_completion(
 @router.get("/rewards", response_model=List[UserRewardResponse])
 async def list_rewards(
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List custom rewards for the current user"""
     gamification_service = GamificationService(session)
-    return gamification_service.get_rewards(current_user.id)
+    return await gamification_service.get_rewards(current_user.id)
 
 
 @router.post("/rewards", response_model=UserRewardResponse, status_code=status.HTTP_201_CREATED)
 async def create_reward(
     reward: UserRewardCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a custom reward"""
     if not reward.condition.strip() or not reward.reward.strip():
@@ -119,7 +121,7 @@ async def create_reward(
         )
 
     gamification_service = GamificationService(session)
-    return gamification_service.create_reward(current_user.id, reward)
+    return await gamification_service.create_reward(current_user.id, reward)
 
 
 @router.patch("/rewards/{reward_id}", response_model=UserRewardResponse)
@@ -127,7 +129,7 @@ async def update_reward(
     reward_id: int,
     update: UserRewardUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update or mark a reward as achieved"""
     if update.achieved is None and not update.condition and not update.reward:
@@ -137,7 +139,7 @@ async def update_reward(
         )
 
     gamification_service = GamificationService(session)
-    updated = gamification_service.update_reward(current_user.id, reward_id, update)
+    updated = await gamification_service.update_reward(current_user.id, reward_id, update)
 
     if not updated:
         raise HTTPException(
@@ -151,11 +153,11 @@ async def update_reward(
 @router.get("/profile/details", response_model=ProfileDetailsResponse)
 async def get_profile_details(
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Return extended profile details with achievements and rewards"""
     gamification_service = GamificationService(session)
-    return gamification_service.get_profile_details(current_user.id)
+    return await gamification_service.get_profile_details(current_user.id)
 
 
 @router.post("/complete-trilha", response_model=GamificationProfileResponse)
@@ -163,7 +165,7 @@ async def complete_trilha(
     trilha_name: str,
     xp_earned: int = 100,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Complete a trilha and award XP"""
     # Input validation with enhanced security
@@ -191,7 +193,7 @@ async def complete_trilha(
     trilha_name = re.sub(r'[<>"\'/\\&]', '', trilha_name)
     
     gamification_service = GamificationService(session)
-    return gamification_service.complete_trilha(
+    return await gamification_service.complete_trilha(
         user_id=current_user.id,
         trilha_name=trilha_name,
         xp_earned=xp_earned
@@ -202,7 +204,7 @@ async def complete_trilha(
 async def log_pomodoro_session(
     duration_minutes: int,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Log a completed Pomodoro session"""
     if not isinstance(duration_minutes, int) or duration_minutes <= 0 or duration_minutes > 120:
@@ -212,7 +214,7 @@ async def log_pomodoro_session(
         )
     
     gamification_service = GamificationService(session)
-    return gamification_service.log_pomodoro_session(
+    return await gamification_service.log_pomodoro_session(
         user_id=current_user.id,
         duration_minutes=duration_minutes
     )
@@ -224,7 +226,7 @@ async def add_xp(
     activity_type: ActivityType,
     description: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Add XP to current user (for manual activities)"""
     if not isinstance(xp_amount, int) or xp_amount <= 0 or xp_amount > 1000:
@@ -252,7 +254,7 @@ async def add_xp(
     description = re.sub(r'[<>"\'/\\&]', '', description)
     
     gamification_service = GamificationService(session)
-    return gamification_service.add_xp(
+    return await gamification_service.add_xp(
         user_id=current_user.id,
         xp_amount=xp_amount,
         activity_type=activity_type,
@@ -262,10 +264,12 @@ async def add_xp(
 
 @router.get("/activity-logs", response_model=List[ActivityLogResponse])
 async def get_activity_logs(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get current user's activity logs"""
     # Validate pagination parameters
@@ -279,17 +283,20 @@ async def get_activity_logs(
         limit = min(max(limit, 1), 100)
     
     gamification_service = GamificationService(session)
-    return gamification_service.get_activity_logs(
+    activities = await gamification_service.get_activity_logs(
         user_id=current_user.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=parse_cursor(cursor)
     )
+    set_next_cursor(response, activities, limit)
+    return activities
 
 
 @router.get("/leaderboard")
 async def get_leaderboard(
     limit: int = 10,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get XP leaderboard (public endpoint)"""
     # Validate limit parameter
@@ -297,13 +304,26 @@ async def get_leaderboard(
         limit = min(max(limit, 1), 50)
     
     gamification_service = GamificationService(session)
-    return gamification_service.get_leaderboard(limit=limit)
+    return await gamification_service.get_leaderboard(limit=limit)
+
+
+@router.get("/leaderboard/me", response_model=LeaderboardPositionResponse)
+async def get_my_leaderboard_position(
+    radius: int = 2,
+    current_user: UserResponse = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Get the current user's rank and the players around them"""
+    radius = min(max(radius, 0), 10)
+
+    gamification_service = GamificationService(session)
+    return await gamification_service.get_leaderboard_position(current_user.id, radius=radius)
 
 
 @router.get("/profile/{user_id}", response_model=GamificationProfileResponse)
 async def get_user_gamification_profile(
     user_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get user's gamification profile (public endpoint)"""
     # Validate user_id
@@ -314,7 +334,7 @@ async def get_user_gamification_profile(
         )
     
     gamification_service = GamificationService(session)
-    profile = gamification_service.get_user_profile(user_id)
+    profile = await gamification_service.get_user_profile(user_id)
     
     if not profile:
         raise HTTPException(
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.core.auth import get_current_active_user, get_current_moderator_user
+from app.core.pagination import parse_cursor, set_next_cursor
 from app.services.user_service import ProjectService
 from app.models.models import (
     UserResponse, UserProjectSubmissionCreate, 
@@ -24,11 +25,11 @@ PROJECT_NOT_FOUND_MSG = "Project submission not found"
 async def submit_project(
     submission_data: UserProjectSubmissionCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Submit a new project"""
     project_service = ProjectService(session)
-    return project_service.create_submission(
+    return await project_service.create_submission(
         user_id=current_user.id,
         submission_data=submission_data
     )
@@ -36,28 +37,33 @@ async def submit_project(
 
 @router.get("/my-submissions", response_model=List[UserProjectSubmissionResponse])
 async def get_my_submissions(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get current user's project submissions"""
     if limit > 100:
         limit = 100
     
     project_service = ProjectService(session)
-    return project_service.get_user_submissions(
+    submissions = await project_service.get_user_submissions(
         user_id=current_user.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=parse_cursor(cursor)
     )
+    set_next_cursor(response, submissions, limit)
+    return submissions
 
 
 @router.get("/submission/{submission_id}", response_model=UserProjectSubmissionResponse)
 async def get_submission(
     submission_id: int,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get project submission by ID"""
     # Validate submission_id
@@ -68,7 +74,7 @@ async def get_submission(
         )
     
     project_service = ProjectService(session)
-    submission = project_service.get_submission(
+    submission = await project_service.get_submission(
         submission_id=submission_id,
         user_id=current_user.id
     )
@@ -87,7 +93,7 @@ async def update_submission(
     submission_id: int,
     update_data: UserProjectSubmissionUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update project submission"""
     # Validate submission_id
@@ -98,7 +104,7 @@ async def update_submission(
         )
     
     project_service = ProjectService(session)
-    return project_service.update_submission(
+    return await project_service.update_submission(
         submission_id=submission_id,
         user_id=current_user.id,
         update_data=update_data
@@ -107,11 +113,13 @@ async def update_submission(
 
 @router.get("/all-submissions", response_model=List[UserProjectSubmissionResponse])
 async def get_all_submissions(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     status_filter: Optional[ProjectStatus] = None,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_moderator_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get all project submissions (moderator/admin only)"""
     # Validate pagination parameters
@@ -125,20 +133,25 @@ async def get_all_submissions(
         limit = min(max(limit, 1), 100)
     
     project_service = ProjectService(session)
-    return project_service.get_all_submissions(
+    submissions = await project_service.get_all_submissions(
         skip=skip,
         limit=limit,
-        status_filter=status_filter.value if status_filter else None
+        status_filter=status_filter.value if status_filter else None,
+        cursor=parse_cursor(cursor)
     )
+    set_next_cursor(response, submissions, limit)
+    return submissions
 
 
 @router.get("/user/{user_id}/submissions", response_model=List[UserProjectSubmissionResponse])
 async def get_user_submissions(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_moderator_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get user's project submissions (moderator/admin only)"""
     # Validate user_id
@@ -159,17 +172,20 @@ async def get_user_submissions(
         limit = min(max(limit, 1), 100)
     
     project_service = ProjectService(session)
-    return project_service.get_user_submissions(
+    submissions = await project_service.get_user_submissions(
         user_id=user_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=parse_cursor(cursor)
     )
+    set_next_cursor(response, submissions, limit)
+    return submissions
 
 
 @router.get("/public/submission/{submission_id}", response_model=UserProjectSubmissionResponse)
 async def get_public_submission(
     submission_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get approved project submission (public endpoint)"""
     # Validate submission_id
@@ -180,7 +196,7 @@ async def get_public_submission(
         )
     
     project_service = ProjectService(session)
-    submission = project_service.get_submission(submission_id=submission_id)
+    submission = await project_service.get_submission(submission_id=submission_id)
     
     if not submission:
         raise HTTPException(
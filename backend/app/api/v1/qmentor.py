@@ -1,11 +1,14 @@
 """
 Q-Mentor API endpoints for AI-powered career guidance
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import logging
 
+from app.core.sse import format_sse, sse_response
+from app.services.qmentor_client import QMentorUnavailableError
+from app.services.qmentor_jobs import JobQueueFullError, QMentorJob, learning_path_jobs
 from app.services.qmentor_service import q_mentor_service
 
 logger = logging.getLogger(__name__)
@@ -61,7 +64,7 @@ async def get_career_guidance(request: CareerGuidanceRequest):
     try:
         logger.info(f"Q-Mentor guidance request: {request.query}")
         
-        result = q_mentor_service.get_career_guidance(
+        result = await q_mentor_service.get_career_guidance(
             user_query=request.query,
             user_profile=request.user_profile
         )
@@ -75,6 +78,46 @@ async def get_career_guidance(request: CareerGuidanceRequest):
             detail="Erro interno do Q-Mentor. Tente novamente em alguns minutos."
         )
 
+@router.post(
+    "/guidance/stream",
+    summary="Stream AI-powered career guidance",
+    description="Same as /guidance, streamed as Server-Sent Events: `token` events carry text chunks, "
+                "followed by a final `done` or `error` event"
+)
+async def stream_career_guidance(request: CareerGuidanceRequest):
+    """
+    Stream career guidance from Q-Mentor as it is generated
+    
+    Each `token` event carries `{"text": ...}`; the stream ends with
+    `done` (`{"status": "success", "query": ...}`) or `error` (`{"message": ...}`).
+    """
+    logger.info(f"Q-Mentor guidance stream request: {request.query}")
+    
+    async def events():
+        try:
+            async for text in q_mentor_service.stream_career_guidance(
+                user_query=request.query,
+                user_profile=request.user_profile
+            ):
+                yield format_sse({"text": text}, event="token")
+        except QMentorUnavailableError:
+            yield format_sse(
+                {"message": "Q-Mentor está temporariamente indisponível. Tente novamente mais tarde."},
+                event="error"
+            )
+            return
+        except Exception as e:
+            logger.error(f"Career guidance stream error: {e}")
+            yield format_sse(
+                {"message": "Desculpe, encontrei um problema ao processar sua pergunta. Tente reformular ou tente novamente em alguns minutos."},
+                event="error"
+            )
+            return
+        
+        yield format_sse({"status": "success", "query": request.query}, event="done")
+    
+    return sse_response(events())
+
 @router.post(
     "/quantum-recommendations",
     response_model=QuantumRecommendationResponse,
@@ -91,7 +134,7 @@ async def get_quantum_recommendations(request: QuantumRecommendationRequest):
     try:
         logger.info(f"Quantum recommendations for: {request.career_area}")
         
-        result = q_mentor_service.get_quantum_safe_recommendations(
+        result = await q_mentor_service.get_quantum_safe_recommendations(
             career_area=request.career_area,
             experience_level=request.experience_level
         )
@@ -121,7 +164,7 @@ async def analyze_learning_path(request: LearningPathRequest):
     try:
         logger.info(f"Learning path analysis: {request.current_skills} -> {request.target_role}")
         
-        result = q_mentor_service.analyze_learning_path(
+        result = await q_mentor_service.analyze_learning_path(
             current_skills=request.current_skills,
             target_role=request.target_role
         )
@@ -135,6 +178,81 @@ async def analyze_learning_path(request: LearningPathRequest):
             detail="Erro na análise do caminho de aprendizado."
         )
 
+@router.post(
+    "/learning-path/jobs",
+    response_model=QMentorJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a learning path analysis",
+    description="Enqueue the learning path analysis and return a job id immediately; "
+                "poll /jobs/{job_id} or subscribe to /jobs/{job_id}/events for the result"
+)
+async def submit_learning_path_job(request: LearningPathRequest, http_request: Request, response: Response):
+    """
+    Queue a learning path analysis as a background job
+    
+    Answers 503 with Retry-After when the queue is full.
+    """
+    try:
+        job = learning_path_jobs.submit({
+            "current_skills": request.current_skills,
+            "target_role": request.target_role
+        })
+    except JobQueueFullError as e:
+        logger.warning(f"Learning path job shed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Q-Mentor está com muitas análises na fila. Tente novamente em instantes.",
+            headers={"Retry-After": "30"}
+        )
+    
+    response.headers["Location"] = str(http_request.url_for("get_job", job_id=job.id))
+    return job
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=QMentorJob,
+    summary="Get a Q-Mentor job",
+    description="Poll the status and result of a queued Q-Mentor analysis"
+)
+async def get_job(job_id: str):
+    """
+    Get the current status of a Q-Mentor job, with its result once finished
+    """
+    job = learning_path_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job não encontrado"
+        )
+    return job
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream Q-Mentor job updates",
+    description="Server-Sent Events: a `job` event with the job on every status change until it finishes"
+)
+async def stream_job_events(job_id: str):
+    """
+    Push job status changes over Server-Sent Events
+    
+    The stream closes after the event carrying a finished job
+    (`succeeded`, `failed` or `expired`).
+    """
+    if learning_path_jobs.get(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job não encontrado"
+        )
+    
+    async def events():
+        async for job in learning_path_jobs.watch(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(job.model_dump(mode="json"), event="job")
+    
+    return sse_response(events())
+
 @router.get(
     "/health",
     summary="Check Q-Mentor service health",
@@ -146,13 +264,29 @@ async def check_qmentor_health():
     """
     try:
         # Simple health check by testing if model is configured
-        is_available = q_mentor_service.model is not None
+        is_available = q_mentor_service.client.available
+        circuit = q_mentor_service.client.breaker.metrics()
+        
+        if not is_available:
+            service_status = "limited"
+            message = "Q-Mentor com funcionalidade limitada - verifique configuração da API"
+        elif circuit["state"] != "closed":
+            service_status = "degraded"
+            message = "Q-Mentor instável - respostas em cache ou alternativas enquanto o serviço se recupera"
+        else:
+            service_status = "operational"
+            message = "Q-Mentor está funcionando normalmente"
         
         return {
             "service": QMENTOR_TAG,
-            "status": "operational" if is_available else "limited",
+            "status": service_status,
             "available": is_available,
-            "message": "Q-Mentor está funcionando normalmente" if is_available else "Q-Mentor com funcionalidade limitada - verifique configuração da API"
+            "message": message,
+            "circuit": circuit,
+            "client": q_mentor_service.client.metrics(),
+            "cache": q_mentor_service.cache.metrics(),
+            "single_flight": q_mentor_service.single_flight.metrics(),
+            "jobs": learning_path_jobs.metrics()
         }
         
     except Exception as e:
@@ -179,7 +313,7 @@ async def get_quick_tips(career_area: str):
         # Use the general guidance service with a structured query
         quick_query = f"Dê 3 dicas rápidas e práticas para alguém na área de {career_area} considerando tecnologias quântico-seguras"
         
-        result = q_mentor_service.get_career_guidance(
+        result = await q_mentor_service.get_career_guidance(
             user_query=quick_query,
             user_profile={"career_area": career_area}
         )
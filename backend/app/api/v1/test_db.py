@@ -2,7 +2,7 @@
 Test endpoint for database debugging
 """
 from fastapi import APIRouter
-from app.core.database import engine
+from app.core.database import async_engine
 from sqlalchemy.sql import text
 
 router = APIRouter()
@@ -11,8 +11,8 @@ router = APIRouter()
 async def test_database_connection():
     """Test database connection directly"""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 'Database connection working!' as message;"))
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text("SELECT 'Database connection working!' as message;"))
             row = result.fetchone()
             return {"status": "success", "message": row[0]}
     except Exception as e:
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.services.user_service import UserService
 from app.models.models import UserCreate, UserUpdate, UserResponse
 from app.core.auth import get_current_user, get_current_active_user
+from app.core.pagination import parse_cursor, set_next_cursor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,11 +16,11 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_create: UserCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Register a new user"""
     user_service = UserService(session)
-    return user_service.create_user(user_create)
+    return await user_service.create_user(user_create)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -34,11 +35,11 @@ async def get_current_user_profile(
 async def update_current_user(
     user_update: UserUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update current user's profile"""
     user_service = UserService(session)
-    return user_service.update_user(
+    return await user_service.update_user(
         user_id=current_user.id,
         user_update=user_update,
         current_user_id=current_user.id
@@ -49,7 +50,7 @@ async def update_current_user(
 async def get_user_by_id(
     user_id: int,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get user by ID (public profile)"""
     # Validate user_id
@@ -60,7 +61,7 @@ async def get_user_by_id(
         )
     
     user_service = UserService(session)
-    user = user_service.get_user(user_id)
+    user = await user_service.get_user(user_id)
     
     if not user:
         raise HTTPException(
@@ -73,10 +74,12 @@ async def get_user_by_id(
 
 @router.get("/", response_model=List[UserResponse])
 async def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get all users (admin only)"""
     # Validate pagination parameters
@@ -100,4 +103,6 @@ async def get_all_users(
         )
     
     user_service = UserService(session)
-    return user_service.get_users(skip=skip, limit=limit)
\ No newline at end of file
+    users = await user_service.get_users(skip=skip, limit=limit, cursor=parse_cursor(cursor))
+    set_next_cursor(response, users, limit)
+    return users
\ No newline at end of file
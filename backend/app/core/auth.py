@@ -1,10 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session
-from typing import Optional
-from app.core.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional, Tuple
+from app.core.database import get_async_session
+from app.core.principal_cache import principal_cache
 from app.core.security import security_service
 from app.repositories.base import UserRepository
+from app.services.token_revocation import token_revocation
 from app.models.models import User, UserResponse
 import logging
 
@@ -17,16 +19,20 @@ security = HTTPBearer()
 INACTIVE_USER_MSG = "Inactive user"
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def _authenticate_token(
+    credentials: Optional[HTTPAuthorizationCredentials],
+    session: AsyncSession
+) -> Tuple[int, Optional[str]]:
+    """Verify the bearer token, reject revoked ones, and return (user id, jti)"""
+    credentials_exception = _credentials_exception()
     
     if not credentials or not credentials.credentials:
         logger.warning("No credentials provided")
@@ -55,18 +61,58 @@ def get_current_user(
         logger.warning("Invalid user ID format: %s", user_id)
         raise credentials_exception
     
+    # Only touches the database when the revocation filter reports a possible hit
+    jti = payload.get("jti")
+    if await token_revocation.is_revoked(session, jti):
+        logger.warning("Revoked token used for user %s", user_id)
+        raise credentials_exception
+    
+    return user_id_int, jti
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """Get current user from JWT token (always loads the database row)"""
+    user_id, _ = await _authenticate_token(credentials, session)
+    
     # Get user from database
     user_repo = UserRepository(session)
-    user = user_repo.get_by_id(user_id_int)
+    user = await user_repo.get_by_id(user_id)
     if user is None:
         logger.warning("User not found: %s", user_id)
-        raise credentials_exception
+        raise _credentials_exception()
     
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> UserResponse:
+    """Get the current user as a UserResponse, served from the principal cache when possible"""
+    user_id, jti = await _authenticate_token(credentials, session)
+    
+    if jti is not None:
+        principal = principal_cache.get(user_id, jti)
+        if principal is not None:
+            return principal
+    
+    user_repo = UserRepository(session)
+    user = await user_repo.get_by_id(user_id)
+    if user is None:
+        logger.warning("User not found: %s", user_id)
+        raise _credentials_exception()
+    
+    principal = UserResponse.model_validate(user)
+    if jti is not None:
+        principal_cache.set(user_id, jti, principal)
+    return principal
+
+
+async def get_current_active_user(
+    current_user: UserResponse = Depends(get_current_principal)
 ) -> UserResponse:
     """Get current active user"""
     if not current_user.is_active:
@@ -75,12 +121,12 @@ def get_current_active_user(
             detail=INACTIVE_USER_MSG
         )
     
-    return UserResponse.model_validate(current_user)
+    return current_user
 
 
-def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_admin_user(
+    current_user: UserResponse = Depends(get_current_principal)
+) -> UserResponse:
     """Get current admin user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -97,9 +143,9 @@ def get_current_admin_user(
     return current_user
 
 
-def get_current_moderator_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_moderator_user(
+    current_user: UserResponse = Depends(get_current_principal)
+) -> UserResponse:
     """Get current moderator or admin user"""
     if not current_user.is_active:
         raise HTTPException(
@@ -116,9 +162,9 @@ def get_current_moderator_user(
     return current_user
 
 
-def optional_authentication(
+async def optional_authentication(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> Optional[User]:
     """Optional authentication - returns user if token is valid, None otherwise"""
     if not credentials or not credentials.credentials:
@@ -140,8 +186,11 @@ def optional_authentication(
             logger.warning("Invalid user ID format in optional auth: %s", user_id)
             return None
         
+        if await token_revocation.is_revoked(session, payload.get("jti")):
+            return None
+        
         user_repo = UserRepository(session)
-        user = user_repo.get_by_id(user_id_int)
+        user = await user_repo.get_by_id(user_id_int)
         return user
     
     except Exception as e:
@@ -0,0 +1,146 @@
+"""
+Circuit breaker for calls to an unreliable upstream.
+
+The breaker keeps the outcomes and latencies of the most recent calls. Once
+enough calls are in the window it trips OPEN when either the error rate or the
+p95 latency crosses its threshold; while open every call is refused at once.
+After `open_seconds` it lets a limited number of probe calls through
+(HALF_OPEN): a successful probe closes the circuit with a fresh window, a
+failed or slow probe re-opens it.
+"""
+import logging
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Error-rate and p95-latency circuit breaker with half-open probing"""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        p95_latency_threshold: Optional[float] = None,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_threshold = p95_latency_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._times_opened = 0
+        self._short_circuited = 0
+        self._last_trip_reason: Optional[str] = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; reserves a probe slot when half-open"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self._short_circuited += 1
+        return False
+
+    def record_success(self, latency: float) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            if self.p95_latency_threshold is not None and latency >= self.p95_latency_threshold:
+                self._trip(f"probe latency {latency:.2f}s")
+            else:
+                self._state = CircuitState.CLOSED
+                self._outcomes.clear()
+                logger.info(f"Circuit {self.name} closed after a successful probe")
+            return
+        self._outcomes.append((True, latency))
+        self._evaluate()
+
+    def record_failure(self, latency: float) -> None:
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            self._trip("probe failed")
+            return
+        self._outcomes.append((False, latency))
+        self._evaluate()
+
+    def record_abandoned(self) -> None:
+        """The call was cancelled before an outcome; free its probe slot"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+
+    def _p95_latency(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        latencies = sorted(latency for _, latency in self._outcomes)
+        return latencies[max(math.ceil(len(latencies) * 0.95) - 1, 0)]
+
+    def _evaluate(self) -> None:
+        if self._state != CircuitState.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        error_rate = self._error_rate()
+        if error_rate >= self.error_rate_threshold:
+            self._trip(f"error rate {error_rate:.0%}")
+            return
+        if self.p95_latency_threshold is not None:
+            p95 = self._p95_latency()
+            if p95 >= self.p95_latency_threshold:
+                self._trip(f"p95 latency {p95:.2f}s")
+
+    def _trip(self, reason: str) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._times_opened += 1
+        self._last_trip_reason = reason
+        logger.warning(f"Circuit {self.name} opened for {self.open_seconds}s: {reason}")
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit starts probing again"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self.open_seconds - (self._clock() - self._opened_at), 0.0)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "calls_in_window": len(self._outcomes),
+            "error_rate": round(self._error_rate(), 4),
+            "p95_latency_ms": round(self._p95_latency() * 1000, 2),
+            "times_opened": self._times_opened,
+            "short_circuited": self._short_circuited,
+            "last_trip_reason": self._last_trip_reason,
+            "retry_after_seconds": round(self.retry_after(), 2),
+        }
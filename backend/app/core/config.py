@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "qpath_db"
     DATABASE_USER: str = "postgres"
     DATABASE_PASSWORD: str = ""  # Must be set via environment variable
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 20
     
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379"
@@ -27,6 +29,24 @@ class Settings(BaseSettings):
     
     # Gemini AI Configuration
     GEMINI_API_KEY: Optional[str] = None
+    QMENTOR_MAX_CONCURRENCY: int = 4  # model calls in flight per worker
+    QMENTOR_TIMEOUT_SECONDS: float = 30.0  # per model call
+    QMENTOR_QUEUE_TIMEOUT_SECONDS: float = 10.0  # max wait for a free slot
+    QMENTOR_CACHE_MAX_ENTRIES: int = 512  # 0 disables the response cache
+    QMENTOR_CACHE_TTL_SECONDS: int = 86400
+    QMENTOR_CACHE_PATH: Optional[str] = None  # SQLite file that survives restarts
+    QMENTOR_BREAKER_WINDOW: int = 20  # recent calls considered by the circuit breaker
+    QMENTOR_BREAKER_MIN_CALLS: int = 5
+    QMENTOR_BREAKER_ERROR_RATE: float = 0.5  # trip at this error rate...
+    QMENTOR_BREAKER_P95_SECONDS: float = 20.0  # ...or at this p95 latency
+    QMENTOR_BREAKER_OPEN_SECONDS: float = 30.0  # before half-open probing
+    QMENTOR_JOB_WORKERS: int = 2
+    QMENTOR_JOB_QUEUE_MAX: int = 100  # further submissions are shed with 503
+    QMENTOR_JOB_MAX_WAIT_SECONDS: int = 300  # queued longer than this -> expired
+    QMENTOR_JOB_RETENTION_SECONDS: int = 3600  # finished jobs kept for polling
+    # Server processes, as read by uvicorn and gunicorn. Q-Mentor jobs live in
+    # process memory, so startup fails when this is above 1.
+    WEB_CONCURRENCY: int = 1
     
     @property
     def DATABASE_URL(self) -> str:
@@ -51,18 +71,39 @@ class Settings(BaseSettings):
     # Security Configuration
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1", "0.0.0.0"]
     
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 60
+    # Rate Limiting (token buckets per IP and per authenticated user)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis" (uses REDIS_URL, shared by all workers)
+    RATE_LIMIT_PER_MINUTE: int = 60  # default budget; also the burst size
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 10  # login, refresh, register, password reset
+    RATE_LIMIT_MENTOR_PER_MINUTE: int = 20  # Q-Mentor model calls
+    # Key clients by X-Forwarded-For. Leave off when the API is reachable directly
+    # (clients could spoof it); turn on behind a reverse proxy, otherwise every
+    # client shares the proxy's address and therefore one bucket.
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
     
     # Logging
     LOG_LEVEL: str = "INFO"
     
     # Security
     BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0  # bcrypt threads; 0 = one per CPU core
+    PASSWORD_REHASH_ON_LOGIN: bool = True  # upgrade hashes made with other BCRYPT_ROUNDS on login
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # reuse the resolved user per token; 0 disables
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    JWT_BACKEND: str = "hmac"  # "hmac" (stdlib, HS* algorithms) or "jose" (python-jose, any algorithm)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # verified-token LRU; 0 disables
+    REVOCATION_REFRESH_SECONDS: int = 5  # pull new revoked_tokens rows into each worker's Bloom filter
+    REVOCATION_REBUILD_SECONDS: int = 3600  # rebuild the filter to drop expired tokens
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
     
     # Gamification Configuration
     XP_BASE_VALUE: int = 100
     XP_CURVE_FACTOR: float = 1.8
+    LEADERBOARD_BACKEND: str = "memory"  # "memory" or "redis" (uses REDIS_URL)
+    LEADERBOARD_SYNC_SECONDS: int = 60  # re-sync the leaderboard (memory or Redis) from the DB
+    TRACK_CATALOG_REFRESH_SECONDS: int = 60  # re-check the seeded catalog version from the DB
     
     class Config:
         env_file = ".env"
@@ -1,4 +1,7 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.config import settings
 from urllib.parse import quote_plus
 import logging
@@ -15,6 +18,11 @@ def get_database_url():
     # password = quote_plus(settings.DATABASE_PASSWORD or "dev_password")
     # return f"postgresql://{settings.DATABASE_USER}:{password}@{settings.DATABASE_HOST}:{settings.DATABASE_PORT}/{settings.DATABASE_NAME}"
 
+
+def get_async_database_url():
+    """Get database URL for the asyncpg driver"""
+    return get_database_url().replace("postgresql://", "postgresql+asyncpg://", 1)
+
 # Create database engine
 engine = create_engine(
     get_database_url(),
@@ -26,6 +34,23 @@ engine = create_engine(
     pool_timeout=30,
 )
 
+# Create async database engine (used by the API request path)
+async_engine = create_async_engine(
+    get_async_database_url(),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=30,
+)
+
+async_session_factory = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 # Create tables
 def create_db_and_tables():
     """Create database tables"""
@@ -44,6 +69,20 @@ def init_db():
         logger.error("Database initialization failed: %s", str(e))
         logger.warning("Continuing without database...")
 
+
+async def init_track_catalog():
+    """Seed the learning track catalog if its version changed"""
+    from app.repositories.base import TrackRepository
+
+    try:
+        async with async_session_factory() as session:
+            await TrackRepository(session).ensure_defaults()
+    except IntegrityError:
+        # Another worker applied the same catalog version concurrently
+        logger.info("Track catalog already seeded by another worker")
+    except Exception as e:
+        logger.error("Track catalog seeding failed: %s", str(e))
+
 # Database session dependency
 def get_session():
     """Get database session"""
@@ -57,6 +96,18 @@ def get_session():
     finally:
         session.close()
 
+
+# Async database session dependency
+async def get_async_session():
+    """Get async database session"""
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except Exception as e:
+            logger.error("Database session error: %s", str(e))
+            await session.rollback()
+            raise
+
 # Test database connection
 def test_db_connection():
     """Test database connection"""
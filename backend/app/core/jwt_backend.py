@@ -0,0 +1,200 @@
+"""
+JWT encoding/decoding backends and the verified-token cache.
+
+SecurityService signs and verifies tokens through a JWTBackend:
+
+- HMACJWTBackend implements the HS256/HS384/HS512 compact form directly on
+  hmac/hashlib/json. It only accepts the configured algorithm (no "none", no
+  algorithm switching), rejects anything but exactly three canonical
+  base64url segments, duplicate JSON members, "crit" extensions and non-numeric
+  time claims, and checks exp/nbf, roughly twice as fast as jose.
+- JoseJWTBackend delegates to python-jose and supports every algorithm.
+
+VerifiedTokenCache remembers the claims of tokens that already passed
+verification, keyed by a digest of the token, until their `exp`.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+
+HMAC_ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+TIME_CLAIMS = ("exp", "iat", "nbf")
+BASE64URL_RE = re.compile(r"[A-Za-z0-9_-]*")
+
+
+class TokenError(Exception):
+    """The token is malformed, badly signed or outside its validity window"""
+
+
+class JWTBackend(ABC):
+    """Signs and verifies compact JWTs"""
+
+    name: str
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        pass
+
+    @abstractmethod
+    def decode(self, token: str, key: str, algorithm: str) -> Dict[str, Any]:
+        """Verified claims; raises TokenError"""
+
+
+class JoseJWTBackend(JWTBackend):
+    name = "jose"
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        return jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithm: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(token, key, algorithms=[algorithm])
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    # urlsafe_b64decode silently drops characters outside the alphabet and
+    # ignores unused trailing bits, so only the canonical unpadded form passes
+    if not BASE64URL_RE.fullmatch(segment):
+        raise ValueError("Invalid base64url segment")
+    data = base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    if _b64encode(data) != segment:
+        raise ValueError("Non-canonical base64url segment")
+    return data
+
+
+def _unique_members(pairs):
+    members = dict(pairs)
+    if len(members) != len(pairs):
+        raise ValueError("Duplicate JSON member")
+    return members
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"Invalid JSON constant {name}")
+
+
+def _json_segment(segment: str) -> Any:
+    return json.loads(_b64decode(segment), object_pairs_hook=_unique_members, parse_constant=_reject_constant)
+
+
+def _timestamp(value: Any) -> Any:
+    return int(value.timestamp()) if isinstance(value, datetime) else value
+
+
+class HMACJWTBackend(JWTBackend):
+    name = "hmac"
+
+    def encode(self, claims: Dict[str, Any], key: str, algorithm: str) -> str:
+        digest = HMAC_ALGORITHMS[algorithm]
+        payload = {name: _timestamp(value) if name in TIME_CLAIMS else value for name, value in claims.items()}
+        header_segment = _b64encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode())
+        payload_segment = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        signing_input = f"{header_segment}.{payload_segment}"
+        signature = hmac.new(key.encode(), signing_input.encode(), digest).digest()
+        return f"{signing_input}.{_b64encode(signature)}"
+
+    def decode(self, token: str, key: str, algorithm: str) -> Dict[str, Any]:
+        segments = token.split(".")
+        if len(segments) != 3:
+            raise TokenError("Malformed token")
+        header_segment, payload_segment, signature_segment = segments
+        signing_input = f"{header_segment}.{payload_segment}"
+        try:
+            header = _json_segment(header_segment)
+            signature = _b64decode(signature_segment)
+        except (ValueError, TypeError) as e:
+            raise TokenError("Malformed token") from e
+        if not isinstance(header, dict) or header.get("alg") != algorithm:
+            raise TokenError("The specified alg value is not allowed")
+        # No extensions are understood, so a "crit" header must be rejected (RFC 7515 4.1.11)
+        if "crit" in header or header.get("typ", "JWT") != "JWT":
+            raise TokenError("Unsupported token header")
+
+        expected = hmac.new(key.encode(), signing_input.encode(), HMAC_ALGORITHMS[algorithm]).digest()
+        if not hmac.compare_digest(expected, signature):
+            raise TokenError("Signature verification failed")
+
+        try:
+            claims = _json_segment(payload_segment)
+        except (ValueError, TypeError) as e:
+            raise TokenError("Malformed token payload") from e
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token payload")
+
+        now = time.time()
+        for name in TIME_CLAIMS:
+            if name in claims and (isinstance(claims[name], bool) or not isinstance(claims[name], (int, float))):
+                raise TokenError(f"Invalid {name} claim")
+        if "exp" in claims and claims["exp"] < now:
+            raise TokenError("Signature has expired")
+        if "nbf" in claims and claims["nbf"] > now:
+            raise TokenError("The token is not yet valid (nbf)")
+        return claims
+
+
+def create_jwt_backend(name: str, algorithm: str) -> JWTBackend:
+    """The backend for JWT_BACKEND; HMAC only handles HS* algorithms"""
+    if name == "hmac" and algorithm in HMAC_ALGORITHMS:
+        return HMACJWTBackend()
+    return JoseJWTBackend()
+
+
+class VerifiedTokenCache:
+    """LRU of verified claims keyed by token digest, valid until `exp`"""
+
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return dict(entry[0])  # callers may mutate their claims
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        expires_at = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = self._digest(token)
+        self._entries[key] = (dict(claims), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
@@ -0,0 +1,85 @@
+"""
+Pure ASGI middleware.
+
+Implemented against the raw ASGI interface rather than BaseHTTPMiddleware:
+headers are added by rewriting the `http.response.start` message on its way
+out, so no extra task or memory stream is created per request and streaming
+responses pass through untouched.
+"""
+import math
+import time
+from typing import List, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.rate_limit import RateLimiter
+
+SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+]
+HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers plus X-Process-Time and Server-Timing.
+
+    The timing covers the request up to the moment the response headers are
+    sent (time to first byte for streaming responses). Headers already set by
+    the route are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, hsts: bool = False):
+        self.app = app
+        self.headers = SECURITY_HEADERS + ([HSTS_HEADER] if hsts else [])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(header for header in self.headers if header[0] not in present)
+                headers.append((b"x-process-time", str(elapsed).encode("latin-1")))
+                headers.append((b"server-timing", f"app;dur={elapsed * 1000:.3f}".encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RateLimitMiddleware:
+    """Answer 429 with Retry-After once a client is over its token budget.
+
+    CORS preflights are never counted.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.limiter.check(scope)
+        if retry_after is None:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=429,
+            content={"detail": "Muitas requisições. Tente novamente em instantes."},
+            headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,60 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by (created_at DESC, id DESC). A cursor is an opaque,
+URL-safe token encoding the (created_at, id) of the last row of a page; the
+next page starts strictly after it, so deep pages cost the same as the first.
+The token for the next page is returned in the X-Next-Cursor header, keeping
+the list response bodies unchanged for offset-based clients.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque token"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a token produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at, row_id = datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    # Timestamps are stored as naive UTC; an offset-aware value would fail
+    # the comparison in the database, so normalise client-built cursors
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at, row_id
+
+
+def parse_cursor(token: Optional[str]) -> Optional[Cursor]:
+    """Decode an optional `cursor` query parameter, answering 400 if it is malformed"""
+    if token is None:
+        return None
+    try:
+        return decode_cursor(token)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """Expose the cursor for the page after `items` when more rows may follow"""
+    if items and len(items) >= limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
@@ -0,0 +1,87 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow (hundreds of milliseconds at 12 rounds) and would
+block the event loop if called from a coroutine. The pool runs those calls on
+a fixed number of threads; bcrypt releases the GIL while hashing, so
+throughput scales with the worker count up to the number of cores. Calls
+beyond the worker count wait in the executor queue, which `metrics()` reports.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Runs blocking password hash/verify calls on a size-limited thread pool"""
+
+    def __init__(self, max_workers: int = 0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted and not finished
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Await `func(*args)` executed on the pool"""
+        submitted = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._pending - self._running)
+
+        def timed() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started - submitted
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._busy_seconds += time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), timed)
+        except RuntimeError:
+            # Executor shut down underneath us; undo the accounting
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": completed,
+                "avg_hash_ms": round(self._busy_seconds / completed * 1000, 2) if completed else 0.0,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the threads; a later call starts a fresh pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
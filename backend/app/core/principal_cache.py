@@ -0,0 +1,80 @@
+"""
+Short-lived cache of authenticated principals.
+
+Authenticated requests resolve the bearer token to a UserResponse. The cache
+keeps that result per (user id, token jti) for a few seconds so repeated
+requests with the same token skip the database. A user's entries are
+invalidated whenever the user changes: UserRepository.update and .delete,
+and the password reset endpoint.
+The cache is per process, so the TTL bounds how long another worker can
+serve a stale principal.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.models.models import UserResponse
+
+PrincipalKey = Tuple[int, str]  # (user_id, jti)
+
+
+class PrincipalCache:
+    """LRU of principals by (user id, jti) with a TTL per entry"""
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[PrincipalKey, Tuple[UserResponse, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[PrincipalKey]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, user_id: int, jti: str) -> Optional[UserResponse]:
+        key = (user_id, jti)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self._clock():
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def set(self, user_id: int, jti: str, principal: UserResponse) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        key = (user_id, jti)
+        self._entries[key] = (principal, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached principal of `user_id`, whatever the token"""
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def _remove(self, key: PrincipalKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
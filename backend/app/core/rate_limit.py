@@ -0,0 +1,274 @@
+"""
+Token-bucket rate limiting.
+
+Every request spends one token from a bucket keyed by client IP and, when it
+carries a valid access token, one from a bucket keyed by user id. Buckets
+refill continuously at `per_minute / 60` tokens per second up to a burst of
+`per_minute`, with separate budgets per route class (auth, mentor, default).
+
+- InMemoryRateLimiter keeps buckets in sharded dicts, one lock-free dict per
+  shard, pruning buckets that have refilled completely under their own
+  budget. It is per process.
+- RedisRateLimiter runs the same bucket as an atomic Lua script, using the
+  Redis clock, so every worker shares one budget. If Redis is unreachable
+  requests are let through rather than failing the API.
+"""
+import heapq
+import logging
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis  # pylint: disable=import-error
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
+from app.core.config import settings
+from app.core.security import security_service
+
+logger = logging.getLogger(__name__)
+
+Decision = Tuple[bool, float]  # (allowed, retry_after_seconds)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """A bucket of `capacity` tokens refilled at `rate` tokens per second"""
+
+    capacity: float
+    rate: float
+
+    @classmethod
+    def per_minute(cls, requests: int) -> "Budget":
+        return cls(capacity=float(requests), rate=requests / 60.0)
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets"""
+
+    @abstractmethod
+    async def consume(self, key: str, budget: Budget, cost: float = 1.0) -> Decision:
+        """Take `cost` tokens from the bucket at `key`, if it has them"""
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "budget")
+
+    def __init__(self, tokens: float, updated: float, budget: Budget):
+        self.tokens = tokens
+        self.updated = updated
+        self.budget = budget  # a shard mixes route classes; each bucket keeps its own
+
+    def fill(self, now: float) -> float:
+        """Fraction of capacity the bucket would hold at `now`"""
+        tokens = self.tokens + (now - self.updated) * self.budget.rate
+        return min(tokens / self.budget.capacity, 1.0)
+
+
+class InMemoryRateLimiter(RateLimitBackend):
+    """Per-process buckets in sharded dicts"""
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self._shards: List[Dict[str, _Bucket]] = [{} for _ in range(shards)]
+        self._max_keys = max_keys_per_shard
+        self._clock = clock
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def _shard(self, key: str) -> Dict[str, _Bucket]:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    async def consume(self, key: str, budget: Budget, cost: float = 1.0) -> Decision:
+        now = self._clock()
+        shard = self._shard(key)
+        bucket = shard.get(key)
+        if bucket is None:
+            if len(shard) >= self._max_keys:
+                self._prune(shard, now)
+            bucket = shard[key] = _Bucket(budget.capacity, now, budget)
+        else:
+            bucket.budget = budget
+            bucket.tokens = min(budget.capacity, bucket.tokens + (now - bucket.updated) * budget.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return True, 0.0
+        return False, (cost - bucket.tokens) / budget.rate
+
+    def _prune(self, shard: Dict[str, _Bucket], now: float) -> None:
+        # A bucket that has refilled completely is the same as no bucket
+        refilled = [key for key, bucket in shard.items() if bucket.fill(now) >= 1.0]
+        for key in refilled:
+            del shard[key]
+        # Still full of active clients: drop the fullest buckets, whose
+        # clients lose the least by starting over; drained (throttled)
+        # buckets are the last to go
+        overflow = len(shard) - self._max_keys + 1
+        if overflow > 0:
+            for key in heapq.nlargest(overflow, shard, key=lambda key: shard[key].fill(now)):
+                del shard[key]
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local updated = tonumber(bucket[2])
+if tokens == nil then
+  tokens = capacity
+else
+  tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+end
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisRateLimiter(RateLimitBackend):
+    """Buckets in Redis hashes, shared by all workers"""
+
+    def __init__(self, url: str, prefix: str = "qpath:ratelimit"):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("Redis rate limiter requires the redis package. Install with: pip install redis")
+        self.client = aioredis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def consume(self, key: str, budget: Budget, cost: float = 1.0) -> Decision:
+        try:
+            allowed, retry_after = await self._script(
+                keys=[f"{self.prefix}:{key}"], args=[budget.rate, budget.capacity, cost]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            return True, 0.0
+        return bool(allowed), float(retry_after)
+
+
+# Route classes by path prefix; the first match wins. "auth" covers the
+# credential endpoints (brute-force targets), not /auth/me.
+ROUTE_CLASSES: List[Tuple[str, str]] = [
+    ("/api/v1/auth/me", "default"),
+    ("/api/v1/auth/", "auth"),
+    ("/api/v1/users/register", "auth"),
+    ("/api/v1/qmentor/health", "default"),
+    ("/api/v1/qmentor/jobs/", "default"),  # status polling is cheap
+    ("/api/v1/qmentor/", "mentor"),
+]
+EXEMPT_PATHS = {"/", "/health", "/docs", "/redoc", "/openapi.json"}
+
+
+class RateLimiter:
+    """Applies the per-IP and per-user budgets of a request's route class"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        budgets: Dict[str, Budget],
+        trust_forwarded: bool = False,
+        warn_untrusted_forwarded: bool = False,
+    ):
+        self.backend = backend
+        self.budgets = budgets
+        self.trust_forwarded = trust_forwarded
+        # Warn once when a proxy's X-Forwarded-For is ignored: every client
+        # behind it then shares the proxy's bucket.
+        self.warn_untrusted_forwarded = warn_untrusted_forwarded
+
+    @staticmethod
+    def route_class(path: str) -> Optional[str]:
+        """Budget name for `path`, or None when the path is not limited"""
+        if path in EXEMPT_PATHS:
+            return None
+        for prefix, name in ROUTE_CLASSES:
+            if path.startswith(prefix):
+                return name
+        return "default"
+
+    def client_ip(self, scope: Dict) -> str:
+        if self.trust_forwarded:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        elif self.warn_untrusted_forwarded:
+            for name, _ in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    self.warn_untrusted_forwarded = False
+                    logger.warning(
+                        "Request carries X-Forwarded-For but RATE_LIMIT_TRUST_FORWARDED is off; "
+                        "behind a proxy every client shares the proxy's rate-limit bucket"
+                    )
+                    break
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def user_id(scope: Dict) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                payload = security_service.verify_token(token, "access")
+                return str(payload["sub"]) if payload and payload.get("sub") else None
+        return None
+
+    async def check(self, scope: Dict) -> Optional[float]:
+        """Spend the request's tokens; return seconds to wait if it is over budget"""
+        name = self.route_class(scope["path"])
+        if name is None:
+            return None
+        budget = self.budgets[name]
+
+        allowed, retry_after = await self.backend.consume(f"{name}:ip:{self.client_ip(scope)}", budget)
+        if not allowed:
+            return retry_after
+        user_id = self.user_id(scope)
+        if user_id is not None:
+            allowed, retry_after = await self.backend.consume(f"{name}:user:{user_id}", budget)
+            if not allowed:
+                return retry_after
+        return None
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter selected by RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend: RateLimitBackend = RedisRateLimiter(settings.REDIS_URL)
+    else:
+        backend = InMemoryRateLimiter()
+    budgets = {
+        "auth": Budget.per_minute(settings.RATE_LIMIT_AUTH_PER_MINUTE),
+        "mentor": Budget.per_minute(settings.RATE_LIMIT_MENTOR_PER_MINUTE),
+        "default": Budget.per_minute(settings.RATE_LIMIT_PER_MINUTE),
+    }
+    return RateLimiter(
+        backend,
+        budgets,
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+        warn_untrusted_forwarded=settings.ENVIRONMENT == "production",
+    )
+
+
+rate_limiter = create_rate_limiter()
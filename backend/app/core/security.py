@@ -1,8 +1,11 @@
 from passlib.context import CryptContext
-from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, Dict, Any
 from app.core.config import settings
+from app.core.jwt_backend import TokenError, VerifiedTokenCache, create_jwt_backend
+from app.core.password_hashing import PasswordHashPool
+import hashlib
+import re
 import secrets
 import logging
 
@@ -12,8 +15,9 @@ logger = logging.getLogger(__name__)
 pwd_context = CryptContext(
     schemes=["bcrypt"], 
     deprecated="auto",
-    bcrypt__rounds=12  # Stronger hashing rounds
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
 )
+BCRYPT_COST_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
 
 class SecurityService:
     """Security service for authentication and authorization"""
@@ -23,6 +27,9 @@ class SecurityService:
         self.ALGORITHM = settings.ALGORITHM
         self.ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+        self.password_pool = PasswordHashPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+        self.jwt_backend = create_jwt_backend(settings.JWT_BACKEND, self.ALGORITHM)
+        self.token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
     
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create JWT access token"""
@@ -40,46 +47,55 @@ class SecurityService:
             "jti": secrets.token_urlsafe(32)  # JWT ID for revocation
         })
         
-        return jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        return self.jwt_backend.encode(to_encode, self.SECRET_KEY, self.ALGORITHM)
     
-    def create_refresh_token(self, data: dict) -> str:
+    def create_refresh_token(self, data: dict, jti: Optional[str] = None, expires_at: Optional[datetime] = None) -> str:
         """Create JWT refresh token"""
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = expires_at or datetime.now(timezone.utc) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
         
         to_encode.update({
             "exp": expire,
             "type": "refresh",
             "iat": datetime.now(timezone.utc),
-            "jti": secrets.token_urlsafe(32)
+            "jti": jti or secrets.token_urlsafe(32)
         })
         
-        return jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        return self.jwt_backend.encode(to_encode, self.SECRET_KEY, self.ALGORITHM)
     
-    def verify_token(self, token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
-        """Verify and decode JWT token"""
-        try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            
-            # Verify token type
-            if payload.get("type") != token_type:
-                logger.warning(f"Invalid token type: expected {token_type}, got {payload.get('type')}")
-                return None
-            
-            # Check expiration
-            exp_timestamp = payload.get("exp", 0)
-            if datetime.fromtimestamp(exp_timestamp, tz=timezone.utc) < datetime.now(timezone.utc):
-                logger.warning("Token has expired")
-                return None
-                
+    @staticmethod
+    def token_digest(token: str) -> str:
+        """SHA-256 of a token, for storing tokens without storing them"""
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def _decode_verified(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims of a correctly signed, unexpired token, from the cache when possible"""
+        payload = self.token_cache.get(token)
+        if payload is not None:
             return payload
-            
-        except JWTError as e:
+        try:
+            payload = self.jwt_backend.decode(token, self.SECRET_KEY, self.ALGORITHM)
+        except TokenError as e:
             logger.warning(f"JWT verification failed: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error in token verification: {e}")
             return None
+        self.token_cache.set(token, payload)
+        return payload
+    
+    def verify_token(self, token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+        """Verify and decode JWT token; revocation is checked by token_revocation"""
+        payload = self._decode_verified(token)
+        if payload is None:
+            return None
+        
+        # Verify token type
+        if payload.get("type") != token_type:
+            logger.warning(f"Invalid token type: expected {token_type}, got {payload.get('type')}")
+            return None
+        
+        return payload
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
@@ -89,6 +105,19 @@ class SecurityService:
         """Hash password"""
         return pwd_context.hash(password)
     
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password on the password pool, off the event loop"""
+        return await self.password_pool.run(self.verify_password, plain_password, hashed_password)
+    
+    async def get_password_hash_async(self, password: str) -> str:
+        """Hash password on the password pool, off the event loop"""
+        return await self.password_pool.run(self.get_password_hash, password)
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a bcrypt hash was made with a cost other than BCRYPT_ROUNDS"""
+        match = BCRYPT_COST_RE.match(hashed_password)
+        return match is not None and int(match.group(1)) != settings.BCRYPT_ROUNDS
+    
     def generate_password_reset_token(self, email: str) -> str:
         """Generate password reset token"""
         delta = timedelta(hours=1)  # Reset token expires in 1 hour
@@ -96,22 +125,22 @@ class SecurityService:
         expires = now + delta
         
         exp = expires.timestamp()
-        encoded_jwt = jwt.encode(
+        encoded_jwt = self.jwt_backend.encode(
             {"exp": exp, "nbf": now, "sub": email, "type": "password_reset"},
             self.SECRET_KEY,
-            algorithm=self.ALGORITHM,
+            self.ALGORITHM,
         )
         return encoded_jwt
     
     def verify_password_reset_token(self, token: str) -> Optional[str]:
         """Verify password reset token"""
         try:
-            decoded_token = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if decoded_token.get("type") != "password_reset":
-                return None
-            return decoded_token["sub"]
-        except JWTError:
+            decoded_token = self.jwt_backend.decode(token, self.SECRET_KEY, self.ALGORITHM)
+        except TokenError:
+            return None
+        if decoded_token.get("type") != "password_reset":
             return None
+        return decoded_token.get("sub")
 
 
 # Global security service instance
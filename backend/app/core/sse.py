@@ -0,0 +1,27 @@
+"""
+Server-Sent Events helpers.
+
+Event payloads are JSON-encoded so multi-line model output never breaks the
+`data:` framing.
+"""
+import json
+from typing import Any, Optional
+
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Disable proxy buffering (nginx) so each event reaches the client as sent
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Frame one event; `data` is serialized as JSON"""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    """Stream an async iterator of pre-formatted events"""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -6,8 +6,14 @@ from contextlib import asynccontextmanager
 import time
 import logging
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, init_track_catalog, async_engine
+from app.core.middleware import RateLimitMiddleware, SecurityHeadersMiddleware
+from app.core.rate_limit import rate_limiter
+from app.core.security import security_service
 from app.api.v1 import api_router
+from app.services.qmentor_jobs import learning_path_jobs, require_single_process
+from app.services.qmentor_service import q_mentor_service
+from app.services.token_revocation import token_revocation
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +28,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting Q-Path Backend API...")
+    require_single_process(settings.WEB_CONCURRENCY)
     
     # Initialize database
     try:
@@ -31,10 +38,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Seed the track catalog once per version instead of on every request
+    await init_track_catalog()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Q-Path Backend API...")
+    await learning_path_jobs.stop()
+    q_mentor_service.client.shutdown()
+    q_mentor_service.cache.close()
+    security_service.password_pool.shutdown()
+    await async_engine.dispose()
 
 
 # Create FastAPI application
@@ -47,6 +62,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limiting (inside CORS, so 429 responses still carry CORS headers)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -54,7 +73,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type"],
-    expose_headers=["X-Process-Time"],
+    expose_headers=["X-Process-Time", "Server-Timing", "X-Next-Cursor", "Retry-After"],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
@@ -65,28 +84,11 @@ if settings.ENVIRONMENT == "production":
         allowed_hosts=settings.ALLOWED_HOSTS
     )
 
-
-# Rate limiting middleware (basic implementation)
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    """Basic rate limiting and security headers middleware"""
-    start_time = time.time()
-    
-    response = await call_next(request)
-    
-    # Add security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
-    if settings.ENVIRONMENT == "production":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
+# Security headers and request timing (outermost, so timing covers the stack)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    hsts=settings.ENVIRONMENT == "production"
+)
 
 
 # Global exception handler
@@ -117,7 +119,9 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": settings.ENVIRONMENT,
-        "timestamp": time.time()
+        "timestamp": time.time(),
+        "password_hashing": security_service.password_pool.metrics(),
+        "token_revocation": token_revocation.metrics()
     }
 
 
@@ -1,7 +1,7 @@
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from pydantic import field_validator
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from enum import Enum
 import uuid
@@ -74,6 +74,7 @@ class UserBase(SQLModel):
 class User(UserBase, BaseModel, table=True):
     """User table model"""
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
     
     hashed_password: str = Field(max_length=255)
     last_login: Optional[datetime] = None
@@ -133,7 +134,7 @@ class UserResponse(UserBase):
 class GamificationProfileBase(SQLModel):
     """Base gamification profile model"""
     user_id: int = Field(foreign_key=USERS_TABLE_REF, unique=True)
-    total_xp: int = Field(default=0)
+    total_xp: int = Field(default=0, index=True)
     current_level: GamificationLevel = Field(default=GamificationLevel.INICIANTE)
     current_streak: int = Field(default=0)
     longest_streak: int = Field(default=0)
@@ -171,6 +172,7 @@ class ActivityLogBase(SQLModel):
 class ActivityLog(ActivityLogBase, BaseModel, table=True):
     """Activity log table model"""
     __tablename__ = "activity_logs"
+    __table_args__ = (Index("ix_activity_logs_user_id_created_at", "user_id", "created_at"),)
     
     # Relationships
     user: Optional[User] = Relationship(back_populates="activity_logs")
@@ -201,6 +203,11 @@ class UserProjectSubmissionBase(SQLModel):
 class UserProjectSubmission(UserProjectSubmissionBase, BaseModel, table=True):
     """User project submission table model"""
     __tablename__ = "user_project_submissions"
+    __table_args__ = (
+        Index("ix_user_project_submissions_user_id_created_at", "user_id", "created_at"),
+        Index("ix_user_project_submissions_status_created_at", "status", "created_at"),
+        Index("ix_user_project_submissions_created_at_id", "created_at", "id"),
+    )
 
     # Relationships
     user: Optional[User] = Relationship(
@@ -249,6 +256,7 @@ class StudyTaskBase(SQLModel):
 class StudyTask(StudyTaskBase, BaseModel, table=True):
     """Study task table"""
     __tablename__ = "study_tasks"
+    __table_args__ = (Index("ix_study_tasks_user_id", "user_id"),)
 
 
 class StudyTaskCreate(SQLModel):
@@ -280,12 +288,23 @@ class StudyTaskCompletionUpdate(SQLModel):
 class StudySession(BaseModel, table=True):
     """Study session (Pomodoro) tracking table"""
     __tablename__ = "study_sessions"
+    __table_args__ = (Index("ix_study_sessions_user_id_session_date", "user_id", "session_date"),)
 
     user_id: int = Field(foreign_key=USERS_TABLE_REF)
     duration_minutes: int = Field(ge=1, le=240)
     session_date: datetime = Field(default_factory=datetime.utcnow)
 
 
+class StudyDailyRollup(SQLModel, table=True):
+    """Per-user, per-day study totals maintained by StudySessionRepository.log_session"""
+    __tablename__ = "study_daily_rollups"
+
+    user_id: int = Field(foreign_key=USERS_TABLE_REF, primary_key=True)
+    day: date = Field(primary_key=True)
+    minutes: int = Field(default=0)
+    sessions: int = Field(default=0)
+
+
 # Custom reward models
 class UserRewardBase(SQLModel):
     """Base reward model"""
@@ -299,6 +318,7 @@ class UserRewardBase(SQLModel):
 class UserReward(UserRewardBase, BaseModel, table=True):
     """User-defined reward table"""
     __tablename__ = "user_rewards"
+    __table_args__ = (Index("ix_user_rewards_user_id_created_at", "user_id", "created_at"),)
 
 
 class UserRewardCreate(SQLModel):
@@ -384,6 +404,15 @@ class UserLessonProgress(SQLModel, table=True):
     lesson: Optional[TrackLesson] = Relationship(back_populates="user_progresses")
 
 
+class TrackCatalogVersion(SQLModel, table=True):
+    """Applied versions of the learning track catalog seed"""
+    __tablename__ = "track_catalog_versions"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: str = Field(index=True, unique=True, max_length=64)
+    applied_at: datetime = Field(default_factory=datetime.utcnow)  # last time this version was applied
+
+
 class LessonCompletionUpdate(SQLModel):
     """Payload for marking lesson completion"""
     completed: bool
@@ -468,6 +497,23 @@ class DashboardResponse(SQLModel):
     track_summary: List[TrackSummaryItem]
 
 
+class LeaderboardEntry(SQLModel):
+    """Leaderboard row"""
+    rank: int
+    user_id: int
+    username: str
+    total_xp: int
+    level: GamificationLevel
+    completed_trilhas: int
+
+
+class LeaderboardPositionResponse(SQLModel):
+    """Current user's leaderboard position and neighbours"""
+    rank: Optional[int]
+    total_players: int
+    around: List[LeaderboardEntry]
+
+
 class ProfileDetailsResponse(SQLModel):
     """Detailed profile response with achievements"""
     profile: GamificationProfileResponse
@@ -491,6 +537,36 @@ class TokenRefresh(SQLModel):
     refresh_token: str
 
 
+class RefreshToken(SQLModel, table=True):
+    """One row per refresh-token family (login session), rotated in place on /auth/refresh.
+
+    Only the current token of a family is valid; presenting an older one is
+    treated as theft and revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    family_id: str = Field(primary_key=True, max_length=64)
+    user_id: int = Field(foreign_key=USERS_TABLE_REF, index=True)
+    jti: str = Field(unique=True, index=True, max_length=64)  # current token
+    token_hash: str = Field(max_length=64)  # SHA-256 of the current token
+    generation: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    rotated_at: Optional[datetime] = None
+    expires_at: datetime = Field(index=True)
+    revoked_at: Optional[datetime] = None
+    revoked_reason: Optional[str] = Field(default=None, max_length=32)
+
+
+class RevokedToken(SQLModel, table=True):
+    """Token ids rejected before their expiry (logout); see TokenRevocationService"""
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Field(primary_key=True, max_length=64)
+    user_id: Optional[int] = Field(default=None, foreign_key=USERS_TABLE_REF)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
 class LoginRequest(SQLModel):
     """Login request model"""
     email: str
@@ -1,74 +1,119 @@
-from typing import Optional, List, Dict, Any
-from sqlmodel import Session, select, delete
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
+from typing import Optional, List, Dict, Any, Tuple
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Date, Integer, case, func, insert, literal, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from app.models.models import (
-    User, UserCreate, UserUpdate,
-    GamificationProfile, ActivityLog, ActivityType,
+    User, UserCreate, UserUpdate, UserRole,
+    GamificationProfile, GamificationLevel, ActivityLog, ActivityType,
     UserProjectSubmission, UserProjectSubmissionCreate, UserProjectSubmissionUpdate,
     StudyTask, StudyTaskCreate, StudyTaskUpdate,
-    StudySession,
+    StudySession, StudyDailyRollup,
     UserReward, UserRewardCreate, UserRewardUpdate, UserRewardResponse,
-    LearningTrack, TrackModule, TrackLesson, UserLessonProgress,
+    LearningTrack, TrackModule, TrackLesson, UserLessonProgress, TrackCatalogVersion,
+    RefreshToken, RevokedToken,
     TrackLessonResponse, TrackModuleResponse, TrackResponse, TrackSummaryItem,
-    WeekProgressDay, WeekProgressResponse
+    WeekProgressDay, WeekProgressResponse, LeaderboardEntry
 )
+from app.core.config import settings
+from app.core.pagination import Cursor
+from app.core.principal_cache import principal_cache
 from app.core.security import security_service
-from app.core.database import get_session
+from app.repositories.leaderboard import leaderboard
+from app.repositories.track_catalog import CatalogSnapshot, track_catalog
 from datetime import datetime, timedelta, timezone, date
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Minimum total XP per level, highest first
+LEVEL_THRESHOLDS = [
+    (15000, GamificationLevel.QUANTUM_GUARDIAN),
+    (7000, GamificationLevel.MESTRE),
+    (3000, GamificationLevel.ESPECIALISTA),
+    (1000, GamificationLevel.EXPLORADOR),
+]
+
+
+def _paginate(statement, model, skip: int, limit: int, cursor: Optional[Cursor]):
+    """Order newest first; page by keyset after `cursor`, else by OFFSET"""
+    if cursor:
+        created_at, row_id = cursor
+        # created_at <= :c stays sargable on the (…, created_at) indexes; the
+        # OR only breaks ties within the same timestamp
+        statement = statement.where(
+            model.created_at <= created_at,
+            or_(model.created_at < created_at, model.id < row_id),
+        )
+    else:
+        statement = statement.offset(skip)
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+async def _write_leaderboard(operation, *args) -> None:
+    """Write through to the leaderboard backend; it is derived data, so never fail the request"""
+    try:
+        await operation(*args)
+    except Exception as exc:
+        logger.warning(f"Leaderboard write-through failed: {exc}")
+
+
 class UserRepository:
     """Repository for user-related database operations"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
     
-    def get_by_id(self, user_id: int) -> Optional[User]:
+    async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return self.session.get(User, user_id)
+        return await self.session.get(User, user_id)
     
-    def get_by_email(self, email: str) -> Optional[User]:
+    async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         # Sanitize input
         email = email.lower().strip()
         statement = select(User).where(User.email == email)
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
     
-    def get_by_username(self, username: str) -> Optional[User]:
+    async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
         # Sanitize input
         username = username.lower().strip()
         statement = select(User).where(User.username == username)
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
     
-    def create(self, user_create: UserCreate) -> User:
+    async def create(self, user_create: UserCreate) -> User:
         """Create new user"""
         # Hash password
-        hashed_password = security_service.get_password_hash(user_create.password)
+        hashed_password = await security_service.get_password_hash_async(user_create.password)
         
         # Create user instance
         user_data = user_create.model_dump(exclude={"password"})
         user = User(**user_data, hashed_password=hashed_password)
         
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        await self.session.commit()
+        await self.session.refresh(user)
         
         # Create gamification profile
         gamification_profile = GamificationProfile(user_id=user.id)
         self.session.add(gamification_profile)
-        self.session.commit()
+        await self.session.commit()
+        await _write_leaderboard(leaderboard.set_username, user.id, user.username)
         
         logger.info(f"Created user: {user.email}")
         return user
     
-    def update(self, user_id: int, user_update: UserUpdate) -> Optional[User]:
+    async def update(self, user_id: int, user_update: UserUpdate) -> Optional[User]:
         """Update user"""
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return None
         
@@ -78,109 +123,164 @@ class UserRepository:
             setattr(user, field, value)
         
         user.updated_at = datetime.now(timezone.utc)
-        self.session.commit()
-        self.session.refresh(user)
+        await self.session.commit()
+        principal_cache.invalidate_user(user.id)
+        await self.session.refresh(user)
+        if "username" in update_data:
+            await _write_leaderboard(leaderboard.set_username, user.id, user.username)
         
         logger.info(f"Updated user: {user.email}")
         return user
     
-    def delete(self, user_id: int) -> bool:
+    async def delete(self, user_id: int) -> bool:
         """Soft delete user (deactivate)"""
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return False
         
         user.is_active = False
         user.updated_at = datetime.now(timezone.utc)
-        self.session.commit()
+        await self.session.commit()
+        principal_cache.invalidate_user(user_id)
         
         logger.info(f"Deactivated user: {user.email}")
         return True
     
-    def authenticate(self, email: str, password: str) -> Optional[User]:
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
-        user = self.get_by_email(email)
+        user = await self.get_by_email(email)
         if not user or not user.is_active:
             return None
         
-        if not security_service.verify_password(password, user.hashed_password):
+        if not await security_service.verify_password_async(password, user.hashed_password):
             return None
         
+        if settings.PASSWORD_REHASH_ON_LOGIN and security_service.needs_rehash(user.hashed_password):
+            user.hashed_password = await security_service.get_password_hash_async(password)
+            logger.info(f"Rehashed password for user {user.id} with {settings.BCRYPT_ROUNDS} rounds")
+        
         # Update last login
         user.last_login = datetime.now(timezone.utc)
-        self.session.commit()
+        await self.session.commit()
         
         return user
     
-    def update_last_login(self, user_id: int) -> None:
+    async def update_last_login(self, user_id: int) -> None:
         """Update user's last login timestamp"""
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if user:
             user.last_login = datetime.now(timezone.utc)
-            self.session.commit()
+            await self.session.commit()
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[User]:
         """Get all users with pagination"""
-        statement = select(User).offset(skip).limit(limit)
-        return list(self.session.exec(statement).all())
+        statement = _paginate(select(User), User, skip, limit, cursor)
+        return list((await self.session.exec(statement)).all())
 
 
 class GamificationRepository:
     """Repository for gamification-related database operations"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
     
-    def get_profile(self, user_id: int) -> Optional[GamificationProfile]:
+    async def get_profile(self, user_id: int) -> Optional[GamificationProfile]:
         """Get user's gamification profile"""
         statement = select(GamificationProfile).where(GamificationProfile.user_id == user_id)
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
     
-    def add_xp(self, user_id: int, xp_amount: int, activity_type: ActivityType, description: str, metadata: Optional[Dict] = None) -> GamificationProfile:
-        """Add XP to user and log activity"""
-        profile = self.get_profile(user_id)
-        if not profile:
-            # Create profile if doesn't exist
-            profile = GamificationProfile(user_id=user_id)
-            self.session.add(profile)
-        
-        # Add XP
-        profile.total_xp += xp_amount
-        profile.last_activity_date = datetime.now(timezone.utc)
-        profile.updated_at = datetime.now(timezone.utc)
-        
-        # Check for level up
-        old_level = profile.current_level
-        new_level = self._calculate_level(profile.total_xp)
+    async def add_xp(
+        self,
+        user_id: int,
+        xp_amount: int,
+        activity_type: ActivityType,
+        description: str,
+        metadata: Optional[Dict] = None,
+        counters: Optional[Dict[str, int]] = None,
+        commit: bool = True,
+    ) -> GamificationProfile:
+        """Atomically add XP (and optional profile counters) and log activity.
+
+        The award is a single `UPDATE ... SET total_xp = total_xp + :n
+        RETURNING`, so concurrent awards never lose updates; the level is
+        derived from the new total in the same statement. Activity rows are
+        written in the same transaction and committed once.
+        """
+        profile = await self._increment_profile(user_id, xp_amount, counters or {})
+        if profile is None:
+            await self._ensure_profile(user_id)
+            profile = await self._increment_profile(user_id, xp_amount, counters or {})
+
+        old_level = self._calculate_level(profile.total_xp - xp_amount)
+        new_level = profile.current_level
         if new_level != old_level:
-            profile.current_level = new_level
-            # Log level up activity
-            self.log_activity(
+            await self.log_activity(
                 user_id=user_id,
                 activity_type=ActivityType.LEVEL_UP,
                 description=f"Subiu para o nível {new_level.value}!",
                 xp_earned=0,
-                metadata={"old_level": old_level.value, "new_level": new_level.value}
+                metadata={"old_level": old_level.value, "new_level": new_level.value},
+                commit=False,
             )
-        
-        # Log the original activity
-        self.log_activity(
+
+        await self.log_activity(
             user_id=user_id,
             activity_type=activity_type,
             description=description,
             xp_earned=xp_amount,
-            metadata=metadata
+            metadata=metadata,
+            commit=False,
         )
-        
-        self.session.commit()
-        self.session.refresh(profile)
-        
+
+        if commit:
+            await self.session.commit()
+        # total_xp is absolute, so a later award corrects any uncommitted value
+        await _write_leaderboard(
+            leaderboard.record, user_id, profile.total_xp, profile.current_level, profile.completed_trilhas
+        )
+
         logger.info(f"Added {xp_amount} XP to user {user_id}. Total: {profile.total_xp}")
         return profile
+
+    async def _increment_profile(self, user_id: int, xp_amount: int, counters: Dict[str, int]) -> Optional[GamificationProfile]:
+        now = datetime.now(timezone.utc)
+        new_total = GamificationProfile.total_xp + xp_amount
+        level_type = GamificationProfile.__table__.c.current_level.type
+        values: Dict[str, Any] = {
+            "total_xp": new_total,
+            "current_level": case(
+                *[
+                    (new_total >= threshold, literal(level, type_=level_type))
+                    for threshold, level in LEVEL_THRESHOLDS
+                ],
+                else_=literal(GamificationLevel.INICIANTE, type_=level_type),
+            ),
+            "last_activity_date": now,
+            "updated_at": now,
+        }
+        for field, amount in counters.items():
+            values[field] = getattr(GamificationProfile, field) + amount
+
+        statement = (
+            update(GamificationProfile)
+            .where(GamificationProfile.user_id == user_id)
+            .values(**values)
+            .returning(GamificationProfile)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        return (await self.session.exec(statement)).scalars().first()
+
+    async def _ensure_profile(self, user_id: int) -> None:
+        try:
+            async with self.session.begin_nested():
+                self.session.add(GamificationProfile(user_id=user_id))
+        except IntegrityError:
+            # Created concurrently by another request
+            pass
     
-    def update_streak(self, user_id: int) -> GamificationProfile:
+    async def update_streak(self, user_id: int, commit: bool = True) -> GamificationProfile:
         """Update user's daily streak"""
-        profile = self.get_profile(user_id)
+        profile = await self.get_profile(user_id)
         if not profile:
             return None
         
@@ -207,22 +307,22 @@ class GamificationRepository:
         
         # Log streak achievement for milestones
         if profile.current_streak % 7 == 0:  # Weekly milestones
-            self.log_activity(
+            await self.log_activity(
                 user_id=user_id,
                 activity_type=ActivityType.STREAK_ACHIEVEMENT,
                 description=f"Sequência de {profile.current_streak} dias!",
                 xp_earned=profile.current_streak * 5,  # Bonus XP for streaks
-                metadata={"streak_days": profile.current_streak}
+                metadata={"streak_days": profile.current_streak},
+                commit=False,
             )
         
-        self.session.commit()
-        self.session.refresh(profile)
+        if commit:
+            await self.session.commit()
         
         return profile
     
-    def log_activity(self, user_id: int, activity_type: ActivityType, description: str, xp_earned: int = 0, metadata: Optional[Dict] = None) -> ActivityLog:
-        """Log user activity"""
-        import json
+    async def log_activity(self, user_id: int, activity_type: ActivityType, description: str, xp_earned: int = 0, metadata: Optional[Dict] = None, commit: bool = True) -> ActivityLog:
+        """Log user activity; with commit=False it joins the caller's transaction"""
         metadata_str = json.dumps(metadata) if metadata else None
         
         activity = ActivityLog(
@@ -234,31 +334,50 @@ class GamificationRepository:
         )
         
         self.session.add(activity)
-        self.session.commit()
-        self.session.refresh(activity)
+        if commit:
+            await self.session.commit()
+            await self.session.refresh(activity)
         
         return activity
     
-    def get_activity_logs(self, user_id: int, skip: int = 0, limit: int = 50) -> List[ActivityLog]:
+    async def get_leaderboard_snapshot(self) -> List[LeaderboardEntry]:
+        """Return every ranked player with their username, for loading the leaderboard backend"""
+        statement = (
+            select(
+                GamificationProfile.user_id,
+                User.username,
+                GamificationProfile.total_xp,
+                GamificationProfile.current_level,
+                GamificationProfile.completed_trilhas,
+            )
+            .join(User, User.id == GamificationProfile.user_id)
+        )
+        return [
+            LeaderboardEntry(
+                rank=0,
+                user_id=user_id,
+                username=username,
+                total_xp=total_xp,
+                level=level,
+                completed_trilhas=completed_trilhas,
+            )
+            for user_id, username, total_xp, level, completed_trilhas in (await self.session.exec(statement)).all()
+        ]
+
+    async def get_activity_logs(self, user_id: int, skip: int = 0, limit: int = 50, cursor: Optional[Cursor] = None) -> List[ActivityLog]:
         """Get user's activity logs"""
-        statement = select(ActivityLog).where(
-            ActivityLog.user_id == user_id
-        ).order_by(ActivityLog.created_at.desc()).offset(skip).limit(limit)
+        statement = _paginate(
+            select(ActivityLog).where(ActivityLog.user_id == user_id), ActivityLog, skip, limit, cursor
+        )
         
-        return list(self.session.exec(statement).all())
+        return list((await self.session.exec(statement)).all())
     
-    def _calculate_level(self, total_xp: int) -> str:
+    def _calculate_level(self, total_xp: int) -> GamificationLevel:
         """Calculate level based on total XP"""
-        if total_xp >= 15000:
-            return "quantum_guardian"
-        elif total_xp >= 7000:
-            return "mestre"
-        elif total_xp >= 3000:
-            return "especialista"
-        elif total_xp >= 1000:
-            return "explorador"
-        else:
-            return "iniciante"
+        for threshold, level in LEVEL_THRESHOLDS:
+            if total_xp >= threshold:
+                return level
+        return GamificationLevel.INICIANTE
 
 
 DEFAULT_DASHBOARD_TASKS = [
@@ -370,25 +489,30 @@ DEFAULT_TRACKS = [
     },
 ]
 
+# Fingerprint of DEFAULT_TRACKS used to detect catalog changes at startup
+TRACK_CATALOG_VERSION = hashlib.sha256(
+    json.dumps(DEFAULT_TRACKS, sort_keys=True).encode("utf-8")
+).hexdigest()
+
 
 class StudyTaskRepository:
     """Repository for dashboard study tasks"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_tasks(self, user_id: int, ensure_defaults: bool = True) -> List[StudyTask]:
+    async def get_tasks(self, user_id: int, ensure_defaults: bool = True) -> List[StudyTask]:
         statement = select(StudyTask).where(StudyTask.user_id == user_id).order_by(
             StudyTask.due_date, StudyTask.created_at
         )
-        tasks = list(self.session.exec(statement).all())
+        tasks = list((await self.session.exec(statement)).all())
 
         if ensure_defaults and not tasks:
-            tasks = self._create_default_tasks(user_id)
+            tasks = await self._create_default_tasks(user_id)
 
         return tasks
 
-    def _create_default_tasks(self, user_id: int) -> List[StudyTask]:
+    async def _create_default_tasks(self, user_id: int) -> List[StudyTask]:
         tasks: List[StudyTask] = []
         for template in DEFAULT_DASHBOARD_TASKS:
             task = StudyTask(
@@ -400,16 +524,15 @@ class StudyTaskRepository:
             self.session.add(task)
             tasks.append(task)
 
-        self.session.commit()
-        for task in tasks:
-            self.session.refresh(task)
-
+        # expire_on_commit is off and ids come back from the INSERT, so the
+        # new rows are usable without a refresh round trip each
+        await self.session.commit()
         return tasks
 
-    def replace_tasks(self, user_id: int, tasks_payload: List[Dict[str, Any]]) -> List[StudyTask]:
+    async def replace_tasks(self, user_id: int, tasks_payload: List[Dict[str, Any]]) -> List[StudyTask]:
         """Replace user's tasks with provided payload (used for migration)"""
-        self.session.exec(delete(StudyTask).where(StudyTask.user_id == user_id))
-        self.session.commit()
+        await self.session.exec(delete(StudyTask).where(StudyTask.user_id == user_id))
+        await self.session.commit()
 
         new_tasks: List[StudyTask] = []
         for payload in tasks_payload:
@@ -426,64 +549,152 @@ class StudyTaskRepository:
             self.session.add(task)
             new_tasks.append(task)
 
-        self.session.commit()
+        await self.session.commit()
         for task in new_tasks:
-            self.session.refresh(task)
+            await self.session.refresh(task)
 
         return new_tasks
 
-    def update_task_completion(self, user_id: int, task_id: int, completed: bool) -> Optional[StudyTask]:
-        task = self.session.get(StudyTask, task_id)
+    async def update_task_completion(self, user_id: int, task_id: int, completed: bool) -> Optional[StudyTask]:
+        task = await self.session.get(StudyTask, task_id)
         if not task or task.user_id != user_id:
             return None
 
         task.completed = completed
         task.updated_at = datetime.now(timezone.utc)
-        self.session.commit()
-        self.session.refresh(task)
+        await self.session.commit()
+        await self.session.refresh(task)
 
         return task
 
 
+# Streaks longer than this are capped, keeping the streak query bounded
+STREAK_LOOKBACK_DAYS = 365
+
+
+class session_day(FunctionElement):
+    """Calendar day of a timestamp (date_trunc on PostgreSQL)"""
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(session_day)
+def _compile_session_day(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(session_day, "postgresql")
+def _compile_session_day_postgresql(element, compiler, **kw):
+    return f"CAST(date_trunc('day', {compiler.process(element.clauses, **kw)}) AS DATE)"
+
+
+class session_day_number(FunctionElement):
+    """Integer day number of a timestamp, so consecutive days differ by 1"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(session_day_number)
+def _compile_session_day_number(element, compiler, **kw):
+    return f"CAST(julianday(date({compiler.process(element.clauses, **kw)})) AS INTEGER)"
+
+
+@compiles(session_day_number, "postgresql")
+def _compile_session_day_number_postgresql(element, compiler, **kw):
+    return f"(CAST({compiler.process(element.clauses, **kw)} AS DATE) - DATE '1970-01-01')"
+
+
+def _dialect_insert(session: AsyncSession):
+    """INSERT construct supporting ON CONFLICT for the session's database"""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql_insert
+    return sqlite_insert
+
+
 class StudySessionRepository:
     """Repository for tracking study sessions and weekly summaries"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def log_session(self, user_id: int, duration_minutes: int) -> StudySession:
+    async def log_session(
+        self,
+        user_id: int,
+        duration_minutes: int,
+        commit: bool = True,
+        session_date: Optional[datetime] = None,
+    ) -> StudySession:
         session_entry = StudySession(
             user_id=user_id,
             duration_minutes=duration_minutes,
-            session_date=datetime.utcnow(),
+            session_date=session_date or datetime.utcnow(),
         )
-
         self.session.add(session_entry)
-        self.session.commit()
-        self.session.refresh(session_entry)
+
+        # Keep the daily rollup in step with the raw session, in the same transaction
+        rollup = _dialect_insert(self.session)(StudyDailyRollup).values(
+            user_id=user_id,
+            day=session_entry.session_date.date(),
+            minutes=duration_minutes,
+            sessions=1,
+        )
+        await self.session.exec(
+            rollup.on_conflict_do_update(
+                index_elements=[StudyDailyRollup.user_id, StudyDailyRollup.day],
+                set_={
+                    "minutes": StudyDailyRollup.minutes + rollup.excluded.minutes,
+                    "sessions": StudyDailyRollup.sessions + 1,
+                },
+            )
+        )
+
+        if commit:
+            await self.session.commit()
+            await self.session.refresh(session_entry)
 
         return session_entry
 
-    def get_weekly_progress(self, user_id: int, reference_date: Optional[date] = None) -> WeekProgressResponse:
+    async def rebuild_daily_rollups(self) -> int:
+        """Recompute study_daily_rollups from the raw study_sessions history"""
+        day = session_day(StudySession.session_date)
+        totals = select(
+            StudySession.user_id,
+            day,
+            func.sum(StudySession.duration_minutes),
+            func.count(),
+        ).group_by(StudySession.user_id, day)
+
+        await self.session.exec(delete(StudyDailyRollup))
+        await self.session.exec(
+            insert(StudyDailyRollup).from_select(["user_id", "day", "minutes", "sessions"], totals)
+        )
+        await self.session.commit()
+
+        return (await self.session.exec(select(func.count()).select_from(StudyDailyRollup))).one()
+
+    async def get_weekly_progress(self, user_id: int, reference_date: Optional[date] = None) -> WeekProgressResponse:
         reference = reference_date or datetime.utcnow().date()
         start_of_week = reference - timedelta(days=reference.weekday())
         end_of_week = start_of_week + timedelta(days=7)
 
-        week_start_dt = datetime.combine(start_of_week, datetime.min.time())
-        week_end_dt = datetime.combine(end_of_week, datetime.min.time())
-
-        statement = select(StudySession).where(
-            StudySession.user_id == user_id,
-            StudySession.session_date >= week_start_dt,
-            StudySession.session_date < week_end_dt,
+        # The streak rides along as an uncorrelated scalar subquery, so the
+        # week and the streak cost one round trip. A streak > 0 needs a
+        # rollup on the reference day, which is in this week, so an empty
+        # result means a zero streak.
+        statement = select(
+            StudyDailyRollup.day,
+            StudyDailyRollup.minutes,
+            self._streak_statement(user_id, reference).scalar_subquery(),
+        ).where(
+            StudyDailyRollup.user_id == user_id,
+            StudyDailyRollup.day >= start_of_week,
+            StudyDailyRollup.day < end_of_week,
         )
 
-        sessions = list(self.session.exec(statement).all())
-
         hours_per_day = {i: 0.0 for i in range(7)}
-        for session_entry in sessions:
-            day_index = session_entry.session_date.weekday()
-            hours_per_day[day_index] += session_entry.duration_minutes / 60.0
+        streak = 0
+        for day, minutes, streak in (await self.session.exec(statement)).all():
+            hours_per_day[day.weekday()] += minutes / 60.0
 
         day_labels = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
         week = [
@@ -492,51 +703,52 @@ class StudySessionRepository:
         ]
 
         total_hours = round(sum(hours_per_day.values()), 2)
-        streak = self._calculate_streak(user_id, reference)
 
         return WeekProgressResponse(streak=streak, total_hours=total_hours, week=week)
 
-    def _calculate_streak(self, user_id: int, reference_date: date) -> int:
-        lookback_start = datetime.combine(reference_date - timedelta(days=30), datetime.min.time())
-        statement = select(StudySession).where(
-            StudySession.user_id == user_id,
-            StudySession.session_date >= lookback_start,
+    def _streak_statement(self, user_id: int, reference_date: date):
+        """Consecutive days with a session ending at `reference_date` (gaps-and-islands)"""
+        days = (
+            select(session_day_number(StudyDailyRollup.day).label("day"))
+            .where(
+                StudyDailyRollup.user_id == user_id,
+                StudyDailyRollup.day >= reference_date - timedelta(days=STREAK_LOOKBACK_DAYS),
+                StudyDailyRollup.day <= reference_date,
+            )
+            .subquery()
+        )
+        # Consecutive days walked backwards share day + row_number()
+        islands = select(
+            (days.c.day + func.row_number().over(order_by=days.c.day.desc())).label("island")
+        ).subquery()
+        return select(func.count()).select_from(islands).where(
+            islands.c.island == session_day_number(literal(reference_date, Date)) + 1
         )
-        sessions = list(self.session.exec(statement).all())
-        session_days = {session_entry.session_date.date() for session_entry in sessions}
-
-        streak = 0
-        current_day = reference_date
-        while current_day in session_days:
-            streak += 1
-            current_day -= timedelta(days=1)
-
-        return streak
 
-    def get_total_hours(self, user_id: int) -> float:
-        statement = select(func.sum(StudySession.duration_minutes)).where(StudySession.user_id == user_id)
-        total_minutes = self.session.exec(statement).one_or_none()
-        if not total_minutes or total_minutes[0] is None:
-            return 0.0
-        return round(total_minutes[0] / 60.0, 2)
+    async def get_total_hours(self, user_id: int) -> float:
+        statement = select(func.coalesce(func.sum(StudyDailyRollup.minutes), 0)).where(
+            StudyDailyRollup.user_id == user_id
+        )
+        total_minutes = (await self.session.exec(statement)).one()
+        return round(total_minutes / 60.0, 2)
 
 
 class UserRewardRepository:
     """Repository for user-defined rewards"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_rewards(self, user_id: int, ensure_defaults: bool = True) -> List[UserReward]:
+    async def get_rewards(self, user_id: int, ensure_defaults: bool = True) -> List[UserReward]:
         statement = select(UserReward).where(UserReward.user_id == user_id).order_by(UserReward.created_at)
-        rewards = list(self.session.exec(statement).all())
+        rewards = list((await self.session.exec(statement)).all())
 
         if ensure_defaults and not rewards:
-            rewards = self._create_default_rewards(user_id)
+            rewards = await self._create_default_rewards(user_id)
 
         return rewards
 
-    def _create_default_rewards(self, user_id: int) -> List[UserReward]:
+    async def _create_default_rewards(self, user_id: int) -> List[UserReward]:
         rewards: List[UserReward] = []
         for template in DEFAULT_REWARDS:
             reward = UserReward(
@@ -547,13 +759,13 @@ class UserRewardRepository:
             self.session.add(reward)
             rewards.append(reward)
 
-        self.session.commit()
+        await self.session.commit()
         for reward in rewards:
-            self.session.refresh(reward)
+            await self.session.refresh(reward)
 
         return rewards
 
-    def create_reward(self, user_id: int, reward_data: UserRewardCreate) -> UserReward:
+    async def create_reward(self, user_id: int, reward_data: UserRewardCreate) -> UserReward:
         reward = UserReward(
             user_id=user_id,
             condition=reward_data.condition.strip(),
@@ -561,13 +773,13 @@ class UserRewardRepository:
         )
 
         self.session.add(reward)
-        self.session.commit()
-        self.session.refresh(reward)
+        await self.session.commit()
+        await self.session.refresh(reward)
 
         return reward
 
-    def update_reward(self, user_id: int, reward_id: int, update_data: UserRewardUpdate) -> Optional[UserReward]:
-        reward = self.session.get(UserReward, reward_id)
+    async def update_reward(self, user_id: int, reward_id: int, update_data: UserRewardUpdate) -> Optional[UserReward]:
+        reward = await self.session.get(UserReward, reward_id)
         if not reward or reward.user_id != user_id:
             return None
 
@@ -581,8 +793,8 @@ class UserRewardRepository:
             reward.achieved_at = None
 
         reward.updated_at = datetime.now(timezone.utc)
-        self.session.commit()
-        self.session.refresh(reward)
+        await self.session.commit()
+        await self.session.refresh(reward)
 
         return reward
 
@@ -590,106 +802,123 @@ class UserRewardRepository:
 class TrackRepository:
     """Repository for learning tracks and progress"""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def ensure_defaults(self) -> None:
-        for track_data in DEFAULT_TRACKS:
-            track = self.session.exec(
-                select(LearningTrack).where(LearningTrack.slug == track_data["slug"])
-            ).first()
+    async def get_catalog_version(self) -> Optional[str]:
+        """Return the most recently applied catalog version, if any"""
+        statement = select(TrackCatalogVersion.version).order_by(
+            TrackCatalogVersion.applied_at.desc(), TrackCatalogVersion.id.desc()
+        ).limit(1)
+        return (await self.session.exec(statement)).first()
+
+    async def ensure_defaults(self) -> bool:
+        """Seed or update the default track catalog.
+
+        Runs once per catalog version: when the stored version matches
+        TRACK_CATALOG_VERSION this is a single SELECT. Returns True when the
+        catalog was (re)applied.
+        """
+        if await self.get_catalog_version() == TRACK_CATALOG_VERSION:
+            return False
+
+        tracks = {
+            track.slug: track
+            for track in (await self.session.exec(select(LearningTrack))).all()
+        }
+        modules = {
+            module.slug: module
+            for module in (await self.session.exec(select(TrackModule))).all()
+        }
+        lessons = {
+            lesson.slug: lesson
+            for lesson in (await self.session.exec(select(TrackLesson))).all()
+        }
 
+        for track_data in DEFAULT_TRACKS:
+            track = tracks.get(track_data["slug"])
             if not track:
-                track = LearningTrack(
-                    slug=track_data["slug"],
-                    name=track_data["name"],
-                    description=track_data.get("description"),
-                    color=track_data.get("color", "quantum"),
-                )
+                track = LearningTrack(slug=track_data["slug"])
                 self.session.add(track)
-                self.session.commit()
-                self.session.refresh(track)
+                tracks[track.slug] = track
+            track.name = track_data["name"]
+            track.description = track_data.get("description")
+            track.color = track_data.get("color", "quantum")
+        await self.session.flush()
 
+        for track_data in DEFAULT_TRACKS:
+            track = tracks[track_data["slug"]]
             for module_data in track_data.get("modules", []):
-                module = self.session.exec(
-                    select(TrackModule).where(TrackModule.slug == module_data["slug"])
-                ).first()
-
+                module = modules.get(module_data["slug"])
                 if not module:
-                    module = TrackModule(
-                        track_id=track.id,
-                        slug=module_data["slug"],
-                        title=module_data["title"],
-                        description=module_data.get("description"),
-                        order=module_data.get("order", 0),
-                    )
+                    module = TrackModule(slug=module_data["slug"], track_id=track.id)
                     self.session.add(module)
-                    self.session.commit()
-                    self.session.refresh(module)
+                    modules[module.slug] = module
+                module.track_id = track.id
+                module.title = module_data["title"]
+                module.description = module_data.get("description")
+                module.order = module_data.get("order", 0)
+        await self.session.flush()
 
+        for track_data in DEFAULT_TRACKS:
+            for module_data in track_data.get("modules", []):
+                module = modules[module_data["slug"]]
                 for lesson_data in module_data.get("lessons", []):
-                    lesson = self.session.exec(
-                        select(TrackLesson).where(TrackLesson.slug == lesson_data["slug"])
-                    ).first()
-
+                    lesson = lessons.get(lesson_data["slug"])
                     if not lesson:
-                        lesson = TrackLesson(
-                            module_id=module.id,
-                            slug=lesson_data["slug"],
-                            title=lesson_data["title"],
-                            order=lesson_data.get("order", 0),
-                        )
+                        lesson = TrackLesson(slug=lesson_data["slug"], module_id=module.id)
                         self.session.add(lesson)
-                        self.session.commit()
+                    lesson.module_id = module.id
+                    lesson.title = lesson_data["title"]
+                    lesson.order = lesson_data.get("order", 0)
+
+        # Workers starting together may both get here; the stamp is unique,
+        # and re-applying an older version (a rollback) just moves it to the top
+        applied_at = datetime.utcnow()
+        stamp = _dialect_insert(self.session)(TrackCatalogVersion).values(
+            version=TRACK_CATALOG_VERSION, applied_at=applied_at
+        )
+        await self.session.exec(
+            stamp.on_conflict_do_update(
+                index_elements=[TrackCatalogVersion.version], set_={"applied_at": applied_at}
+            )
+        )
+        await self.session.commit()
+        track_catalog.invalidate()
 
-    def get_tracks_with_progress(self, user_id: int) -> List[TrackResponse]:
-        self.ensure_defaults()
+        logger.info(f"Applied track catalog version {TRACK_CATALOG_VERSION[:12]}")
+        return True
 
-        tracks = list(
-            self.session.exec(
-                select(LearningTrack)
-                .options(selectinload(LearningTrack.modules).selectinload(TrackModule.lessons))
-                .order_by(LearningTrack.id)
-            ).unique().all()
-        )
+    async def get_catalog(self) -> CatalogSnapshot:
+        """Return the cached, pre-sorted catalog for the version seeded in the database"""
+        return await track_catalog.get(self.session)
 
-        progress_entries = list(
-            self.session.exec(
-                select(UserLessonProgress).where(UserLessonProgress.user_id == user_id)
-            ).all()
+    async def _get_completed_lesson_ids(self, user_id: int) -> set:
+        statement = select(UserLessonProgress.lesson_id).where(
+            UserLessonProgress.user_id == user_id,
+            UserLessonProgress.completed.is_(True),
         )
-        progress_map = {entry.lesson_id: entry for entry in progress_entries}
+        return set((await self.session.exec(statement)).all())
+
+    async def get_tracks_with_progress(self, user_id: int) -> List[TrackResponse]:
+        catalog = await self.get_catalog()
+        completed_ids = await self._get_completed_lesson_ids(user_id)
 
         track_responses: List[TrackResponse] = []
-        for track in tracks:
-            total_lessons = 0
-            completed_lessons = 0
+        for track in catalog.tracks:
             module_responses: List[TrackModuleResponse] = []
 
-            modules_sorted = sorted(track.modules, key=lambda m: m.order)
-            for module in modules_sorted:
-                lessons_sorted = sorted(module.lessons, key=lambda l: l.order)
-                lesson_responses: List[TrackLessonResponse] = []
-                module_completed = 0
-
-                for lesson in lessons_sorted:
-                    completed = progress_map.get(lesson.id).completed if progress_map.get(lesson.id) else False
-                    if completed:
-                        completed_lessons += 1
-                        module_completed += 1
-
-                    total_lessons += 1
-                    lesson_responses.append(
-                        TrackLessonResponse(
-                            id=lesson.id,
-                            slug=lesson.slug,
-                            title=lesson.title,
-                            order=lesson.order,
-                            completed=completed,
-                        )
+            for module in track.modules:
+                lesson_responses = [
+                    TrackLessonResponse(
+                        id=lesson.id,
+                        slug=lesson.slug,
+                        title=lesson.title,
+                        order=lesson.order,
+                        completed=lesson.id in completed_ids,
                     )
-
-                module_progress = (module_completed / len(lessons_sorted) * 100) if lessons_sorted else 0.0
+                    for lesson in module.lessons
+                ]
                 module_responses.append(
                     TrackModuleResponse(
                         id=module.id,
@@ -697,12 +926,11 @@ class TrackRepository:
                         title=module.title,
                         description=module.description,
                         order=module.order,
-                        progress=round(module_progress, 2),
+                        progress=_progress(module.lesson_ids, completed_ids),
                         lessons=lesson_responses,
                     )
                 )
 
-            track_progress = (completed_lessons / total_lessons * 100) if total_lessons else 0.0
             track_responses.append(
                 TrackResponse(
                     id=track.id,
@@ -710,37 +938,38 @@ class TrackRepository:
                     name=track.name,
                     description=track.description,
                     color=track.color,
-                    progress=round(track_progress, 2),
+                    progress=_progress(track.lesson_ids, completed_ids),
                     modules=module_responses,
                 )
             )
 
         return track_responses
 
-    def get_track_summary(self, user_id: int) -> List[TrackSummaryItem]:
-        tracks = self.get_tracks_with_progress(user_id)
+    async def get_track_summary(self, user_id: int) -> List[TrackSummaryItem]:
+        catalog = await self.get_catalog()
+        completed_ids = await self._get_completed_lesson_ids(user_id)
         return [
             TrackSummaryItem(
                 track_id=track.id,
                 slug=track.slug,
                 name=track.name,
                 color=track.color,
-                progress=track.progress,
+                progress=_progress(track.lesson_ids, completed_ids),
             )
-            for track in tracks
+            for track in catalog.tracks
         ]
 
-    def set_lesson_completion(self, user_id: int, lesson_id: int, completed: bool) -> Optional[UserLessonProgress]:
-        lesson = self.session.get(TrackLesson, lesson_id)
-        if not lesson:
+    async def set_lesson_completion(self, user_id: int, lesson_id: int, completed: bool) -> Optional[UserLessonProgress]:
+        catalog = await self.get_catalog()
+        if lesson_id not in catalog.lesson_ids:
             return None
 
-        progress = self.session.exec(
+        progress = (await self.session.exec(
             select(UserLessonProgress).where(
                 UserLessonProgress.user_id == user_id,
                 UserLessonProgress.lesson_id == lesson_id,
             )
-        ).first()
+        )).first()
 
         if not progress:
             progress = UserLessonProgress(user_id=user_id, lesson_id=lesson_id)
@@ -748,46 +977,25 @@ class TrackRepository:
 
         progress.completed = completed
         progress.completed_at = datetime.utcnow() if completed else None
-        self.session.commit()
-        self.session.refresh(progress)
+        await self.session.commit()
+        await self.session.refresh(progress)
 
         return progress
 
-    def get_completed_module_slugs(self, user_id: int) -> List[str]:
-        self.ensure_defaults()
-
-        progress_entries = list(
-            self.session.exec(
-                select(UserLessonProgress).where(
-                    UserLessonProgress.user_id == user_id,
-                    UserLessonProgress.completed.is_(True),
-                )
-            ).all()
-        )
-
-        completed_lessons = {entry.lesson_id for entry in progress_entries}
-        modules = list(
-            self.session.exec(
-                select(TrackModule).options(selectinload(TrackModule.lessons))
-            ).all()
-        )
 
-        completed_modules: List[str] = []
-        for module in modules:
-            lessons = module.lessons
-            if lessons and all(lesson.id in completed_lessons for lesson in lessons):
-                completed_modules.append(module.slug)
-
-        return completed_modules
+def _progress(lesson_ids: frozenset, completed_ids: set) -> float:
+    if not lesson_ids:
+        return 0.0
+    return round(len(lesson_ids & completed_ids) / len(lesson_ids) * 100, 2)
 
 
 class ProjectRepository:
     """Repository for project submission operations"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
     
-    def create_submission(self, user_id: int, submission_data: UserProjectSubmissionCreate) -> UserProjectSubmission:
+    async def create_submission(self, user_id: int, submission_data: UserProjectSubmissionCreate, commit: bool = True) -> UserProjectSubmission:
         """Create new project submission"""
         submission = UserProjectSubmission(
             user_id=user_id,
@@ -795,32 +1003,36 @@ class ProjectRepository:
         )
         
         self.session.add(submission)
-        self.session.commit()
-        self.session.refresh(submission)
+        if commit:
+            await self.session.commit()
+            await self.session.refresh(submission)
+        else:
+            await self.session.flush()
         
         logger.info(f"Created project submission: {submission.title} by user {user_id}")
         return submission
     
-    def get_user_submissions(self, user_id: int, skip: int = 0, limit: int = 20) -> List[UserProjectSubmission]:
+    async def get_user_submissions(self, user_id: int, skip: int = 0, limit: int = 20, cursor: Optional[Cursor] = None) -> List[UserProjectSubmission]:
         """Get user's project submissions"""
-        statement = select(UserProjectSubmission).where(
-            UserProjectSubmission.user_id == user_id
-        ).order_by(UserProjectSubmission.created_at.desc()).offset(skip).limit(limit)
+        statement = _paginate(
+            select(UserProjectSubmission).where(UserProjectSubmission.user_id == user_id),
+            UserProjectSubmission, skip, limit, cursor
+        )
         
-        return list(self.session.exec(statement).all())
+        return list((await self.session.exec(statement)).all())
     
-    def get_submission_by_id(self, submission_id: int, user_id: Optional[int] = None) -> Optional[UserProjectSubmission]:
+    async def get_submission_by_id(self, submission_id: int, user_id: Optional[int] = None) -> Optional[UserProjectSubmission]:
         """Get project submission by ID"""
         statement = select(UserProjectSubmission).where(UserProjectSubmission.id == submission_id)
         
         if user_id:
             statement = statement.where(UserProjectSubmission.user_id == user_id)
         
-        return self.session.exec(statement).first()
+        return (await self.session.exec(statement)).first()
     
-    def update_submission(self, submission_id: int, user_id: int, update_data: UserProjectSubmissionUpdate) -> Optional[UserProjectSubmission]:
+    async def update_submission(self, submission_id: int, user_id: int, update_data: UserProjectSubmissionUpdate) -> Optional[UserProjectSubmission]:
         """Update project submission"""
-        submission = self.get_submission_by_id(submission_id, user_id)
+        submission = await self.get_submission_by_id(submission_id, user_id)
         if not submission:
             return None
         
@@ -830,19 +1042,146 @@ class ProjectRepository:
             setattr(submission, field, value)
         
         submission.updated_at = datetime.now(timezone.utc)
-        self.session.commit()
-        self.session.refresh(submission)
+        await self.session.commit()
+        await self.session.refresh(submission)
         
         logger.info(f"Updated project submission: {submission.title}")
         return submission
     
-    def get_all_submissions(self, skip: int = 0, limit: int = 50, status_filter: Optional[str] = None) -> List[UserProjectSubmission]:
+    async def get_all_submissions(self, skip: int = 0, limit: int = 50, status_filter: Optional[str] = None, cursor: Optional[Cursor] = None) -> List[UserProjectSubmission]:
         """Get all project submissions (for admins/moderators)"""
         statement = select(UserProjectSubmission)
         
         if status_filter:
             statement = statement.where(UserProjectSubmission.status == status_filter)
         
-        statement = statement.order_by(UserProjectSubmission.created_at.desc()).offset(skip).limit(limit)
+        statement = _paginate(statement, UserProjectSubmission, skip, limit, cursor)
         
-        return list(self.session.exec(statement).all())
\ No newline at end of file
+        return list((await self.session.exec(statement)).all())
+
+
+class RefreshTokenRepository:
+    """Repository for refresh-token families"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_family(self, family_id: str, user_id: int, jti: str, token_hash: str, expires_at: datetime) -> None:
+        self.session.add(
+            RefreshToken(family_id=family_id, user_id=user_id, jti=jti, token_hash=token_hash, expires_at=expires_at)
+        )
+        await self.session.commit()
+
+    async def rotate(
+        self,
+        family_id: str,
+        jti: str,
+        token_hash: str,
+        new_jti: str,
+        new_token_hash: str,
+        expires_at: datetime,
+    ) -> Optional[Tuple[int, str, UserRole]]:
+        """Swap the family's current token for a new one in one statement.
+
+        The `UPDATE ... RETURNING` only matches while `jti` is still the
+        family's current, unrevoked, unexpired token of an active user, so
+        concurrent refreshes with the same token cannot both succeed.
+        Returns (user_id, email, role), or None when nothing matched.
+        """
+        now = datetime.utcnow()
+
+        def user_field(column):
+            # RETURNING may not reference other tables directly on SQLite
+            return select(column).where(User.id == RefreshToken.user_id).scalar_subquery()
+
+        statement = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.family_id == family_id,
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+                RefreshToken.user_id.in_(select(User.id).where(User.is_active.is_(True))),
+            )
+            .values(
+                jti=new_jti,
+                token_hash=new_token_hash,
+                generation=RefreshToken.generation + 1,
+                rotated_at=now,
+                expires_at=expires_at,
+            )
+            .returning(RefreshToken.user_id, user_field(User.email), user_field(User.role))
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.session.exec(statement)).first()
+        await self.session.commit()
+        if row is None:
+            return None
+        user_id, email, role = row
+        return user_id, email, UserRole(role)
+
+    async def revoke_family(self, family_id: str, reason: str, stale_jti: Optional[str] = None) -> bool:
+        """Revoke a family; with `stale_jti`, only if that token is no longer its current one (reuse)"""
+        statement = update(RefreshToken).where(
+            RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+        )
+        if stale_jti is not None:
+            statement = statement.where(RefreshToken.jti != stale_jti)
+        result = await self.session.exec(
+            statement.values(revoked_at=datetime.utcnow(), revoked_reason=reason)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def revoke_user_families(self, user_id: int, reason: str) -> int:
+        """Revoke every live family of `user_id` (e.g. after a password reset)"""
+        result = await self.session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow(), revoked_reason=reason)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def purge_expired(self) -> int:
+        """Delete families whose current token has expired"""
+        result = await self.session.exec(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.utcnow()))
+        await self.session.commit()
+        return result.rowcount
+
+
+class RevokedTokenRepository:
+    """Repository for the revoked_tokens table"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, jti: str, expires_at: datetime, user_id: Optional[int] = None) -> None:
+        """Record a revocation; revoking the same token twice is a no-op"""
+        statement = _dialect_insert(self.session)(RevokedToken).values(
+            jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=["jti"])
+        await self.session.exec(statement)
+        await self.session.commit()
+
+    async def is_revoked(self, jti: str) -> bool:
+        statement = select(RevokedToken.jti).where(
+            RevokedToken.jti == jti, RevokedToken.expires_at > datetime.utcnow()
+        )
+        return (await self.session.exec(statement)).first() is not None
+
+    async def revoked_since(self, since: Optional[datetime]) -> List[RevokedToken]:
+        """Unexpired revocations recorded at or after `since` (all of them when None)"""
+        statement = select(RevokedToken).where(RevokedToken.expires_at > datetime.utcnow())
+        if since is not None:
+            statement = statement.where(RevokedToken.revoked_at >= since)
+        return list((await self.session.exec(statement)).all())
+
+    async def purge_expired(self) -> int:
+        """Delete revocations of tokens that have expired anyway"""
+        result = await self.session.exec(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        await self.session.commit()
+        return result.rowcount
\ No newline at end of file
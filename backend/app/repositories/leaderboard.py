@@ -0,0 +1,390 @@
+"""XP leaderboard backends.
+
+The leaderboard is served from a sorted-set style backend so the public
+ranking never has to touch the database:
+
+- InMemoryLeaderboard keeps scores in an indexable skip list ordered by
+  (-total_xp, user_id); top-N, rank and players-around-me are O(log n). It
+  is per process, so it is periodically re-synced from the database.
+- RedisLeaderboard uses a Redis sorted set (ZADD/ZREVRANGE/ZREVRANK) shared
+  by every worker, plus a small hash per player for display fields. Scores
+  only ever move up (ZADD GT), and the set is re-synced from the database
+  every LEADERBOARD_SYNC_SECONDS to repair lost write-throughs; a short
+  SET NX lock lets one worker do that while the others keep serving.
+
+Loads merge into the current scores (keeping the higher one) instead of
+replacing them, so XP written through while a reload's snapshot was being
+read is not rolled back.
+
+GamificationRepository.add_xp writes through to the configured backend.
+"""
+
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis  # pylint: disable=import-error
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
+from app.core.config import settings
+from app.models.models import GamificationLevel, LeaderboardEntry
+
+MAX_LEVEL = 32
+
+ScoreKey = Tuple[int, int]  # (-total_xp, user_id)
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[ScoreKey], level: int) -> None:
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        # Number of bottom-level steps covered by each forward link
+        self.width: List[int] = [1] * level
+
+
+class RankIndex:
+    """Indexable skip list (order-statistic set) of score keys"""
+
+    def __init__(self) -> None:
+        self._head = _Node(None, MAX_LEVEL)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key: ScoreKey) -> None:
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        steps_at_level = [0] * MAX_LEVEL
+        node = self._head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = self._random_level()
+        new_node = _Node(key, height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: ScoreKey) -> None:
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key: ScoreKey) -> int:
+        """Zero-based position of `key`"""
+        node = self._head
+        position = 0
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+
+        found = node.next[0]
+        if found is None or found.key != key:
+            raise KeyError(key)
+        return position
+
+    def iter_from(self, start: int) -> Iterator[ScoreKey]:
+        """Iterate keys in order starting at zero-based position `start`"""
+        if start >= self._size:
+            return
+        node = self._head
+        remaining = max(start, 0) + 1
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+
+class LeaderboardBackend(ABC):
+    """Interface implemented by the leaderboard backends"""
+
+    @abstractmethod
+    async def needs_sync(self) -> bool:
+        """Whether the backend should be (re)loaded from the database"""
+
+    async def try_begin_sync(self) -> bool:
+        """Claim the reload that `needs_sync` asked for; False if another worker has it"""
+        return True
+
+    @abstractmethod
+    async def load(self, entries: List[LeaderboardEntry]) -> None:
+        """Merge a database snapshot, keeping the higher score; `rank` on the entries is ignored"""
+
+    @abstractmethod
+    async def record(self, user_id: int, total_xp: int, level: GamificationLevel, completed_trilhas: int) -> None:
+        """Write through a player's new score"""
+
+    @abstractmethod
+    async def set_username(self, user_id: int, username: str) -> None:
+        """Store the display name for a player"""
+
+    @abstractmethod
+    async def top(self, limit: int) -> List[LeaderboardEntry]:
+        """Best `limit` players"""
+
+    @abstractmethod
+    async def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank of `user_id`, or None if they are not ranked"""
+
+    @abstractmethod
+    async def around(self, user_id: int, radius: int) -> List[LeaderboardEntry]:
+        """Players within `radius` places of `user_id`"""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Number of ranked players"""
+
+
+class InMemoryLeaderboard(LeaderboardBackend):
+    """Process-local leaderboard, for tests and single-node deployments"""
+
+    def __init__(self, sync_seconds: float = 60) -> None:
+        self.sync_seconds = sync_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        self._index = RankIndex()
+        self._scores: Dict[int, int] = {}
+        self._members: Dict[int, Tuple[str, GamificationLevel, int]] = {}
+        self._synced_at: Optional[float] = None
+
+    async def needs_sync(self) -> bool:
+        # Other workers' awards are invisible here, so re-sync periodically
+        return self._synced_at is None or time.monotonic() - self._synced_at > self.sync_seconds
+
+    async def load(self, entries: List[LeaderboardEntry]) -> None:
+        # Scores recorded while the snapshot was read may be newer than it
+        scores = dict(self._scores)
+        members = dict(self._members)
+        for entry in entries:
+            if entry.total_xp >= scores.get(entry.user_id, entry.total_xp):
+                scores[entry.user_id] = entry.total_xp
+                members[entry.user_id] = (entry.username, entry.level, entry.completed_trilhas)
+        index = RankIndex()
+        for user_id, total_xp in scores.items():
+            index.insert((-total_xp, user_id))
+        self._index = index
+        self._scores = scores
+        self._members = members
+        self._synced_at = time.monotonic()
+
+    async def record(self, user_id: int, total_xp: int, level: GamificationLevel, completed_trilhas: int) -> None:
+        previous = self._scores.get(user_id)
+        if previous != total_xp:
+            if previous is not None:
+                self._index.remove((-previous, user_id))
+            self._index.insert((-total_xp, user_id))
+            self._scores[user_id] = total_xp
+        username = self._members.get(user_id, ("Unknown",))[0]
+        self._members[user_id] = (username, level, completed_trilhas)
+
+    async def set_username(self, user_id: int, username: str) -> None:
+        _, level, completed_trilhas = self._members.get(user_id, (None, GamificationLevel.INICIANTE, 0))
+        self._members[user_id] = (username, level, completed_trilhas)
+
+    async def top(self, limit: int) -> List[LeaderboardEntry]:
+        return self._slice(0, limit)
+
+    async def rank(self, user_id: int) -> Optional[int]:
+        return self._rank(user_id)
+
+    async def around(self, user_id: int, radius: int) -> List[LeaderboardEntry]:
+        rank = self._rank(user_id)
+        if rank is None:
+            return []
+        start = max(rank - 1 - radius, 0)
+        return self._slice(start, rank + radius - start)
+
+    async def count(self) -> int:
+        return len(self._index)
+
+    def _rank(self, user_id: int) -> Optional[int]:
+        total_xp = self._scores.get(user_id)
+        if total_xp is None:
+            return None
+        return self._index.rank((-total_xp, user_id)) + 1
+
+    def _slice(self, start: int, count: int) -> List[LeaderboardEntry]:
+        entries: List[LeaderboardEntry] = []
+        for offset, (negative_xp, user_id) in enumerate(self._index.iter_from(start)):
+            if offset >= count:
+                break
+            username, level, completed_trilhas = self._members.get(
+                user_id, ("Unknown", GamificationLevel.INICIANTE, 0)
+            )
+            entries.append(
+                LeaderboardEntry(
+                    rank=start + offset + 1,
+                    user_id=user_id,
+                    username=username,
+                    total_xp=-negative_xp,
+                    level=level,
+                    completed_trilhas=completed_trilhas,
+                )
+            )
+        return entries
+
+
+class RedisLeaderboard(LeaderboardBackend):
+    """Leaderboard on a Redis sorted set, shared by all workers.
+
+    Ties are ordered by Redis (member order), not by user id.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "qpath:leaderboard",
+        sync_seconds: int = 60,
+        sync_lock_seconds: int = 30,
+        client=None,
+    ) -> None:
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("Redis leaderboard requires the redis package. Install with: pip install redis")
+            client = aioredis.from_url(url, decode_responses=True)
+        self.client = client
+        self.sync_seconds = sync_seconds
+        self.sync_lock_seconds = sync_lock_seconds
+        self.scores_key = f"{prefix}:xp"
+        self.synced_key = f"{prefix}:synced"
+        self.syncing_key = f"{prefix}:syncing"
+        self.member_prefix = f"{prefix}:member:"
+
+    async def needs_sync(self) -> bool:
+        # Shared by every worker: the marker expires after sync_seconds, so
+        # the set is reloaded periodically and dropped write-throughs heal
+        return not await self.client.exists(self.synced_key)
+
+    async def try_begin_sync(self) -> bool:
+        # Only the worker that wins the lock reloads; the rest serve the
+        # current set. The lock expires on its own if that worker dies.
+        return bool(await self.client.set(self.syncing_key, 1, nx=True, ex=self.sync_lock_seconds))
+
+    async def load(self, entries: List[LeaderboardEntry]) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            if entries:
+                # GT: never lower a score written through since the snapshot
+                pipe.zadd(self.scores_key, {str(entry.user_id): entry.total_xp for entry in entries}, gt=True)
+            for entry in entries:
+                pipe.hset(
+                    self._member_key(entry.user_id),
+                    mapping={
+                        "username": entry.username,
+                        "level": entry.level.value,
+                        "completed_trilhas": entry.completed_trilhas,
+                    },
+                )
+            pipe.set(self.synced_key, int(time.time()), ex=self.sync_seconds)
+            pipe.delete(self.syncing_key)
+            await pipe.execute()
+
+    async def record(self, user_id: int, total_xp: int, level: GamificationLevel, completed_trilhas: int) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            # XP never decreases, so GT keeps a late, out-of-order write from
+            # lowering the score
+            pipe.zadd(self.scores_key, {str(user_id): total_xp}, gt=True)
+            pipe.hset(
+                self._member_key(user_id),
+                mapping={"level": level.value, "completed_trilhas": completed_trilhas},
+            )
+            await pipe.execute()
+
+    async def set_username(self, user_id: int, username: str) -> None:
+        await self.client.hset(self._member_key(user_id), "username", username)
+
+    async def top(self, limit: int) -> List[LeaderboardEntry]:
+        return await self._range(0, limit)
+
+    async def rank(self, user_id: int) -> Optional[int]:
+        rank = await self.client.zrevrank(self.scores_key, str(user_id))
+        return None if rank is None else rank + 1
+
+    async def around(self, user_id: int, radius: int) -> List[LeaderboardEntry]:
+        rank = await self.rank(user_id)
+        if rank is None:
+            return []
+        start = max(rank - 1 - radius, 0)
+        return await self._range(start, rank + radius - start)
+
+    async def count(self) -> int:
+        return await self.client.zcard(self.scores_key)
+
+    def _member_key(self, user_id: int) -> str:
+        return f"{self.member_prefix}{user_id}"
+
+    async def _range(self, start: int, count: int) -> List[LeaderboardEntry]:
+        if count <= 0:
+            return []
+        scores = await self.client.zrevrange(self.scores_key, start, start + count - 1, withscores=True)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for member, _ in scores:
+                pipe.hgetall(self._member_key(int(member)))
+            members = await pipe.execute()
+
+        return [
+            LeaderboardEntry(
+                rank=start + offset + 1,
+                user_id=int(member),
+                username=details.get("username", "Unknown"),
+                total_xp=int(score),
+                level=GamificationLevel(details.get("level", GamificationLevel.INICIANTE.value)),
+                completed_trilhas=int(details.get("completed_trilhas", 0)),
+            )
+            for offset, ((member, score), details) in enumerate(zip(scores, members))
+        ]
+
+
+def create_leaderboard() -> LeaderboardBackend:
+    """Build the backend selected by LEADERBOARD_BACKEND"""
+    if settings.LEADERBOARD_BACKEND == "redis":
+        return RedisLeaderboard(settings.REDIS_URL, sync_seconds=settings.LEADERBOARD_SYNC_SECONDS)
+    return InMemoryLeaderboard(sync_seconds=settings.LEADERBOARD_SYNC_SECONDS)
+
+
+leaderboard = create_leaderboard()
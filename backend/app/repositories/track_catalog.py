@@ -0,0 +1,147 @@
+"""In-process snapshot of the learning track catalog.
+
+The LearningTrack -> TrackModule -> TrackLesson tree is the same for every
+user and only changes when a new catalog version is seeded, so it is loaded
+once per process, pre-sorted into immutable tuples and reused. Per-user
+progress is computed by joining the snapshot against the user's completed
+lesson ids.
+
+The snapshot is keyed by the version stamp the database reports, not by
+the one in the running code: during a rolling deploy, or after a failed
+seed, the two legitimately differ. Every TRACK_CATALOG_REFRESH_SECONDS the
+stamp is re-read (one small SELECT) and the tree is reloaded only if it
+changed; a seed in this process invalidates the snapshot immediately.
+"""
+
+import time
+from typing import Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models.models import LearningTrack, TrackModule, TrackLesson, TrackCatalogVersion
+
+
+class CatalogLesson(NamedTuple):
+    id: int
+    slug: str
+    title: str
+    order: int
+
+
+class CatalogModule(NamedTuple):
+    id: int
+    slug: str
+    title: str
+    description: Optional[str]
+    order: int
+    lessons: Tuple[CatalogLesson, ...]
+    lesson_ids: FrozenSet[int]
+
+
+class CatalogTrack(NamedTuple):
+    id: int
+    slug: str
+    name: str
+    description: Optional[str]
+    color: str
+    modules: Tuple[CatalogModule, ...]
+    lesson_ids: FrozenSet[int]
+
+
+class CatalogSnapshot(NamedTuple):
+    version: Optional[str]
+    tracks: Tuple[CatalogTrack, ...]
+    lesson_ids: FrozenSet[int]
+
+
+class TrackCatalogCache:
+    """Process-wide cache of the catalog, keyed by the database's catalog version"""
+
+    def __init__(self, refresh_seconds: float = 60, clock: Callable[[], float] = time.monotonic) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+
+    async def get(self, session: AsyncSession) -> CatalogSnapshot:
+        """Return the cached snapshot, revalidating it once per refresh interval"""
+        snapshot = self._snapshot
+        now = self._clock()
+        if snapshot is not None and now - self._checked_at < self.refresh_seconds:
+            return snapshot
+        # Concurrent misses may each build a snapshot; the last one wins and
+        # all of them are equivalent, so no lock is needed.
+        version = await self._load_version(session)
+        if snapshot is None or snapshot.version != version:
+            snapshot = await self._load(session, version)
+            self._snapshot = snapshot
+        self._checked_at = now
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot (e.g. after a catalog seed)"""
+        self._snapshot = None
+
+    @staticmethod
+    async def _load_version(session: AsyncSession) -> Optional[str]:
+        return (await session.exec(
+            select(TrackCatalogVersion.version)
+            .order_by(TrackCatalogVersion.applied_at.desc(), TrackCatalogVersion.id.desc())
+            .limit(1)
+        )).first()
+
+    async def _load(self, session: AsyncSession, version: Optional[str]) -> CatalogSnapshot:
+        tracks = (await session.exec(select(LearningTrack).order_by(LearningTrack.id))).all()
+        modules = (await session.exec(
+            select(TrackModule).order_by(TrackModule.order, TrackModule.id)
+        )).all()
+        lessons = (await session.exec(
+            select(TrackLesson).order_by(TrackLesson.order, TrackLesson.id)
+        )).all()
+
+        lessons_by_module: Dict[int, list] = {}
+        for lesson in lessons:
+            lessons_by_module.setdefault(lesson.module_id, []).append(
+                CatalogLesson(id=lesson.id, slug=lesson.slug, title=lesson.title, order=lesson.order)
+            )
+
+        modules_by_track: Dict[int, list] = {}
+        for module in modules:
+            module_lessons = tuple(lessons_by_module.get(module.id, ()))
+            modules_by_track.setdefault(module.track_id, []).append(
+                CatalogModule(
+                    id=module.id,
+                    slug=module.slug,
+                    title=module.title,
+                    description=module.description,
+                    order=module.order,
+                    lessons=module_lessons,
+                    lesson_ids=frozenset(lesson.id for lesson in module_lessons),
+                )
+            )
+
+        catalog_tracks = []
+        for track in tracks:
+            track_modules = tuple(modules_by_track.get(track.id, ()))
+            catalog_tracks.append(
+                CatalogTrack(
+                    id=track.id,
+                    slug=track.slug,
+                    name=track.name,
+                    description=track.description,
+                    color=track.color,
+                    modules=track_modules,
+                    lesson_ids=frozenset().union(*(module.lesson_ids for module in track_modules)),
+                )
+            )
+
+        return CatalogSnapshot(
+            version=version,
+            tracks=tuple(catalog_tracks),
+            lesson_ids=frozenset(lesson.id for lesson in lessons),
+        )
+
+
+track_catalog = TrackCatalogCache(refresh_seconds=settings.TRACK_CATALOG_REFRESH_SECONDS)
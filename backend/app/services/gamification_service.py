@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
 
 from fastapi import Depends
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import get_session
+from app.core.database import get_async_session
+from app.core.pagination import Cursor
+from app.core.single_flight import SingleFlight
 from app.models.models import (
     GamificationProfileResponse,
     ActivityLogResponse,
@@ -24,8 +25,7 @@ from app.models.models import (
     ProfileDetailsResponse,
     ProfileStatsResponse,
     AchievementResponse,
-    User,
-    GamificationProfile,
+    LeaderboardPositionResponse,
 )
 from app.repositories.base import (
     GamificationRepository,
@@ -34,16 +34,20 @@ from app.repositories.base import (
     UserRewardRepository,
     TrackRepository,
 )
+from app.repositories.leaderboard import InMemoryLeaderboard, LeaderboardBackend, leaderboard
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Concurrent requests in this process share one leaderboard reload
+_leaderboard_sync = SingleFlight()
+
 
 class GamificationService:
     """Service layer for gamification operations"""
 
-    def __init__(self, session: Session = Depends(get_session)):
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
         self.session = session
         self.gamification_repo = GamificationRepository(session)
         self.task_repo = StudyTaskRepository(session)
@@ -52,14 +56,14 @@ class GamificationService:
         self.track_repo = TrackRepository(session)
 
     # Core profile operations -------------------------------------------------
-    def get_user_profile(self, user_id: int) -> Optional[GamificationProfileResponse]:
-        profile = self.gamification_repo.get_profile(user_id)
+    async def get_user_profile(self, user_id: int) -> Optional[GamificationProfileResponse]:
+        profile = await self.gamification_repo.get_profile(user_id)
         if not profile:
             return None
 
         return GamificationProfileResponse.model_validate(profile)
 
-    def add_xp(
+    async def add_xp(
         self,
         user_id: int,
         xp_amount: int,
@@ -67,7 +71,7 @@ class GamificationService:
         description: str,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> GamificationProfileResponse:
-        profile = self.gamification_repo.add_xp(
+        profile = await self.gamification_repo.add_xp(
             user_id=user_id,
             xp_amount=xp_amount,
             activity_type=activity_type,
@@ -77,90 +81,95 @@ class GamificationService:
 
         return GamificationProfileResponse.model_validate(profile)
 
-    def complete_trilha(
+    async def complete_trilha(
         self, user_id: int, trilha_name: str, xp_earned: int = 100
     ) -> GamificationProfileResponse:
-        profile = self.gamification_repo.get_profile(user_id)
-        if profile:
-            profile.completed_trilhas += 1
-            profile.updated_at = datetime.now(timezone.utc)
-            self.session.commit()
-
-        updated_profile = self.gamification_repo.add_xp(
+        updated_profile = await self.gamification_repo.add_xp(
             user_id=user_id,
             xp_amount=xp_earned,
             activity_type=ActivityType.TRILHA_COMPLETION,
             description=f"Trilha '{trilha_name}' completada!",
             metadata={"trilha_name": trilha_name, "xp_earned": xp_earned},
+            counters={"completed_trilhas": 1},
         )
 
         return GamificationProfileResponse.model_validate(updated_profile)
 
-    def log_pomodoro_session(
+    async def log_pomodoro_session(
         self, user_id: int, duration_minutes: int
     ) -> GamificationProfileResponse:
-        # Persist study session for progress analytics
-        self.session_repo.log_session(user_id=user_id, duration_minutes=duration_minutes)
+        # Persist study session for progress analytics; committed with the XP award
+        await self.session_repo.log_session(
+            user_id=user_id, duration_minutes=duration_minutes, commit=False
+        )
 
         xp_amount = min(duration_minutes, 60)
-        profile = self.gamification_repo.get_profile(user_id)
-        if profile:
-            profile.pomodoro_sessions += 1
-            profile.updated_at = datetime.now(timezone.utc)
-            self.session.commit()
-
-        updated_profile = self.gamification_repo.add_xp(
+        updated_profile = await self.gamification_repo.add_xp(
             user_id=user_id,
             xp_amount=xp_amount,
             activity_type=ActivityType.POMODORO_SESSION,
             description=f"Sessão Pomodoro de {duration_minutes} minutos concluída!",
             metadata={"duration_minutes": duration_minutes, "xp_earned": xp_amount},
+            counters={"pomodoro_sessions": 1},
         )
 
         return GamificationProfileResponse.model_validate(updated_profile)
 
-    def get_activity_logs(
-        self, user_id: int, skip: int = 0, limit: int = 50
+    async def get_activity_logs(
+        self, user_id: int, skip: int = 0, limit: int = 50, cursor: Optional[Cursor] = None
     ) -> List[ActivityLogResponse]:
-        activities = self.gamification_repo.get_activity_logs(
-            user_id, skip=skip, limit=limit
+        activities = await self.gamification_repo.get_activity_logs(
+            user_id, skip=skip, limit=limit, cursor=cursor
         )
         return [ActivityLogResponse.model_validate(activity) for activity in activities]
 
-    def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def _sync_leaderboard(self) -> None:
+        if await leaderboard.needs_sync():
+            await _leaderboard_sync.do("leaderboard", self._reload_leaderboard)
+
+    async def _reload_leaderboard(self) -> None:
+        if await leaderboard.try_begin_sync():
+            await leaderboard.load(await self.gamification_repo.get_leaderboard_snapshot())
+
+    async def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
         try:
-            statement = (
-                select(GamificationProfile)
-                .order_by(GamificationProfile.total_xp.desc())
-                .limit(limit)
-            )
-            profiles = list(self.session.exec(statement).all())
-
-            leaderboard: List[Dict[str, Any]] = []
-            for rank, profile in enumerate(profiles, 1):
-                user = self.session.get(User, profile.user_id)
-                leaderboard.append(
-                    {
-                        "rank": rank,
-                        "username": user.username if user else "Unknown",
-                        "total_xp": profile.total_xp,
-                        "level": profile.current_level,
-                        "completed_trilhas": profile.completed_trilhas,
-                    }
-                )
-
-            return leaderboard
+            await self._sync_leaderboard()
+            entries = await leaderboard.top(limit)
+            return [entry.model_dump(exclude={"user_id"}) for entry in entries]
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.error("Error getting leaderboard: %s", str(exc))
             return []
 
+    async def get_leaderboard_position(
+        self, user_id: int, radius: int = 2
+    ) -> LeaderboardPositionResponse:
+        try:
+            await self._sync_leaderboard()
+            return await self._leaderboard_position(leaderboard, user_id, radius)
+        except Exception as exc:
+            # Backend unavailable (e.g. Redis down): rank from the database
+            logger.error("Error getting leaderboard position, using the database: %s", str(exc))
+        fallback = InMemoryLeaderboard()
+        await fallback.load(await self.gamification_repo.get_leaderboard_snapshot())
+        return await self._leaderboard_position(fallback, user_id, radius)
+
+    @staticmethod
+    async def _leaderboard_position(
+        board: LeaderboardBackend, user_id: int, radius: int
+    ) -> LeaderboardPositionResponse:
+        return LeaderboardPositionResponse(
+            rank=await board.rank(user_id),
+            total_players=await board.count(),
+            around=await board.around(user_id, radius),
+        )
+
     # Dashboard ----------------------------------------------------------------
-    def get_dashboard_data(self, user_id: int) -> DashboardResponse:
+    async def get_dashboard_data(self, user_id: int) -> DashboardResponse:
         tasks = [
-            StudyTaskResponse.model_validate(task) for task in self.task_repo.get_tasks(user_id)
+            StudyTaskResponse.model_validate(task) for task in await self.task_repo.get_tasks(user_id)
         ]
-        week_progress = self.session_repo.get_weekly_progress(user_id)
-        track_summary = self.track_repo.get_track_summary(user_id)
+        week_progress = await self.session_repo.get_weekly_progress(user_id)
+        track_summary = await self.track_repo.get_track_summary(user_id)
 
         return DashboardResponse(
             tasks=tasks,
@@ -168,67 +177,70 @@ class GamificationService:
             track_summary=track_summary,
         )
 
-    def replace_tasks(self, user_id: int, tasks_payload: List[Dict[str, Any]]) -> List[StudyTaskResponse]:
-        tasks = self.task_repo.replace_tasks(user_id, tasks_payload)
+    async def replace_tasks(self, user_id: int, tasks_payload: List[Dict[str, Any]]) -> List[StudyTaskResponse]:
+        tasks = await self.task_repo.replace_tasks(user_id, tasks_payload)
         return [StudyTaskResponse.model_validate(task) for task in tasks]
 
-    def update_task_completion(
+    async def update_task_completion(
         self, user_id: int, task_id: int, completed: bool
     ) -> Optional[StudyTaskResponse]:
-        task = self.task_repo.update_task_completion(user_id, task_id, completed)
+        task = await self.task_repo.update_task_completion(user_id, task_id, completed)
         if not task:
             return None
         return StudyTaskResponse.model_validate(task)
 
     # Rewards ------------------------------------------------------------------
-    def get_rewards(self, user_id: int) -> List[UserRewardResponse]:
-        rewards = self.reward_repo.get_rewards(user_id)
+    async def get_rewards(self, user_id: int) -> List[UserRewardResponse]:
+        rewards = await self.reward_repo.get_rewards(user_id)
         return [UserRewardResponse.model_validate(reward) for reward in rewards]
 
-    def create_reward(self, user_id: int, data: UserRewardCreate) -> UserRewardResponse:
-        reward = self.reward_repo.create_reward(user_id, data)
+    async def create_reward(self, user_id: int, data: UserRewardCreate) -> UserRewardResponse:
+        reward = await self.reward_repo.create_reward(user_id, data)
         return UserRewardResponse.model_validate(reward)
 
-    def update_reward(
+    async def update_reward(
         self, user_id: int, reward_id: int, data: UserRewardUpdate
     ) -> Optional[UserRewardResponse]:
-        reward = self.reward_repo.update_reward(user_id, reward_id, data)
+        reward = await self.reward_repo.update_reward(user_id, reward_id, data)
         if not reward:
             return None
         return UserRewardResponse.model_validate(reward)
 
     # Tracks -------------------------------------------------------------------
-    def get_tracks(self, user_id: int) -> List[TrackResponse]:
-        return self.track_repo.get_tracks_with_progress(user_id)
+    async def get_tracks(self, user_id: int) -> List[TrackResponse]:
+        return await self.track_repo.get_tracks_with_progress(user_id)
 
-    def get_track_summary(self, user_id: int) -> List[TrackSummaryItem]:
-        return self.track_repo.get_track_summary(user_id)
+    async def get_track_summary(self, user_id: int) -> List[TrackSummaryItem]:
+        return await self.track_repo.get_track_summary(user_id)
 
-    def update_lesson_completion(
+    async def update_lesson_completion(
         self, user_id: int, lesson_id: int, completed: bool
     ) -> bool:
-        progress = self.track_repo.set_lesson_completion(user_id, lesson_id, completed)
+        progress = await self.track_repo.set_lesson_completion(user_id, lesson_id, completed)
         return progress is not None
 
     # Profile details ----------------------------------------------------------
-    def get_profile_details(self, user_id: int) -> ProfileDetailsResponse:
-        profile = self.get_user_profile(user_id)
+    async def get_profile_details(self, user_id: int) -> ProfileDetailsResponse:
+        profile = await self.get_user_profile(user_id)
         if not profile:
             raise ValueError("Gamification profile not found")
 
-        rewards = self.get_rewards(user_id)
-        tracks = self.get_tracks(user_id)
-        week_progress = self.session_repo.get_weekly_progress(user_id)
-        total_hours = self.session_repo.get_total_hours(user_id)
-
-        completed_lessons = sum(
-            1 for track in tracks for module in track.modules for lesson in module.lessons if lesson.completed
-        )
-        total_lessons = sum(
-            1 for track in tracks for module in track.modules for _ in module.lessons
-        )
-
-        completed_modules = set(self.track_repo.get_completed_module_slugs(user_id))
+        rewards = await self.get_rewards(user_id)
+        tracks = await self.get_tracks(user_id)
+        week_progress = await self.session_repo.get_weekly_progress(user_id)
+        total_hours = await self.session_repo.get_total_hours(user_id)
+
+        # Completion is already in the track tree; derive the counts and the
+        # finished modules from it instead of asking the repository again
+        lessons = [lesson for track in tracks for module in track.modules for lesson in module.lessons]
+        completed_lessons = sum(1 for lesson in lessons if lesson.completed)
+        total_lessons = len(lessons)
+        completed_modules = {
+            module.slug
+            for track in tracks
+            for module in track.modules
+            if module.lessons and all(lesson.completed for lesson in module.lessons)
+        }
 
         achievements = self._build_achievements(
             profile=profile,
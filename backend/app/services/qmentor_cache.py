@@ -0,0 +1,186 @@
+"""
+Response cache for Q-Mentor generations.
+
+Entries are keyed on a fingerprint of the prompt after case, accent and
+whitespace folding, so "Cibersegurança" and "  ciberseguranca " share one
+answer. The in-process tier is an LRU bounded by entry count with a TTL per
+entry; an optional SQLite file tier keeps answers across restarts and
+refills the in-process tier on a miss. Expired entries stay until evicted so
+get_stale can still answer while the model is unreachable.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(text: str) -> str:
+    """Fold case, accents and runs of whitespace"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def prompt_fingerprint(prompt: str) -> str:
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Blocking SQLite store; called through asyncio.to_thread"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS qmentor_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._connection.execute("DELETE FROM qmentor_cache WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM qmentor_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO qmentor_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM qmentor_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class QMentorResponseCache:
+    """TTL + LRU cache of generated text with an optional SQLite tier"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.QMENTOR_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.QMENTOR_CACHE_TTL_SECONDS,
+        sqlite_path: Optional[str] = settings.QMENTOR_CACHE_PATH,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._disk: Optional[_SQLiteTier] = None
+        if sqlite_path:
+            try:
+                self._disk = _SQLiteTier(sqlite_path)
+            except sqlite3.Error as e:
+                logger.error(f"Q-Mentor cache: SQLite tier disabled ({e})")
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get(self, prompt: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        key = prompt_fingerprint(prompt)
+        now = self._clock()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+        stored = await self._read_disk(key)
+        if stored is not None and stored[1] > now:
+            self._remember(key, stored[0], stored[1])
+            self._disk_hits += 1
+            return stored[0]
+
+        self._misses += 1
+        return None
+
+    async def get_stale(self, prompt: str) -> Optional[str]:
+        """Return a cached answer even if its TTL has passed (fallback use)"""
+        if not self.enabled:
+            return None
+        key = prompt_fingerprint(prompt)
+        entry = self._entries.get(key) or await self._read_disk(key)
+        if entry is None:
+            return None
+        self._stale_hits += 1
+        return entry[0]
+
+    async def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        if self._disk is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._disk.get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"Q-Mentor cache: SQLite read failed ({e})")
+            return None
+
+    async def set(self, prompt: str, value: str) -> None:
+        if not self.enabled:
+            return
+        key = prompt_fingerprint(prompt)
+        expires_at = self._clock() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Q-Mentor cache: SQLite write failed ({e})")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self._hits + self._disk_hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "persistent": self._disk is not None,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "stale_hits": self._stale_hits,
+            "evictions": self._evictions,
+            "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
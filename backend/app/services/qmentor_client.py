@@ -0,0 +1,232 @@
+"""
+Async client for the Q-Mentor generative model.
+
+Every mentor call goes through QMentorClient.generate (or .stream), which
+never blocks the event loop: it uses the SDK's async generation when the
+model provides it and otherwise runs the synchronous call on a dedicated,
+bounded thread pool. A semaphore caps the number of calls in flight, and
+both the wait for a slot and the call itself are bounded by timeouts so a
+slow upstream cannot pile up requests indefinitely.
+
+A timeout only abandons the call on the caller's side: a synchronous SDK
+call cannot be interrupted, so its pool thread stays busy until the SDK
+returns. Its slot is released right away, so while stragglers finish, new
+calls can wait for a free thread and that wait counts against their own
+timeout.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QMentorError(Exception):
+    """Base error for failed Q-Mentor model calls"""
+
+
+class QMentorUnavailableError(QMentorError):
+    """No model is configured"""
+
+
+class QMentorOverloadedError(QMentorError):
+    """No concurrency slot became free within the queue timeout"""
+
+
+class QMentorTimeoutError(QMentorError):
+    """The model did not answer within the call timeout"""
+
+
+class QMentorCircuitOpenError(QMentorError):
+    """The circuit breaker is open; the model was not called"""
+
+
+class QMentorClient:
+    """Bounded-concurrency async wrapper around a Gemini GenerativeModel"""
+
+    def __init__(
+        self,
+        model: Any = None,
+        max_concurrency: int = settings.QMENTOR_MAX_CONCURRENCY,
+        timeout: float = settings.QMENTOR_TIMEOUT_SECONDS,
+        queue_timeout: float = settings.QMENTOR_QUEUE_TIMEOUT_SECONDS,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.model = model
+        self.breaker = breaker or CircuitBreaker(
+            "qmentor",
+            window=settings.QMENTOR_BREAKER_WINDOW,
+            min_calls=settings.QMENTOR_BREAKER_MIN_CALLS,
+            error_rate_threshold=settings.QMENTOR_BREAKER_ERROR_RATE,
+            p95_latency_threshold=settings.QMENTOR_BREAKER_P95_SECONDS,
+            open_seconds=settings.QMENTOR_BREAKER_OPEN_SECONDS,
+        )
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # asyncio primitives bind to the loop they are first used on, so keep
+        # one semaphore per running loop (tests and workers may use several)
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._queued = 0
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._total_latency = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="qmentor"
+            )
+        return self._executor
+
+    async def _call_model(self, prompt: str) -> str:
+        generate_async = getattr(self.model, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                self._get_executor(), self.model.generate_content, prompt
+            )
+        return response.text
+
+    async def _model_chunks(self, prompt: str) -> AsyncIterator[Any]:
+        generate_async = getattr(self.model, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt, stream=True)
+            async for chunk in response:
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        iterator = await loop.run_in_executor(
+            executor, partial(self.model.generate_content, prompt, stream=True)
+        )
+        exhausted = object()
+        while (chunk := await loop.run_in_executor(executor, next, iterator, exhausted)) is not exhausted:
+            yield chunk
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one concurrency slot, recording queueing and call outcome"""
+        if self.model is None:
+            raise QMentorUnavailableError("Q-Mentor model is not configured")
+        # Fail fast while the upstream is unhealthy instead of queueing
+        if not self.breaker.allow():
+            raise QMentorCircuitOpenError(
+                f"Q-Mentor circuit open; retry in {self.breaker.retry_after():.0f}s"
+            )
+
+        slots = self._get_slots()
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            self.breaker.record_abandoned()
+            raise QMentorOverloadedError(
+                f"No Q-Mentor slot free after {self.queue_timeout}s"
+            ) from None
+        except BaseException:
+            self.breaker.record_abandoned()
+            raise
+        finally:
+            self._queued -= 1
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            yield
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._failed += 1
+            self.breaker.record_failure(time.perf_counter() - started)
+            raise QMentorTimeoutError(
+                f"Q-Mentor model did not answer within {self.timeout}s"
+            ) from None
+        except Exception:
+            self._failed += 1
+            self.breaker.record_failure(time.perf_counter() - started)
+            raise
+        except BaseException:
+            # cancelled or closed by the caller: no verdict on the upstream
+            self.breaker.record_abandoned()
+            raise
+        else:
+            self._completed += 1
+            self.breaker.record_success(time.perf_counter() - started)
+        finally:
+            self._in_flight -= 1
+            self._total_latency += time.perf_counter() - started
+            slots.release()
+
+    async def generate(self, prompt: str) -> str:
+        """Generate a completion for `prompt` without blocking the event loop"""
+        async with self._slot():
+            return await asyncio.wait_for(self._call_model(prompt), timeout=self.timeout)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as the model produces them.
+
+        Chunks are pulled from the model only as fast as the caller consumes
+        them, and each one must arrive within the call timeout.
+        """
+        async with self._slot():
+            chunks = self._model_chunks(prompt)
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        return
+                    if chunk.text:
+                        yield chunk.text
+            finally:
+                await chunks.aclose()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, concurrency and outcome counters"""
+        calls = self._completed + self._failed
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_queue_depth": self._max_queue_depth,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "avg_latency_ms": round(self._total_latency / calls * 1000, 2) if calls else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Release the fallback thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,253 @@
+"""
+Background job queue for long-running Q-Mentor analyses.
+
+Submitting a job only enqueues it, so the HTTP request returns at once and
+no connection or worker is held while the model runs. A fixed pool of
+asyncio worker tasks drains the queue; results live in an in-memory job table
+for a retention window. The queue is bounded: when it is full new jobs are
+rejected immediately (the API answers 503 with Retry-After), and jobs that
+waited longer than the maximum wait are expired instead of run, so a spike
+degrades to queued work rather than piling up timeouts.
+
+The job table is per process: a job can only be polled or streamed from the
+process that accepted it. The API must therefore run as a single server
+process (scale with QMENTOR_JOB_WORKERS and async concurrency instead);
+require_single_process() refuses to start when WEB_CONCURRENCY asks for more.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.qmentor_client import QMentorError
+from app.services.qmentor_service import q_mentor_service
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a queued analysis"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    EXPIRED = "expired"
+
+
+FINISHED_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.EXPIRED}
+
+
+class QMentorJob(BaseModel):
+    """Public view of a job"""
+    id: str
+    status: JobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+class JobQueueFullError(Exception):
+    """The queue is at capacity; the job was not accepted"""
+
+
+class QMentorJobQueue:
+    """Bounded queue of jobs drained by a pool of asyncio workers"""
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        workers: int = settings.QMENTOR_JOB_WORKERS,
+        max_queued: int = settings.QMENTOR_JOB_QUEUE_MAX,
+        max_wait_seconds: float = settings.QMENTOR_JOB_MAX_WAIT_SECONDS,
+        retention_seconds: float = settings.QMENTOR_JOB_RETENTION_SECONDS,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_wait_seconds = max_wait_seconds
+        self.retention_seconds = retention_seconds
+        self._jobs: "OrderedDict[str, QMentorJob]" = OrderedDict()
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._expired = 0
+        self._succeeded = 0
+        self._failed = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # Workers belong to the loop that serves requests; (re)start them
+        # lazily on the first submission made from a new loop
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+            self._loop = loop
+            self._running = 0
+            self._tasks = [
+                loop.create_task(self._worker(self._queue), name=f"qmentor-job-worker-{index}")
+                for index in range(self.workers)
+            ]
+            for job_id, job in list(self._jobs.items()):
+                if not job.finished:
+                    self._finish(job_id, JobStatus.FAILED, error="Job perdido em reinício do worker")
+        return self._queue
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs are not run"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._loop = None
+
+    def submit(self, payload: Dict[str, Any]) -> QMentorJob:
+        """Enqueue a job, raising JobQueueFullError when at capacity"""
+        queue = self._ensure_started()
+        self._purge_finished()
+
+        job = QMentorJob(id=uuid.uuid4().hex, status=JobStatus.QUEUED, created_at=datetime.utcnow())
+        try:
+            queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise JobQueueFullError(f"Q-Mentor job queue is full ({self.max_queued} queued)") from None
+
+        self._jobs[job.id] = job
+        self._payloads[job.id] = payload
+        self._changed[job.id] = asyncio.Event()
+        self._submitted += 1
+        return job.model_copy()
+
+    def get(self, job_id: str) -> Optional[QMentorJob]:
+        job = self._jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    async def watch(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[QMentorJob]]:
+        """Yield the job now and on every status change until it finishes.
+
+        Yields None every `heartbeat` seconds without a change so streaming
+        callers can keep the connection alive.
+        """
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            # Take the event before yielding so a change made while the
+            # caller is busy with this snapshot is not missed
+            changed = self._changed[job_id]
+            yield job
+            if job.finished:
+                return
+            while not changed.is_set():
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+
+    def _update(self, job_id: str, **changes: Any) -> None:
+        job = self._jobs[job_id]
+        self._jobs[job_id] = job.model_copy(update=changes)
+        # Wake current watchers and give later ones a fresh event
+        self._changed[job_id].set()
+        self._changed[job_id] = asyncio.Event()
+
+    def _finish(self, job_id: str, status: JobStatus, **changes: Any) -> None:
+        self._payloads.pop(job_id, None)
+        self._update(job_id, status=status, finished_at=datetime.utcnow(), **changes)
+
+    def _purge_finished(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        for job_id, job in list(self._jobs.items()):
+            if job.created_at >= cutoff:
+                break
+            if job.finished:
+                del self._jobs[job_id]
+                self._changed.pop(job_id, None)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:  # never let one job kill the worker
+                logger.error(f"Q-Mentor job {job_id} crashed: {e}")
+            finally:
+                queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return
+
+        waited = (datetime.utcnow() - job.created_at).total_seconds()
+        if waited > self.max_wait_seconds:
+            self._expired += 1
+            self._finish(job_id, JobStatus.EXPIRED, error="Job expirou na fila; tente novamente")
+            return
+
+        self._running += 1
+        self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        try:
+            result = await self.handler(self._payloads[job_id])
+        except Exception as e:
+            self._failed += 1
+            self._finish(job_id, JobStatus.FAILED, error=str(e))
+        else:
+            self._succeeded += 1
+            self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+        finally:
+            self._running -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queued": self.max_queued,
+            "running": self._running,
+            "submitted": self._submitted,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "expired": self._expired,
+        }
+
+
+def require_single_process(worker_processes: int) -> None:
+    """Fail fast when the server would fork several processes.
+
+    Each process would keep its own job table, so a status poll routed to
+    another process than the submission would answer 404.
+    """
+    if worker_processes > 1:
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={worker_processes}, but Q-Mentor jobs are kept in process memory; "
+            "run a single server process (raise QMENTOR_JOB_WORKERS instead)"
+        )
+
+
+async def _analyze_learning_path(payload: Dict[str, Any]) -> Dict[str, Any]:
+    result = await q_mentor_service.analyze_learning_path(**payload)
+    if result["status"] != "success":
+        raise QMentorError(result["analysis"])
+    return result
+
+
+# Global instance
+learning_path_jobs = QMentorJobQueue(_analyze_learning_path)
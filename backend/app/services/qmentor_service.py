@@ -3,7 +3,7 @@ Q-Mentor AI Service using Google Gemini
 Provides intelligent career guidance and quantum-safe learning recommendations
 """
 import logging
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 try:
     import google.generativeai as genai  # pylint: disable=import-error
     GENAI_AVAILABLE = True
@@ -11,6 +11,9 @@ except ImportError:
     GENAI_AVAILABLE = False
     genai = None
 from app.core.config import settings
+from app.core.single_flight import SingleFlight
+from app.services.qmentor_cache import QMentorResponseCache, prompt_fingerprint
+from app.services.qmentor_client import QMentorCircuitOpenError, QMentorClient
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,9 @@ class QMentorService:
     def __init__(self):
         self.model = None
         self._configure_gemini()
+        self.client = QMentorClient(self.model)
+        self.cache = QMentorResponseCache()
+        self.single_flight = SingleFlight()
     
     def _configure_gemini(self):
         """Configure Gemini AI with API key"""
@@ -41,7 +47,7 @@ class QMentorService:
             logger.error(f"Failed to configure Gemini AI: {e}")
             self.model = None
     
-    def get_career_guidance(
+    async def get_career_guidance(
         self, 
         user_query: str, 
         user_profile: Optional[Dict] = None
@@ -56,7 +62,7 @@ class QMentorService:
         Returns:
             Dict with guidance response
         """
-        if not self.model:
+        if not self.client.available:
             return {
                 "response": "Q-Mentor está temporariamente indisponível. Tente novamente mais tarde.",
                 "status": "error"
@@ -67,10 +73,10 @@ class QMentorService:
             prompt = self._build_career_prompt(user_query, user_profile)
             
             # Generate response with Gemini
-            response = self.model.generate_content(prompt)
+            text = await self._generate(prompt)
             
             return {
-                "response": response.text,
+                "response": text,
                 "status": "success",
                 "query": user_query
             }
@@ -82,7 +88,7 @@ class QMentorService:
                 "status": "error"
             }
     
-    def get_quantum_safe_recommendations(
+    async def get_quantum_safe_recommendations(
         self, 
         career_area: str, 
         experience_level: str = "beginner"
@@ -97,7 +103,7 @@ class QMentorService:
         Returns:
             Dict with recommendations
         """
-        if not self.model:
+        if not self.client.available:
             return {
                 "recommendations": [],
                 "status": "error",
@@ -128,16 +134,16 @@ class QMentorService:
             }}
             """
             
-            response = self.model.generate_content(prompt)
+            text = await self._generate(prompt)
             
             # Try to parse JSON response
             import json
             try:
-                recommendations = json.loads(response.text)
+                recommendations = json.loads(text)
             except (json.JSONDecodeError, ValueError):
                 # Fallback to structured text if JSON parsing fails
                 recommendations = {
-                    "raw_response": response.text,
+                    "raw_response": text,
                     "parsed": False
                 }
             
@@ -156,7 +162,7 @@ class QMentorService:
                 "message": f"Erro ao gerar recomendações: {str(e)}"
             }
     
-    def analyze_learning_path(
+    async def analyze_learning_path(
         self, 
         current_skills: List[str], 
         target_role: str
@@ -171,7 +177,7 @@ class QMentorService:
         Returns:
             Dict with learning path analysis
         """
-        if not self.model:
+        if not self.client.available:
             return {
                 "analysis": "Q-Mentor indisponível",
                 "status": "error"
@@ -196,10 +202,10 @@ class QMentorService:
             Seja específico e prático, focando em tecnologias quântico-seguras quando relevante.
             """
             
-            response = self.model.generate_content(prompt)
+            text = await self._generate(prompt)
             
             return {
-                "analysis": response.text,
+                "analysis": text,
                 "status": "success",
                 "current_skills": current_skills,
                 "target_role": target_role
@@ -212,6 +218,58 @@ class QMentorService:
                 "status": "error"
             }
     
+    async def stream_career_guidance(
+        self,
+        user_query: str,
+        user_profile: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream career guidance text chunks as the model generates them
+        
+        A cached answer is yielded as a single chunk; a fully streamed answer
+        is stored in the cache. Errors propagate to the caller.
+        """
+        prompt = self._build_career_prompt(user_query, user_profile)
+        cached = await self.cache.get(prompt)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            async for text in self.client.stream(prompt):
+                chunks.append(text)
+                yield text
+        except QMentorCircuitOpenError:
+            stale = await self.cache.get_stale(prompt)
+            if stale is None:
+                raise
+            yield stale
+            return
+        await self.cache.set(prompt, "".join(chunks))
+    
+    async def _generate(self, prompt: str) -> str:
+        """Answer from the response cache; on a miss, identical in-flight
+        prompts share a single model call"""
+        cached = await self.cache.get(prompt)
+        if cached is not None:
+            return cached
+        try:
+            return await self.single_flight.do(
+                prompt_fingerprint(prompt), lambda: self._generate_and_store(prompt)
+            )
+        except QMentorCircuitOpenError:
+            # Upstream unhealthy: an expired answer beats waiting on a brownout
+            stale = await self.cache.get_stale(prompt)
+            if stale is None:
+                raise
+            return stale
+    
+    async def _generate_and_store(self, prompt: str) -> str:
+        text = await self.client.generate(prompt)
+        await self.cache.set(prompt, text)
+        return text
+    
     def _build_career_prompt(self, user_query: str, user_profile: Optional[Dict]) -> str:
         """Build context-aware prompt for career guidance"""
         
@@ -0,0 +1,134 @@
+"""
+Token revocation with a per-worker Bloom filter in front of revoked_tokens.
+
+Logout records the token's jti in the revoked_tokens table. Each worker
+mirrors the unexpired jtis in a BloomFilter: new rows are pulled
+incrementally every REVOCATION_REFRESH_SECONDS and the filter is rebuilt
+every REVOCATION_REBUILD_SECONDS (or once it is over capacity) to drop
+expired ones. Authenticated requests only query the table when the filter
+reports a possible hit, so the common case costs a few hash probes and no
+I/O. A revocation made on another worker takes effect here within one
+refresh interval; on the revoking worker it is immediate.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.bloom_filter import BloomFilter
+from app.core.config import settings
+from app.core.security import security_service
+from app.repositories.base import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationService:
+    """Revokes tokens and answers "is this jti revoked?" for authenticated requests"""
+
+    def __init__(
+        self,
+        refresh_seconds: float = 5.0,
+        rebuild_seconds: float = 3600.0,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the mirrored state; the next check reloads it"""
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        self._cursor: Optional[datetime] = None  # newest revoked_at mirrored
+        self._next_refresh = 0.0
+        self._next_rebuild = 0.0
+        self._exact_lookups = 0
+        self._false_positives = 0
+        self._refreshes = 0
+        self._rebuilds = 0
+
+    async def revoke(self, session: AsyncSession, token: str, token_type: str = "access") -> bool:
+        """Revoke a valid token until it expires; False when the token is not valid"""
+        payload = security_service.verify_token(token, token_type)
+        if payload is None or not payload.get("jti"):
+            return False
+        subject = payload.get("sub")
+        await RevokedTokenRepository(session).add(
+            payload["jti"],
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+            user_id=int(subject) if str(subject).isdigit() else None,
+        )
+        self._filter.add(payload["jti"])
+        security_service.token_cache.discard(token)
+        return True
+
+    async def is_revoked(self, session: AsyncSession, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        await self._refresh(session)
+        if jti not in self._filter:
+            return False
+        self._exact_lookups += 1
+        revoked = await RevokedTokenRepository(session).is_revoked(jti)
+        if not revoked:
+            self._false_positives += 1
+        return revoked
+
+    async def _refresh(self, session: AsyncSession) -> None:
+        now = self._clock()
+        if now < self._next_refresh:
+            return
+        # Concurrent requests keep using the current filter meanwhile
+        self._next_refresh = now + self.refresh_seconds
+        repo = RevokedTokenRepository(session)
+        try:
+            if now >= self._next_rebuild or self._filter.is_saturated:
+                rows = await repo.revoked_since(None)
+                rebuilt = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate)
+                for row in rows:
+                    rebuilt.add(row.jti)
+                self._filter = rebuilt
+                self._next_rebuild = now + self.rebuild_seconds
+                self._rebuilds += 1
+            else:
+                # Overlap the window: rows from slower transactions or other
+                # workers' clocks can carry a slightly older revoked_at
+                rows = await repo.revoked_since(self._cursor - timedelta(seconds=self.refresh_seconds))
+                for row in rows:
+                    if row.jti not in self._filter:
+                        self._filter.add(row.jti)
+                self._refreshes += 1
+        except Exception as e:
+            self._next_refresh = now
+            logger.warning(f"Could not refresh the token revocation filter: {e}")
+            return
+        if rows:
+            newest = max(row.revoked_at for row in rows)
+            self._cursor = max(self._cursor, newest) if self._cursor else newest
+        elif self._cursor is None:
+            self._cursor = datetime.utcnow()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "filter_items": self._filter.count,
+            "filter_capacity": self._filter.capacity,
+            "exact_lookups": self._exact_lookups,
+            "false_positives": self._false_positives,
+            "refreshes": self._refreshes,
+            "rebuilds": self._rebuilds,
+        }
+
+
+token_revocation = TokenRevocationService(
+    refresh_seconds=settings.REVOCATION_REFRESH_SECONDS,
+    rebuild_seconds=settings.REVOCATION_REBUILD_SECONDS,
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
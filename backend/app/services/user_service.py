@@ -1,7 +1,8 @@
 from typing import Optional, List
 from fastapi import Depends, HTTPException, status
-from sqlmodel import Session
-from app.core.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_async_session
+from app.core.pagination import Cursor
 from app.repositories.base import UserRepository, GamificationRepository, ProjectRepository
 from app.models.models import (
     User, UserCreate, UserUpdate, UserResponse,
@@ -18,40 +19,41 @@ logger = logging.getLogger(__name__)
 class UserService:
     """Service layer for user operations"""
     
-    def __init__(self, session: Session = Depends(get_session)):
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
         self.session = session
         self.user_repo = UserRepository(session)
         self.gamification_repo = GamificationRepository(session)
     
-    def create_user(self, user_create: UserCreate) -> UserResponse:
+    async def create_user(self, user_create: UserCreate) -> UserResponse:
         """Create new user with gamification profile"""
         # Check if user already exists
-        if self.user_repo.get_by_email(user_create.email):
+        if await self.user_repo.get_by_email(user_create.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
-        if self.user_repo.get_by_username(user_create.username):
+        if await self.user_repo.get_by_username(user_create.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
         
         # Create user
-        user = self.user_repo.create(user_create)
+        user = await self.user_repo.create(user_create)
         
         # Log registration activity
-        self.gamification_repo.log_activity(
+        await self.gamification_repo.log_activity(
             user_id=user.id,
             activity_type=ActivityType.LOGIN,
             description="Bem-vindo ao Q-Path! Conta criada com sucesso.",
             xp_earned=50,
-            metadata={"registration": True}
+            metadata={"registration": True},
+            commit=False,
         )
         
         # Add welcome XP
-        self.gamification_repo.add_xp(
+        await self.gamification_repo.add_xp(
             user_id=user.id,
             xp_amount=50,
             activity_type=ActivityType.LOGIN,
@@ -61,34 +63,34 @@ class UserService:
         
         return UserResponse.model_validate(user)
     
-    def get_user(self, user_id: int) -> Optional[UserResponse]:
+    async def get_user(self, user_id: int) -> Optional[UserResponse]:
         """Get user by ID"""
-        user = self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_by_id(user_id)
         if not user:
             return None
         
         return UserResponse.model_validate(user)
     
-    def get_user_by_email(self, email: str) -> Optional[UserResponse]:
+    async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
         """Get user by email"""
-        user = self.user_repo.get_by_email(email)
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return None
         
         return UserResponse.model_validate(user)
     
-    def update_user(self, user_id: int, user_update: UserUpdate, current_user_id: int) -> UserResponse:
+    async def update_user(self, user_id: int, user_update: UserUpdate, current_user_id: int) -> UserResponse:
         """Update user (only by themselves or admin)"""
         # Check authorization
         if user_id != current_user_id:
-            current_user = self.user_repo.get_by_id(current_user_id)
+            current_user = await self.user_repo.get_by_id(current_user_id)
             if not current_user or current_user.role != "admin":
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Not authorized to update this user"
                 )
         
-        user = self.user_repo.update(user_id, user_update)
+        user = await self.user_repo.update(user_id, user_update)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -97,13 +99,13 @@ class UserService:
         
         return UserResponse.model_validate(user)
     
-    def authenticate_user(self, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user"""
-        user = self.user_repo.authenticate(email, password)
+        user = await self.user_repo.authenticate(email, password)
         if user:
             # Update streak and log login
-            self.gamification_repo.update_streak(user.id)
-            self.gamification_repo.log_activity(
+            await self.gamification_repo.update_streak(user.id, commit=False)
+            await self.gamification_repo.log_activity(
                 user_id=user.id,
                 activity_type=ActivityType.LOGIN,
                 description="Login realizado",
@@ -113,26 +115,26 @@ class UserService:
         
         return user
     
-    def get_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
+    async def get_users(self, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[UserResponse]:
         """Get all users (admin only)"""
-        users = self.user_repo.get_all(skip=skip, limit=limit)
+        users = await self.user_repo.get_all(skip=skip, limit=limit, cursor=cursor)
         return [UserResponse.model_validate(user) for user in users]
 
 
 class ProjectService:
     """Service layer for project operations"""
     
-    def __init__(self, session: Session = Depends(get_session)):
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
         self.session = session
         self.project_repo = ProjectRepository(session)
         self.gamification_repo = GamificationRepository(session)
     
-    def create_submission(self, user_id: int, submission_data: UserProjectSubmissionCreate) -> UserProjectSubmissionResponse:
+    async def create_submission(self, user_id: int, submission_data: UserProjectSubmissionCreate) -> UserProjectSubmissionResponse:
         """Create new project submission"""
-        submission = self.project_repo.create_submission(user_id, submission_data)
+        submission = await self.project_repo.create_submission(user_id, submission_data, commit=False)
         
-        # Award XP for submission
-        self.gamification_repo.add_xp(
+        # Award XP for submission (commits the submission as well)
+        await self.gamification_repo.add_xp(
             user_id=user_id,
             xp_amount=150,
             activity_type=ActivityType.PROJETO_SUBMISSION,
@@ -146,22 +148,22 @@ class ProjectService:
         
         return UserProjectSubmissionResponse.model_validate(submission)
     
-    def get_user_submissions(self, user_id: int, skip: int = 0, limit: int = 20) -> List[UserProjectSubmissionResponse]:
+    async def get_user_submissions(self, user_id: int, skip: int = 0, limit: int = 20, cursor: Optional[Cursor] = None) -> List[UserProjectSubmissionResponse]:
         """Get user's project submissions"""
-        submissions = self.project_repo.get_user_submissions(user_id, skip=skip, limit=limit)
+        submissions = await self.project_repo.get_user_submissions(user_id, skip=skip, limit=limit, cursor=cursor)
         return [UserProjectSubmissionResponse.model_validate(sub) for sub in submissions]
     
-    def get_submission(self, submission_id: int, user_id: Optional[int] = None) -> Optional[UserProjectSubmissionResponse]:
+    async def get_submission(self, submission_id: int, user_id: Optional[int] = None) -> Optional[UserProjectSubmissionResponse]:
         """Get project submission by ID"""
-        submission = self.project_repo.get_submission_by_id(submission_id, user_id)
+        submission = await self.project_repo.get_submission_by_id(submission_id, user_id)
         if not submission:
             return None
         
         return UserProjectSubmissionResponse.model_validate(submission)
     
-    def update_submission(self, submission_id: int, user_id: int, update_data: UserProjectSubmissionUpdate) -> UserProjectSubmissionResponse:
+    async def update_submission(self, submission_id: int, user_id: int, update_data: UserProjectSubmissionUpdate) -> UserProjectSubmissionResponse:
         """Update project submission"""
-        submission = self.project_repo.update_submission(submission_id, user_id, update_data)
+        submission = await self.project_repo.update_submission(submission_id, user_id, update_data)
         if not submission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -170,7 +172,7 @@ class ProjectService:
         
         return UserProjectSubmissionResponse.model_validate(submission)
     
-    def get_all_submissions(self, skip: int = 0, limit: int = 50, status_filter: Optional[str] = None) -> List[UserProjectSubmissionResponse]:
+    async def get_all_submissions(self, skip: int = 0, limit: int = 50, status_filter: Optional[str] = None, cursor: Optional[Cursor] = None) -> List[UserProjectSubmissionResponse]:
         """Get all project submissions (admin/moderator only)"""
-        submissions = self.project_repo.get_all_submissions(skip=skip, limit=limit, status_filter=status_filter)
+        submissions = await self.project_repo.get_all_submissions(skip=skip, limit=limit, status_filter=status_filter, cursor=cursor)
         return [UserProjectSubmissionResponse.model_validate(sub) for sub in submissions]
\ No newline at end of file
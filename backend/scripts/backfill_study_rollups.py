@@ -0,0 +1,34 @@
+"""Rebuild study_daily_rollups from the raw study_sessions history.
+
+Safe to re-run: the table is recomputed in a single transaction. The
+migration that creates the table already backfills it; use this to repair
+the rollups if they ever drift from the raw sessions.
+
+Usage (from backend/):
+    python -m scripts.backfill_study_rollups
+"""
+
+import asyncio
+import logging
+
+from app.core.database import async_engine, async_session_factory
+from app.repositories.base import StudySessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill() -> int:
+    async with async_session_factory() as session:
+        rows = await StudySessionRepository(session).rebuild_daily_rollups()
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    rows = asyncio.run(backfill())
+    logger.info(f"Rebuilt {rows} study_daily_rollups rows")
+
+
+if __name__ == "__main__":
+    main()
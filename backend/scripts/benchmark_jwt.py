@@ -0,0 +1,83 @@
+"""Microbenchmark access-token verification: before vs after the fast path.
+
+Reports verifications per second for:
+- the previous SecurityService.verify_token (jose decode plus the datetime
+  expiry re-check), reproduced here as the baseline
+- each JWTBackend's decode on its own
+- SecurityService.verify_token with the HMAC backend and a warm
+  verified-token cache (the steady state for a client reusing its token)
+
+Usage (from backend/):
+    python -m scripts.benchmark_jwt
+    python -m scripts.benchmark_jwt --iterations 200000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from jose import jwt
+
+from app.core.jwt_backend import HMACJWTBackend, JoseJWTBackend
+from app.core.security import SecurityService
+
+KEY = "benchmark-secret-key-with-32-bytes!"
+ALGORITHM = "HS256"
+
+
+def legacy_verify(token: str) -> dict:
+    """verify_token as it was before the JWT backend/cache change"""
+    payload = jwt.decode(token, KEY, algorithms=[ALGORITHM])
+    if payload.get("type") != "access":
+        raise ValueError("type")
+    if datetime.fromtimestamp(payload.get("exp", 0), tz=timezone.utc) < datetime.now(timezone.utc):
+        raise ValueError("expired")
+    return payload
+
+
+def measure(verify: Callable[[str], object], token: str, iterations: int, rounds: int) -> List[float]:
+    for _ in range(min(iterations, 1000)):
+        verify(token)
+    per_second = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            verify(token)
+        per_second.append(iterations / (time.perf_counter() - started))
+    return per_second
+
+
+def run(iterations: int, rounds: int) -> None:
+    service = SecurityService()
+    service.SECRET_KEY = KEY
+    service.ALGORITHM = ALGORITHM
+    service.jwt_backend = HMACJWTBackend()
+    token = service.create_access_token({"sub": "1", "email": "bench@example.com", "role": "user"})
+
+    jose_backend, hmac_backend = JoseJWTBackend(), HMACJWTBackend()
+    variants: Dict[str, Callable[[str], object]] = {
+        "before: jose + datetime exp": legacy_verify,
+        "jose backend": lambda t: jose_backend.decode(t, KEY, ALGORITHM),
+        "hmac backend": lambda t: hmac_backend.decode(t, KEY, ALGORITHM),
+        "after: verify_token (cached)": service.verify_token,
+    }
+    results = {name: statistics.median(measure(verify, token, iterations, rounds)) for name, verify in variants.items()}
+
+    baseline = results["before: jose + datetime exp"]
+    print(f"{'variant':<30} {'verifications/s':>16} {'speedup':>8}")
+    for name, value in results.items():
+        print(f"{name:<30} {value:>16,.0f} {value / baseline:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000, help="verifications per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.iterations, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Microbenchmark the security/timing middleware: pure ASGI vs BaseHTTPMiddleware.
+
+Builds three copies of a trivial FastAPI app (no middleware, the previous
+`@app.middleware("http")` hook, and SecurityHeadersMiddleware) and drives each
+one directly through the ASGI interface, without sockets, so the numbers are
+the per-request overhead of the middleware itself.
+
+Usage (from backend/):
+    python -m scripts.benchmark_middleware
+    python -m scripts.benchmark_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from fastapi import FastAPI, Request
+
+from app.core.middleware import SecurityHeadersMiddleware
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def build_bare() -> FastAPI:
+    return _base_app()
+
+
+def build_base_http_middleware() -> FastAPI:
+    """The hook as it was in app/main.py before the pure ASGI rewrite"""
+    app = _base_app()
+
+    @app.middleware("http")
+    async def rate_limit_middleware(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+    return app
+
+
+def build_pure_asgi() -> FastAPI:
+    app = _base_app()
+    app.add_middleware(SecurityHeadersMiddleware)
+    return app
+
+
+async def _request(app: FastAPI) -> None:
+    # Like a server: deliver the body once, then report the disconnect only
+    # after the response is complete (BaseHTTPMiddleware listens for it)
+    finished = asyncio.Event()
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            finished.set()
+
+    await app(dict(SCOPE), receive, send)
+
+
+async def measure(app: FastAPI, requests: int, rounds: int) -> List[float]:
+    for _ in range(200):  # warm up (builds the middleware stack)
+        await _request(app)
+    per_request_us = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _request(app)
+        per_request_us.append((time.perf_counter() - started) / requests * 1e6)
+    return per_request_us
+
+
+async def run(requests: int, rounds: int) -> None:
+    variants: Dict[str, Callable[[], FastAPI]] = {
+        "no middleware": build_bare,
+        "BaseHTTPMiddleware (old)": build_base_http_middleware,
+        "pure ASGI (new)": build_pure_asgi,
+    }
+    results = {name: statistics.median(await measure(build(), requests, rounds)) for name, build in variants.items()}
+
+    bare = results["no middleware"]
+    print(f"{'variant':<26} {'us/request':>11} {'overhead us':>12}")
+    for name, value in results.items():
+        print(f"{name:<26} {value:>11.1f} {value - bare:>12.1f}")
+    saved = results["BaseHTTPMiddleware (old)"] - results["pure ASGI (new)"]
+    print(f"\nSaved per request: {saved:.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark weekly progress / streak / total hours against session history size.
+
+Seeds one user per history size and reports the median latency of the
+dashboard progress queries. With the aggregation done in SQL the latency
+should stay roughly flat as the number of sessions grows.
+
+Usage (from backend/):
+    python -m scripts.benchmark_study_progress
+    python -m scripts.benchmark_study_progress --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import models  # noqa: F401
+from app.models.models import StudySession, User
+from app.repositories.base import StudySessionRepository
+
+HISTORY_SIZES = [10, 100, 1000, 5000]
+
+
+async def _seed_user(session: AsyncSession, label: str, sessions: int) -> int:
+    user = User(
+        email=f"bench-{label}@example.com",
+        username=f"bench_{label}",
+        full_name="Benchmark",
+        hashed_password="-",
+    )
+    session.add(user)
+    await session.commit()
+
+    now = datetime.utcnow()
+    rng = random.Random(sessions)
+    session.add_all(
+        StudySession(
+            user_id=user.id,
+            duration_minutes=rng.randint(10, 60),
+            session_date=now - timedelta(days=rng.randint(0, 730), minutes=rng.randint(0, 1440)),
+        )
+        for _ in range(sessions)
+    )
+    await session.commit()
+    return user.id
+
+
+async def run(database_url: str, repeats: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        run_id = int(time.time())
+        users = {size: await _seed_user(session, f"{run_id}_{size}", size) for size in HISTORY_SIZES}
+
+        repo = StudySessionRepository(session)
+        await repo.rebuild_daily_rollups()
+        print(f"{'sessions':>10} {'median ms':>10} {'p95 ms':>10}")
+        for size, user_id in users.items():
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                await repo.get_weekly_progress(user_id)
+                await repo.get_total_hours(user_id)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{size:>10} {statistics.median(timings):>10.2f} {p95:>10.2f}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Async SQLAlchemy URL (defaults to a temporary SQLite file)")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.database_url:
+        asyncio.run(run(args.database_url, args.repeats))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}", args.repeats))
+
+
+if __name__ == "__main__":
+    main()
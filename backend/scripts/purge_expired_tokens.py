@@ -0,0 +1,36 @@
+"""Delete token bookkeeping rows whose tokens have expired.
+
+A revoked token stops mattering once it expires, so its revoked_tokens row
+can go; likewise refresh_tokens families whose current token has expired.
+Meant to run from cron (e.g. nightly); safe to run at any time.
+
+Usage (from backend/):
+    python -m scripts.purge_expired_tokens
+"""
+
+import asyncio
+import logging
+from typing import Tuple
+
+from app.core.database import async_engine, async_session_factory
+from app.repositories.base import RefreshTokenRepository, RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def purge() -> Tuple[int, int]:
+    async with async_session_factory() as session:
+        revoked = await RevokedTokenRepository(session).purge_expired()
+        families = await RefreshTokenRepository(session).purge_expired()
+    await async_engine.dispose()
+    return revoked, families
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    revoked, families = asyncio.run(purge())
+    logger.info(f"Purged {revoked} revoked_tokens rows and {families} refresh_tokens families")
+
+
+if __name__ == "__main__":
+    main()
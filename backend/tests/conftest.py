@@ -1,18 +1,24 @@
-from typing import Any, Dict, Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
-from sqlmodel.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.main import app
 import app.main as main_module
 from app.core.config import settings
 from app.core.security import security_service
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.models import models  # noqa: F401
 from app.models.models import UserCreate
-from app.repositories.base import UserRepository
+from app.repositories.base import TrackRepository, UserRepository
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import rate_limiter
+from app.repositories.leaderboard import leaderboard
+from app.services.token_revocation import token_revocation
 
 settings.SECRET_KEY = "test-secret"
 settings.ACCESS_TOKEN_EXPIRE_MINUTES = 30
@@ -39,39 +45,53 @@ security_service.verify_password = _test_verify  # type: ignore[attr-defined]
 main_module.init_db = lambda: None  # type: ignore
 
 
-@pytest.fixture(scope="session")
-def engine() -> Generator[Session, None, None]:
-    test_engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+async def _skip_track_catalog() -> None:
+    return None
+
+
+main_module.init_track_catalog = _skip_track_catalog  # type: ignore
+
+
+@pytest.fixture(scope="function")
+async def engine(tmp_path) -> AsyncGenerator[AsyncEngine, None]:
+    # File-backed SQLite so the app's event loop (TestClient portal) and the
+    # test's event loop can open their own connections to the same database.
+    test_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}",
+        poolclass=NullPool,
     )
-    SQLModel.metadata.create_all(test_engine)
-    return test_engine
+    async with test_engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(test_engine, expire_on_commit=False) as seed_session:
+        await TrackRepository(seed_session).ensure_defaults()
+    # The leaderboard is process-wide; start each test from the new database
+    leaderboard.reset()
+    principal_cache.clear()
+    token_revocation.reset()
+    yield test_engine
+    await test_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def session_factory(engine) -> async_sessionmaker:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 @pytest.fixture(scope="function")
-def session(engine) -> Generator[Session, None, None]:
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = Session(bind=connection)
-    try:
+async def session(session_factory) -> AsyncGenerator[AsyncSession, None]:
+    async with session_factory() as session:
         yield session
-    finally:
-        session.close()
-        transaction.rollback()
-        connection.close()
 
 
 @pytest.fixture(scope="function")
-def client(session) -> Generator[TestClient, None, None]:
-    def override_get_session():
-        try:
+def client(session_factory) -> Generator[TestClient, None, None]:
+    async def override_get_async_session():
+        async with session_factory() as session:
             yield session
-        finally:
-            pass
 
-    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    # Every test client shares one IP; give each test fresh buckets
+    rate_limiter.backend.reset()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -80,10 +100,10 @@ def client(session) -> Generator[TestClient, None, None]:
 
 
 @pytest.fixture(scope="function")
-def user_credentials(session) -> Dict[str, Any]:
+async def user_credentials(session) -> Dict[str, Any]:
     repo = UserRepository(session)
     password = "strong-password"
-    user = repo.create(
+    user = await repo.create(
         UserCreate(
             email="tester@example.com",
             full_name="Test User",
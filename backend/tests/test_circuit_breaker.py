@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.qmentor_cache import QMentorResponseCache
+from app.services.qmentor_client import QMentorCircuitOpenError, QMentorClient
+from app.services.qmentor_service import QMentorService, q_mentor_service
+from tests.test_qmentor import AsyncFakeModel
+
+
+class FlakyModel(AsyncFakeModel):
+    """Fails while `failing` is set, counting every invocation"""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.failing = False
+
+    async def generate_content_async(self, prompt, stream=False):
+        response = await super().generate_content_async(prompt, stream)
+        if self.failing:
+            raise RuntimeError("503 upstream unavailable")
+        return response
+
+
+def _breaker(now, **overrides):
+    options = dict(window=10, min_calls=4, error_rate_threshold=0.5, p95_latency_threshold=2.0, open_seconds=30)
+    options.update(overrides)
+    return CircuitBreaker("test", clock=lambda: now[0], **options)
+
+
+def test_breaker_trips_on_error_rate_and_recovers_through_half_open():
+    now = [0.0]
+    breaker = _breaker(now)
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED  # below min_calls
+
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+    now[0] += 30
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.metrics()["times_opened"] == 2
+
+
+def test_breaker_trips_on_p95_latency():
+    now = [0.0]
+    breaker = _breaker(now, min_calls=5)
+    for latency in (0.2, 0.3, 0.2, 0.1):
+        breaker.record_success(latency)
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_success(2.5)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.metrics()["last_trip_reason"].startswith("p95 latency")
+
+
+def test_abandoned_probe_frees_the_half_open_slot():
+    now = [0.0]
+    breaker = _breaker(now, min_calls=1)
+    breaker.record_failure(0.1)
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_abandoned()
+    assert breaker.allow()
+
+
+async def test_open_circuit_short_circuits_to_stale_cache_then_recovers():
+    now = [0.0]
+    model = FlakyModel()
+    service = QMentorService()
+    service.client = QMentorClient(model, breaker=_breaker(now, min_calls=2))
+    service.cache = QMentorResponseCache(max_entries=8, ttl_seconds=60, sqlite_path=None, clock=lambda: now[0])
+
+    cached = await service.get_career_guidance("Como começar em PQC?")
+    assert cached["status"] == "success"
+    now[0] += 120  # the cached answer is now expired
+
+    model.failing = True
+    for query in ("pergunta 1", "pergunta 2"):
+        assert (await service.get_career_guidance(query))["status"] == "error"
+    calls_when_opened = model.calls
+    assert service.client.breaker.state == CircuitState.OPEN
+
+    stale = await service.get_career_guidance("como começar em pqc?")
+    assert stale["status"] == "success"
+    assert stale["response"] == cached["response"]
+    assert (await service.get_career_guidance("pergunta nova"))["status"] == "error"
+    with pytest.raises(QMentorCircuitOpenError):
+        await service.client.generate("direto")
+    assert model.calls == calls_when_opened  # nothing reached the model
+
+    model.failing = False
+    now[0] += 30
+    assert (await service.get_career_guidance("pergunta nova"))["status"] == "success"
+    assert service.client.breaker.state == CircuitState.CLOSED
+
+
+def test_health_reports_circuit_state(client: TestClient, monkeypatch):
+    now = [0.0]
+    breaker = _breaker(now, min_calls=1)
+    monkeypatch.setattr(q_mentor_service, "client", QMentorClient(AsyncFakeModel(delay=0), breaker=breaker))
+
+    assert client.get("/api/v1/qmentor/health").json()["circuit"]["state"] == "closed"
+
+    breaker.record_failure(1.0)
+    body = client.get("/api/v1/qmentor/health").json()
+    assert body["status"] == "degraded"
+    assert body["circuit"]["state"] == "open"
+    assert body["circuit"]["retry_after_seconds"] == 30
@@ -1,4 +1,10 @@
+import asyncio
+
 from fastapi.testclient import TestClient
+from sqlmodel import func, select
+
+from app.models.models import ActivityLog, ActivityType, GamificationLevel
+from app.repositories.base import GamificationRepository
 
 
 def test_complete_trilha_awards_xp_and_logs_activity(
@@ -48,3 +54,34 @@ def test_gamification_profile_returns_current_stats(client: TestClient, auth_hea
     profile = response.json()
     assert profile["total_xp"] == 0
     assert profile["completed_trilhas"] == 0
+
+
+async def test_parallel_xp_awards_are_not_lost(session_factory, user_credentials):
+    user_id = user_credentials["user"].id
+    awards = 25
+
+    async def award() -> None:
+        async with session_factory() as award_session:
+            await GamificationRepository(award_session).add_xp(
+                user_id=user_id,
+                xp_amount=40,
+                activity_type=ActivityType.POMODORO_SESSION,
+                description="Sessão paralela",
+                counters={"pomodoro_sessions": 1},
+            )
+
+    await asyncio.gather(*(award() for _ in range(awards)))
+
+    async with session_factory() as check_session:
+        profile = await GamificationRepository(check_session).get_profile(user_id)
+        assert profile.total_xp == awards * 40
+        assert profile.pomodoro_sessions == awards
+        assert profile.current_level == GamificationLevel.EXPLORADOR
+
+        level_ups = (await check_session.exec(
+            select(func.count()).select_from(ActivityLog).where(
+                ActivityLog.user_id == user_id,
+                ActivityLog.activity_type == ActivityType.LEVEL_UP,
+            )
+        )).one()
+        assert level_ups == 1
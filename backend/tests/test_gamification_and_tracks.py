@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.pool import StaticPool
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event
 
 from app.main import app
-from app.core.database import get_session
+from app.core.database import get_async_session
 from app.core.auth import get_current_active_user
 from app.models.models import (
     User,
@@ -16,22 +17,10 @@ from app.models.models import (
 )
 
 
-@pytest.fixture(name="engine")
-def engine_fixture():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    yield engine
-    SQLModel.metadata.drop_all(engine)
-
-
-@pytest.fixture(name="client")
-def client_fixture(engine):
+@pytest.fixture(name="test_user")
+async def test_user_fixture(session_factory):
     # Seed user and gamification profile
-    with Session(engine) as session:
+    async with session_factory() as session:
         user = User(
             email="test@example.com",
             full_name="Test User",
@@ -41,23 +30,26 @@ def client_fixture(engine):
             hashed_password="hashed",
         )
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
 
         profile = GamificationProfile(user_id=user.id)
         session.add(profile)
-        session.commit()
+        await session.commit()
+
+        return UserResponse.model_validate(user)
 
-        user_response = UserResponse.model_validate(user)
 
-    def get_test_session():
-        with Session(engine) as session:
+@pytest.fixture(name="client")
+def client_fixture(session_factory, test_user):
+    async def get_test_session():
+        async with session_factory() as session:
             yield session
 
     def get_test_user():
-        return user_response
+        return test_user
 
-    app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_async_session] = get_test_session
     app.dependency_overrides[get_current_active_user] = get_test_user
 
     with TestClient(app) as test_client:
@@ -75,6 +67,35 @@ def test_dashboard_returns_tasks_and_progress(client):
     assert len(data["week_progress"]["week"]) == 7
 
 
+@contextmanager
+def _recorded_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_dashboard_is_read_in_at_most_three_statements(client, engine):
+    client.get("/api/v1/gamification/dashboard")  # seeds default tasks
+    client.post("/api/v1/gamification/pomodoro-session", params={"duration_minutes": 30})
+
+    with _recorded_statements(engine) as statements:
+        response = client.get("/api/v1/gamification/dashboard")
+
+    assert response.status_code == 200
+    assert len(statements) <= 3
+    data = response.json()
+    assert data["week_progress"]["streak"] == 1
+    assert data["week_progress"]["total_hours"] == 0.5
+    assert data["track_summary"] and all(item["progress"] == 0 for item in data["track_summary"])
+
+
 def test_sync_tasks_replaces_existing_tasks(client):
     payload = [
         {"title": "Tarefa de Teste", "due_date": "2025-01-01", "completed": False},
@@ -112,6 +133,25 @@ def test_profile_details_contains_achievements_and_rewards(client):
     assert "rewards" in data and isinstance(data["rewards"], list)
 
 
+def test_profile_details_derives_each_fact_once(client, engine):
+    client.get("/api/v1/gamification/profile/details")  # seeds default rewards
+    modules = [module for track in client.get("/api/v1/tracks/").json() for module in track["modules"]]
+    crypto = next(module for module in modules if module["slug"] == "s1")
+    for lesson in crypto["lessons"]:
+        client.patch(f"/api/v1/tracks/lessons/{lesson['id']}", json={"completed": True})
+
+    with _recorded_statements(engine) as statements:
+        response = client.get("/api/v1/gamification/profile/details")
+
+    assert response.status_code == 200
+    # profile, rewards, completed lessons, week + streak, total hours
+    assert len(statements) == 5
+    data = response.json()
+    assert data["stats"]["completed_lessons"] == len(crypto["lessons"])
+    unlocked = {item["id"] for item in data["achievements"] if item["unlocked"]}
+    assert "crypto_master" in unlocked
+
+
 def test_create_reward_validates_input(client):
     response = client.post(
         "/api/v1/gamification/rewards",
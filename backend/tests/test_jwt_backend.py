@@ -0,0 +1,149 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from app.core.jwt_backend import HMACJWTBackend, JoseJWTBackend, TokenError, VerifiedTokenCache, _b64encode
+from app.core.security import SecurityService, security_service
+
+KEY = "test-secret"
+
+
+def _flip_signature(token):
+    signing_input, _, signature = token.rpartition(".")
+    return f"{signing_input}.{'B' if signature[0] == 'A' else 'A'}{signature[1:]}"
+
+
+def _claims(**overrides):
+    claims = {"sub": "1", "type": "access", "jti": "abc", "exp": int(time.time()) + 60}
+    claims.update(overrides)
+    return claims
+
+
+def _signed(header: str, payload: str, key: str = KEY) -> str:
+    """A correctly signed HS256 token over raw header/payload JSON"""
+    signing_input = f"{_b64encode(header.encode())}.{_b64encode(payload.encode())}"
+    signature = hmac.new(key.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def _resigned(token: str, key: str = KEY) -> str:
+    """`token` with its signature recomputed over whatever segments precede it"""
+    signing_input = token.rpartition(".")[0]
+    signature = hmac.new(key.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def _pad_signature(token):
+    signing_input, _, signature = token.rpartition(".")
+    return f"{signing_input}.{signature}="
+
+
+def _flip_unused_bits(token):
+    # A 32-byte HS256 signature encodes to 43 chars; the last one carries 2 unused bits
+    signing_input, _, signature = token.rpartition(".")
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return f"{signing_input}.{signature[:-1]}{alphabet[alphabet.index(signature[-1]) ^ 1]}"
+
+
+@pytest.mark.parametrize(
+    "encoder, decoder",
+    [(HMACJWTBackend(), JoseJWTBackend()), (JoseJWTBackend(), HMACJWTBackend())],
+)
+def test_backends_interoperate(encoder, decoder):
+    token = encoder.encode(_claims(), KEY, "HS256")
+    assert decoder.decode(token, KEY, "HS256")["jti"] == "abc"
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        _flip_signature,
+        lambda token: _b64encode(b'{"alg":"none","typ":"JWT"}') + token[token.index("."):],
+        lambda token: "not-a-token",
+        lambda token: token + "!",  # would be dropped by a lenient base64 decoder
+    ],
+)
+def test_hmac_backend_rejects_forged_tokens(mutate):
+    backend = HMACJWTBackend()
+    with pytest.raises(TokenError):
+        backend.decode(mutate(backend.encode(_claims(), KEY, "HS256")), KEY, "HS256")
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        # Extra, missing or duplicated segments, even when the signature matches
+        lambda token: _resigned(token + ".e30"),
+        lambda token: _resigned(token.split(".")[0] + "." + token),
+        lambda token: token.rpartition(".")[0],
+        lambda token: ".." + token,
+        # Headers without alg, with crit, with a foreign typ or duplicate members
+        lambda token: _signed('{"typ":"JWT"}', json.dumps(_claims())),
+        lambda token: _signed('{"alg":"HS256","typ":"JWT","crit":["exp"]}', json.dumps(_claims())),
+        lambda token: _signed('{"alg":"HS256","typ":"JOSE+JSON"}', json.dumps(_claims())),
+        lambda token: _signed('{"alg":"none","alg":"HS256"}', json.dumps(_claims())),
+        # Time claims that are not numbers
+        lambda token: _signed('{"alg":"HS256"}', json.dumps(_claims(exp=True))),
+        lambda token: _signed('{"alg":"HS256"}', json.dumps(_claims(exp=str(int(time.time()) + 60)))),
+        lambda token: _signed('{"alg":"HS256"}', json.dumps(_claims(nbf=False))),
+        lambda token: _signed('{"alg":"HS256"}', json.dumps(_claims(nbf="0"))),
+        lambda token: _signed('{"alg":"HS256"}', '{"sub":"1","exp":NaN}'),
+        lambda token: _signed('{"alg":"HS256"}', '{"sub":"1","exp":9999999999,"exp":0}'),
+        # Non-canonical base64url
+        _pad_signature,
+        _flip_unused_bits,
+        lambda token: token + "A",  # a length that is 1 mod 4 decodes to nothing
+        # Signed with another key
+        lambda token: _resigned(token, "another-secret"),
+        lambda token: _signed('{"alg":"HS256"}', json.dumps(_claims()), "another-secret"),
+    ],
+)
+def test_hmac_backend_rejects_malformed_tokens(token):
+    backend = HMACJWTBackend()
+    with pytest.raises(TokenError):
+        backend.decode(token(backend.encode(_claims(), KEY, "HS256")), KEY, "HS256")
+
+
+def test_hmac_backend_accepts_numeric_time_claims_and_jwt_typ():
+    backend = HMACJWTBackend()
+    now = time.time()
+    token = _signed('{"alg":"HS256","typ":"JWT"}', json.dumps(_claims(exp=now + 60.5, nbf=int(now) - 1)))
+    assert backend.decode(token, KEY, "HS256")["sub"] == "1"
+
+
+def test_hmac_backend_checks_expiry_and_algorithm():
+    backend = HMACJWTBackend()
+    expired = backend.encode(_claims(exp=int(time.time()) - 1), KEY, "HS256")
+    with pytest.raises(TokenError, match="expired"):
+        backend.decode(expired, KEY, "HS256")
+    with pytest.raises(TokenError):
+        backend.decode(backend.encode(_claims(), KEY, "HS512"), KEY, "HS256")
+
+
+def test_cache_entries_end_at_exp():
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_entries=1, clock=lambda: now[0])
+    cache.set("a", _claims(exp=1010))
+    assert cache.get("a")["sub"] == "1"
+    cache.set("b", _claims(exp=1010))
+    assert cache.get("a") is None  # evicted
+
+    now[0] = 1011
+    assert cache.get("b") is None
+
+
+def test_verify_token_decodes_once(monkeypatch):
+    service = SecurityService()
+    service.SECRET_KEY = security_service.SECRET_KEY
+    token = service.create_access_token({"sub": "7"})
+    decodes = []
+    original = service.jwt_backend.decode
+    monkeypatch.setattr(service.jwt_backend, "decode", lambda *args: decodes.append(1) or original(*args))
+
+    service.verify_token(token)["sub"] = "tampered"
+    assert service.verify_token(token)["sub"] == "7"  # each caller gets its own copy
+    assert service.verify_token(token, "refresh") is None
+    assert len(decodes) == 1
@@ -0,0 +1,247 @@
+import asyncio
+import random
+
+from fastapi.testclient import TestClient
+
+from app.models.models import ActivityType, GamificationLevel, LeaderboardEntry, UserCreate, UserUpdate
+from app.repositories.base import GamificationRepository, UserRepository
+from app.repositories.leaderboard import InMemoryLeaderboard, RedisLeaderboard, leaderboard
+from app.services.gamification_service import GamificationService
+
+
+def _ranking(entries):
+    return [(entry.rank, entry.user_id, entry.total_xp) for entry in entries]
+
+
+async def test_in_memory_leaderboard_matches_sorted_reference():
+    rng = random.Random(42)
+    board = InMemoryLeaderboard()
+    reference = {}
+
+    for _ in range(2000):
+        user_id = rng.randrange(200)
+        total_xp = rng.randrange(500)
+        await board.record(user_id, total_xp, GamificationLevel.INICIANTE, 0)
+        reference[user_id] = total_xp
+
+    ordered = sorted(reference.items(), key=lambda item: (-item[1], item[0]))
+    expected = [(rank, user_id, xp) for rank, (user_id, xp) in enumerate(ordered, 1)]
+
+    assert await board.count() == len(expected)
+    assert _ranking(await board.top(10)) == expected[:10]
+    for rank, user_id, _ in expected:
+        assert await board.rank(user_id) == rank
+    middle = expected[len(expected) // 2]
+    assert _ranking(await board.around(middle[1], 3)) == expected[middle[0] - 4:middle[0] + 3]
+    assert _ranking(await board.around(expected[0][1], 2)) == expected[:3]
+    assert await board.rank(10_000) is None
+
+
+async def _create_player(session, username: str, xp: int) -> int:
+    user = await UserRepository(session).create(
+        UserCreate(
+            email=f"{username}@example.com",
+            full_name=username.title(),
+            username=username,
+            password="strong-password",
+        )
+    )
+    await GamificationRepository(session).add_xp(
+        user_id=user.id,
+        xp_amount=xp,
+        activity_type=ActivityType.TRILHA_COMPLETION,
+        description="Seed",
+    )
+    return user.id
+
+
+async def test_leaderboard_endpoints_rank_players(client: TestClient, auth_headers, session):
+    await _create_player(session, "alice", 500)
+    await _create_player(session, "bob", 300)
+    await _create_player(session, "carol", 100)
+
+    client.post(
+        "/api/v1/gamification/complete-trilha",
+        params={"trilha_name": "Trilha Quantum", "xp_earned": 200},
+        headers=auth_headers,
+    )
+
+    top = client.get("/api/v1/gamification/leaderboard", params={"limit": 3}).json()
+    assert [entry["username"] for entry in top] == ["alice", "bob", "tester"]
+    assert [entry["rank"] for entry in top] == [1, 2, 3]
+
+    response = client.get(
+        "/api/v1/gamification/leaderboard/me", params={"radius": 1}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rank"] == 3
+    assert body["total_players"] == 4
+    assert [entry["username"] for entry in body["around"]] == ["bob", "tester", "carol"]
+
+
+async def test_leaderboard_is_served_from_the_backend(client: TestClient, session):
+    alice = await _create_player(session, "alice", 500)
+    client.get("/api/v1/gamification/leaderboard")  # loads the backend from the database
+
+    await GamificationRepository(session).add_xp(
+        user_id=alice,
+        xp_amount=700,
+        activity_type=ActivityType.TRILHA_COMPLETION,
+        description="Write-through",
+    )
+    await UserRepository(session).update(alice, UserUpdate(username="alice_q"))
+
+    top = client.get("/api/v1/gamification/leaderboard").json()
+    assert top[0]["username"] == "alice_q"
+    assert top[0]["total_xp"] == 1200
+    assert top[0]["level"] == GamificationLevel.EXPLORADOR.value
+
+
+class FakeRedis:
+    """The slice of redis.asyncio the leaderboard uses, with a settable clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.zsets = {}
+        self.hashes = {}
+        self.strings = {}  # key -> (value, expires_at)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def exists(self, key):
+        value = self.strings.get(key)
+        return int(value is not None and (value[1] is None or value[1] > self.now))
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and await self.exists(key):
+            return None
+        self.strings[key] = (value, None if ex is None else self.now + ex)
+        return True
+
+    async def delete(self, key):
+        self.zsets.pop(key, None)
+        self.strings.pop(key, None)
+
+    async def zadd(self, key, mapping, gt=False):
+        scores = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not gt or member not in scores or score > scores[member]:
+                scores[member] = score
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        entry = self.hashes.setdefault(key, {})
+        entry.update(mapping or {field: value})
+
+    async def hgetall(self, key):
+        return {field: str(value) for field, value in self.hashes.get(key, {}).items()}
+
+    def _ordered(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (-item[1], item[0]))
+
+    async def zrevrank(self, key, member):
+        members = [name for name, _ in self._ordered(key)]
+        return members.index(member) if member in members else None
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        return self._ordered(key)[start:end + 1]
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append(getattr(self.client, name)(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+def _entry(user_id, total_xp):
+    return LeaderboardEntry(
+        rank=0, user_id=user_id, username=f"user{user_id}", total_xp=total_xp,
+        level=GamificationLevel.INICIANTE, completed_trilhas=0,
+    )
+
+
+async def test_redis_leaderboard_ignores_out_of_order_writes_and_resyncs():
+    redis = FakeRedis()
+    board = RedisLeaderboard("redis://unused", sync_seconds=60, client=redis)
+    assert await board.needs_sync()
+
+    await board.load([_entry(1, 100), _entry(2, 50)])
+    assert not await board.needs_sync()
+
+    await board.record(2, 300, GamificationLevel.INICIANTE, 0)
+    await board.record(2, 200, GamificationLevel.INICIANTE, 0)  # stale, arrives late
+    assert _ranking(await board.top(2)) == [(1, 2, 300), (2, 1, 100)]
+    assert await board.rank(1) == 2
+
+    redis.now += 61
+    assert await board.needs_sync()  # periodic resync repairs lost write-throughs
+
+
+async def test_redis_reload_is_claimed_by_one_worker_and_never_lowers_scores():
+    redis = FakeRedis()
+    worker_a = RedisLeaderboard("redis://unused", sync_seconds=60, client=redis)
+    worker_b = RedisLeaderboard("redis://unused", sync_seconds=60, client=redis)
+    await worker_a.load([_entry(1, 100)])
+
+    redis.now += 61
+    assert await worker_a.needs_sync() and await worker_b.needs_sync()
+    assert await worker_a.try_begin_sync()
+    assert not await worker_b.try_begin_sync()  # serves the current set meanwhile
+
+    await worker_b.record(1, 400, GamificationLevel.INICIANTE, 0)  # lands while A reads its snapshot
+    await worker_a.load([_entry(1, 100), _entry(2, 50)])
+    assert _ranking(await worker_b.top(2)) == [(1, 1, 400), (2, 2, 50)]
+    assert not await worker_b.needs_sync()
+    redis.now += 61
+    assert await worker_b.try_begin_sync()  # the lock was released by the load
+
+
+async def test_in_memory_reload_is_coalesced_and_keeps_newer_scores(session, monkeypatch):
+    await _create_player(session, "alice", 100)
+    alice_id = (await UserRepository(session).get_by_email("alice@example.com")).id
+    snapshots = []
+    original = GamificationRepository.get_leaderboard_snapshot
+
+    async def slow_snapshot(self):
+        snapshots.append(1)
+        entries = await original(self)
+        await leaderboard.record(alice_id, 900, GamificationLevel.INICIANTE, 0)  # written during the load
+        await asyncio.sleep(0.01)
+        return entries
+
+    monkeypatch.setattr(GamificationRepository, "get_leaderboard_snapshot", slow_snapshot)
+    service = GamificationService(session)
+    await asyncio.gather(*(service._sync_leaderboard() for _ in range(5)))
+
+    assert len(snapshots) == 1
+    assert (await leaderboard.top(1))[0].total_xp == 900
+
+
+async def test_leaderboard_position_falls_back_to_the_database(client: TestClient, auth_headers, session, monkeypatch):
+    await _create_player(session, "alice", 500)
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(leaderboard, "rank", unavailable)
+    response = client.get("/api/v1/gamification/leaderboard/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["rank"] == 2
+    assert response.json()["total_players"] == 2
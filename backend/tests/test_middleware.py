@@ -0,0 +1,54 @@
+import re
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import SecurityHeadersMiddleware
+
+
+def _app(hsts: bool = False) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware, hsts=hsts)
+
+    @app.get("/json")
+    async def json_route():
+        return JSONResponse({"ok": True}, headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    @app.get("/stream")
+    async def stream_route():
+        async def chunks():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def test_security_and_timing_headers_are_added(client: TestClient):
+    response = client.get("/health")
+
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+    assert "strict-transport-security" not in response.headers
+    assert float(response.headers["x-process-time"]) >= 0
+    assert re.fullmatch(r"app;dur=\d+\.\d{3}", response.headers["server-timing"])
+
+
+def test_route_headers_win_and_hsts_is_optional():
+    with TestClient(_app(hsts=True)) as client:
+        response = client.get("/json")
+
+    assert response.headers.get_list("x-frame-options") == ["SAMEORIGIN"]
+    assert response.headers["strict-transport-security"].startswith("max-age=")
+
+
+def test_streaming_responses_pass_through():
+    with TestClient(_app()) as client:
+        response = client.get("/stream")
+
+    assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "server-timing" in response.headers
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.models import ActivityLog, ActivityType
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2025, 3, 13, 10, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_cursor_with_an_offset_is_normalised_to_naive_utc():
+    aware = datetime(2025, 3, 13, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert decode_cursor(encode_cursor(aware, 7)) == (datetime(2025, 3, 13, 10, 0), 7)
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", encode_cursor(datetime(2025, 1, 1), 1)[:-3]])
+def test_decode_cursor_rejects_garbage(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+async def test_activity_logs_page_by_cursor(client: TestClient, auth_headers, session, user_credentials):
+    user_id = user_credentials["user"].id
+    start = datetime(2025, 3, 13, 12, 0)
+    # pairs of rows share a timestamp so pages must break ties on id
+    session.add_all(
+        ActivityLog(
+            user_id=user_id,
+            activity_type=ActivityType.POMODORO_SESSION,
+            description=f"Sessão {index}",
+            xp_earned=10,
+            created_at=start + timedelta(minutes=index // 2),
+        )
+        for index in range(7)
+    )
+    await session.commit()
+
+    offset_page = client.get(
+        "/api/v1/gamification/activity-logs", params={"limit": 10}, headers=auth_headers
+    ).json()
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/gamification/activity-logs", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        pages.append([log["id"] for log in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [log_id for page in pages for log_id in page] == [log["id"] for log in offset_page]
+
+
+def test_invalid_cursor_is_rejected(client: TestClient, auth_headers):
+    response = client.get(
+        "/api/v1/gamification/activity-logs", params={"cursor": "garbage"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
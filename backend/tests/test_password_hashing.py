@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from app.core.password_hashing import PasswordHashPool
+from app.core.security import security_service
+from app.models.models import User
+
+LEGACY_HASH = "$2b$04$" + "a" * 53
+
+
+async def test_pool_keeps_the_event_loop_responsive():
+    pool = PasswordHashPool(max_workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(pool.run(lambda n: time.sleep(0.1) or n, n) for n in range(4)))
+    elapsed = time.perf_counter() - started
+    ticking.cancel()
+    pool.shutdown()
+
+    assert results == [0, 1, 2, 3]
+    assert 0.2 <= elapsed < 0.39  # two waves of two workers
+    assert ticks >= 10
+    metrics = pool.metrics()
+    assert metrics["completed"] == 4
+    assert metrics["max_queue_depth"] == 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["avg_hash_ms"] >= 100
+
+
+def test_needs_rehash_compares_bcrypt_cost():
+    assert security_service.needs_rehash(LEGACY_HASH)
+    assert not security_service.needs_rehash("$2b$12$" + "a" * 53)
+    assert not security_service.needs_rehash("hashed::not-bcrypt")
+
+
+async def test_login_rehashes_passwords_with_an_old_cost(client: TestClient, user_credentials, session, monkeypatch):
+    user = user_credentials["user"]
+    user_id, email = user.id, user.email
+    user.hashed_password = LEGACY_HASH
+    await session.commit()
+    monkeypatch.setattr(
+        security_service, "verify_password", lambda password, hashed: hashed == LEGACY_HASH or hashed == f"hashed::{password}"
+    )
+
+    response = client.post(
+        "/api/v1/auth/login", data={"username": email, "password": user_credentials["password"]}
+    )
+    assert response.status_code == 200
+
+    session.expire_all()
+    stored = (await session.exec(select(User).where(User.id == user_id))).one()
+    assert stored.hashed_password == f"hashed::{user_credentials['password']}"
+    assert client.get("/health").json()["password_hashing"]["completed"] >= 2
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.principal_cache import PrincipalCache
+from app.models.models import UserResponse, UserUpdate
+from app.repositories.base import UserRepository
+
+
+def _principal(user_id: int) -> UserResponse:
+    return UserResponse(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        full_name="User",
+        username=f"user{user_id}",
+        created_at="2024-01-01T00:00:00",
+        updated_at="2024-01-01T00:00:00",
+    )
+
+
+def test_entries_expire_evict_and_invalidate_per_user():
+    now = [0.0]
+    cache = PrincipalCache(ttl_seconds=30, max_entries=2, clock=lambda: now[0])
+    cache.set(1, "a", _principal(1))
+    cache.set(1, "b", _principal(1))
+    assert cache.get(1, "a").id == 1
+
+    cache.set(2, "c", _principal(2))  # evicts (1, "b"), the least recently used
+    assert cache.get(1, "b") is None
+
+    cache.invalidate_user(1)
+    assert cache.get(1, "a") is None
+    assert cache.get(2, "c") is not None
+
+    now[0] += 30
+    assert cache.get(2, "c") is None
+    assert cache.metrics()["entries"] == 0
+
+
+async def test_repeated_requests_skip_the_user_lookup(client: TestClient, auth_headers, engine):
+    user_queries = []
+
+    def count_user_queries(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_user_queries)
+    try:
+        for _ in range(3):
+            assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_user_queries)
+
+    assert len(user_queries) == 1
+
+
+async def test_user_changes_invalidate_the_cached_principal(client: TestClient, auth_headers, user_credentials, session):
+    user_id = user_credentials["user"].id
+    repo = UserRepository(session)
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Test User"
+
+    await repo.update(user_id, UserUpdate(full_name="Renamed User"))
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Renamed User"
+
+    await repo.delete(user_id)
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 400
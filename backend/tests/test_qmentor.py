@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.qmentor_cache import QMentorResponseCache, prompt_fingerprint
+from app.services.qmentor_client import (
+    QMentorClient,
+    QMentorOverloadedError,
+    QMentorTimeoutError,
+    QMentorUnavailableError,
+)
+from app.services.qmentor_service import QMentorService, q_mentor_service
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class AsyncFakeModel:
+    """Counts concurrent calls to generate_content_async"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        self.calls += 1
+        if stream:
+            return self._stream(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            return _Response(f"resposta: {prompt}")
+        finally:
+            self.active -= 1
+
+    async def _stream(self, prompt: str, pieces: int = 6):
+        text = f"resposta: {prompt}"
+        size = -(-len(text) // pieces)
+        for start in range(0, len(text), size):
+            await asyncio.sleep(self.delay)
+            yield _Response(text[start:start + size])
+
+
+class BlockingFakeModel:
+    """Synchronous-only model, like an SDK without async generation"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.threads = set()
+
+    def generate_content(self, prompt: str) -> _Response:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return _Response(prompt.upper())
+
+
+async def test_generate_bounds_concurrency_and_reports_queue_depth():
+    model = AsyncFakeModel()
+    client = QMentorClient(model, max_concurrency=2, timeout=1, queue_timeout=5)
+
+    results = await asyncio.gather(*(client.generate(f"q{i}") for i in range(6)))
+
+    assert results == [f"resposta: q{i}" for i in range(6)]
+    assert model.peak == 2
+    metrics = client.metrics()
+    assert metrics["completed"] == 6
+    assert metrics["in_flight"] == 0 and metrics["queued"] == 0
+    assert metrics["max_queue_depth"] == 6
+
+
+async def test_blocking_model_runs_off_the_event_loop():
+    client = QMentorClient(BlockingFakeModel(delay=0.3), max_concurrency=1, timeout=2, queue_timeout=2)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beating = asyncio.create_task(heartbeat())
+    try:
+        assert await client.generate("olá") == "OLÁ"
+    finally:
+        beating.cancel()
+        client.shutdown()
+
+    assert ticks >= 10
+    assert all(name.startswith("qmentor") for name in client.model.threads)
+
+
+async def test_generate_times_out_and_sheds_when_saturated():
+    client = QMentorClient(AsyncFakeModel(delay=0.5), max_concurrency=1, timeout=0.1, queue_timeout=0.02)
+
+    slow = asyncio.create_task(client.generate("lento"))
+    await asyncio.sleep(0)
+    with pytest.raises(QMentorOverloadedError):
+        await client.generate("na fila")
+    with pytest.raises(QMentorTimeoutError):
+        await slow
+
+    metrics = client.metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["rejected"] == 1
+
+    with pytest.raises(QMentorUnavailableError):
+        await QMentorClient(None).generate("sem modelo")
+
+
+def test_prompt_fingerprint_folds_case_accents_and_whitespace():
+    assert prompt_fingerprint("Área:  Cibersegurança\n") == prompt_fingerprint("área: CIBERSEGURANCA")
+    assert prompt_fingerprint("Área: Cibersegurança") != prompt_fingerprint("Área: Criptografia")
+
+
+async def test_response_cache_expires_and_evicts_least_recently_used():
+    now = [1000.0]
+    cache = QMentorResponseCache(max_entries=2, ttl_seconds=60, sqlite_path=None, clock=lambda: now[0])
+
+    await cache.set("a", "resposta a")
+    await cache.set("b", "resposta b")
+    assert await cache.get("A ") == "resposta a"  # refreshes "a"
+    await cache.set("c", "resposta c")  # evicts "b"
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == "resposta c"
+    now[0] += 61
+    assert await cache.get("a") is None
+
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["evictions"]) == (2, 2, 1)
+
+
+async def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "qmentor.sqlite3")
+    first = QMentorResponseCache(max_entries=8, ttl_seconds=60, sqlite_path=path)
+    await first.set("Dicas para Cibersegurança", "use PQC")
+    first.close()
+
+    second = QMentorResponseCache(max_entries=8, ttl_seconds=60, sqlite_path=path)
+    try:
+        assert await second.get("dicas para ciberseguranca") == "use PQC"
+        assert await second.get("dicas para ciberseguranca") == "use PQC"
+        assert (second.metrics()["disk_hits"], second.metrics()["hits"]) == (1, 1)
+    finally:
+        second.close()
+
+
+async def test_repeated_recommendations_are_served_from_cache():
+    model = AsyncFakeModel(delay=0)
+    service = QMentorService()
+    service.client = QMentorClient(model)
+    service.cache = QMentorResponseCache(max_entries=8, ttl_seconds=60, sqlite_path=None)
+
+    first = await service.get_quantum_safe_recommendations("Cibersegurança", "Beginner")
+    second = await service.get_quantum_safe_recommendations("  cibersegurança ", "beginner")
+
+    assert model.calls == 1
+    assert first["recommendations"] == second["recommendations"]
+    assert second["career_area"] == "  cibersegurança "
+
+
+def _uncached_service(model) -> QMentorService:
+    service = QMentorService()
+    service.client = QMentorClient(model, max_concurrency=8)
+    service.cache = QMentorResponseCache(max_entries=0, sqlite_path=None)
+    return service
+
+
+async def test_concurrent_identical_requests_share_one_generation():
+    model = AsyncFakeModel(delay=0.05)
+    service = _uncached_service(model)
+    query = "Dê 3 dicas rápidas para cybersecurity"
+
+    results = await asyncio.gather(
+        *(service.get_career_guidance(query, {"career_area": "cybersecurity"}) for _ in range(20))
+    )
+
+    assert model.calls == 1
+    assert {result["response"] for result in results} == {results[0]["response"]}
+    assert service.single_flight.metrics() == {"in_flight": 0, "started": 1, "coalesced": 19}
+
+    await service.get_career_guidance(query, {"career_area": "cybersecurity"})
+    assert model.calls == 2  # nothing in flight any more, so a new call starts
+
+
+async def test_coalesced_callers_share_the_failure():
+    class FailingModel(AsyncFakeModel):
+        async def generate_content_async(self, prompt):
+            await super().generate_content_async(prompt)
+            raise RuntimeError("quota exceeded")
+
+    model = FailingModel(delay=0.02)
+    service = _uncached_service(model)
+
+    results = await asyncio.gather(*(service.analyze_learning_path(["python"], "PQC engineer") for _ in range(5)))
+
+    assert model.calls == 1
+    assert all(result["status"] == "error" for result in results)
+
+
+async def test_abandoned_caller_does_not_cancel_the_shared_call():
+    model = AsyncFakeModel(delay=0.05)
+    service = _uncached_service(model)
+
+    impatient = asyncio.create_task(service.analyze_learning_path(["python"], "PQC engineer"))
+    await asyncio.sleep(0.01)
+    patient = asyncio.create_task(service.analyze_learning_path(["python"], "PQC engineer"))
+    await asyncio.sleep(0)
+    impatient.cancel()
+
+    assert (await patient)["status"] == "success"
+    assert model.calls == 1
+
+
+async def test_stream_yields_first_chunk_before_generation_finishes():
+    model = AsyncFakeModel(delay=0.05)
+    service = _uncached_service(model)
+    service.cache = QMentorResponseCache(max_entries=8, ttl_seconds=60, sqlite_path=None)
+
+    started = time.perf_counter()
+    stream = service.stream_career_guidance("Como começar em criptografia pós-quântica?")
+    first = await stream.__anext__()
+    time_to_first_chunk = time.perf_counter() - started
+    rest = [chunk async for chunk in stream]
+    total = time.perf_counter() - started
+
+    assert first.startswith("resposta")
+    assert len(rest) == 5
+    assert time_to_first_chunk < total / 3
+
+    # the streamed answer was cached and is replayed as one chunk
+    replay = [chunk async for chunk in service.stream_career_guidance("como começar em  criptografia pós-quântica?")]
+    assert replay == ["".join([first, *rest])]
+    assert model.calls == 1
+
+
+async def test_stream_works_with_a_synchronous_model():
+    class SyncStreamingModel:
+        def generate_content(self, prompt, stream=False):
+            return iter([_Response("olá "), _Response(""), _Response("mundo")])
+
+    client = QMentorClient(SyncStreamingModel(), max_concurrency=1)
+    try:
+        assert [chunk async for chunk in client.stream("oi")] == ["olá ", "mundo"]
+    finally:
+        client.shutdown()
+    assert client.metrics()["completed"] == 1
+
+
+def test_guidance_stream_endpoint_emits_sse_events(client: TestClient, monkeypatch):
+    monkeypatch.setattr(q_mentor_service, "client", QMentorClient(AsyncFakeModel(delay=0)))
+    monkeypatch.setattr(q_mentor_service, "cache", QMentorResponseCache(max_entries=0, sqlite_path=None))
+
+    response = client.post("/api/v1/qmentor/guidance/stream", json={"query": "Como começar em PQC?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert {lines[0] for lines in events[:-1]} == {"event: token"}
+    assert events[-1][0] == "event: done"
+    assert '"query": "Como começar em PQC?"' in events[-1][1]
+
+
+def test_guidance_stream_reports_unavailable_model(client: TestClient, monkeypatch):
+    monkeypatch.setattr(q_mentor_service, "client", QMentorClient(None))
+
+    response = client.post("/api/v1/qmentor/guidance/stream", json={"query": "Olá"})
+
+    assert response.status_code == 200
+    assert response.text.startswith("event: error\n")
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.qmentor_cache import QMentorResponseCache
+from app.services.qmentor_client import QMentorClient
+from app.services.qmentor_jobs import JobQueueFullError, JobStatus, QMentorJobQueue, require_single_process
+from app.services.qmentor_service import q_mentor_service
+from tests.test_qmentor import AsyncFakeModel
+
+
+class GatedHandler:
+    """Job handler that blocks until released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.payloads = []
+
+    async def __call__(self, payload):
+        self.payloads.append(payload)
+        await self.release.wait()
+        if payload.get("fail"):
+            raise RuntimeError("modelo indisponível")
+        return {"analysis": f"plano para {payload['target_role']}"}
+
+
+async def test_job_runs_in_background_and_watchers_see_each_transition():
+    handler = GatedHandler()
+    jobs = QMentorJobQueue(handler, workers=1, max_queued=5)
+    try:
+        job = jobs.submit({"target_role": "PQC engineer"})
+        assert job.status == JobStatus.QUEUED
+
+        updates = jobs.watch(job.id, heartbeat=1)
+        assert (await updates.__anext__()).status == JobStatus.QUEUED
+        await asyncio.sleep(0.01)
+        handler.release.set()
+        assert [update.status async for update in updates] == [JobStatus.RUNNING, JobStatus.SUCCEEDED]
+
+        finished = jobs.get(job.id)
+        assert finished.result == {"analysis": "plano para PQC engineer"}
+        assert finished.started_at is not None and finished.finished_at is not None
+
+        failing = jobs.submit({"target_role": "x", "fail": True})
+        async for update in jobs.watch(failing.id):
+            pass
+        assert update.status == JobStatus.FAILED
+        assert update.error == "modelo indisponível"
+    finally:
+        await jobs.stop()
+
+
+async def test_full_queue_sheds_and_stale_jobs_expire():
+    handler = GatedHandler()
+    jobs = QMentorJobQueue(handler, workers=1, max_queued=1, max_wait_seconds=0.05)
+    try:
+        running = jobs.submit({"target_role": "a"})
+        await asyncio.sleep(0.01)  # the worker takes it off the queue
+        waiting = jobs.submit({"target_role": "b"})
+        with pytest.raises(JobQueueFullError):
+            jobs.submit({"target_role": "c"})
+
+        await asyncio.sleep(0.1)
+        handler.release.set()
+        async for update in jobs.watch(waiting.id):
+            pass
+
+        assert jobs.get(running.id).status == JobStatus.SUCCEEDED
+        assert update.status == JobStatus.EXPIRED
+        assert [payload["target_role"] for payload in handler.payloads] == ["a"]
+        metrics = jobs.metrics()
+        assert (metrics["rejected"], metrics["expired"], metrics["succeeded"]) == (1, 1, 1)
+    finally:
+        await jobs.stop()
+
+
+def test_several_server_processes_are_refused():
+    require_single_process(1)
+    with pytest.raises(RuntimeError, match="WEB_CONCURRENCY=4"):
+        require_single_process(4)
+
+
+def test_learning_path_job_endpoints(client: TestClient, monkeypatch):
+    monkeypatch.setattr(q_mentor_service, "client", QMentorClient(AsyncFakeModel(delay=0.05)))
+    monkeypatch.setattr(q_mentor_service, "cache", QMentorResponseCache(max_entries=0, sqlite_path=None))
+
+    response = client.post(
+        "/api/v1/qmentor/learning-path/jobs",
+        json={"current_skills": ["python", "redes"], "target_role": "Engenheiro PQC"},
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert response.headers["location"].endswith(f"/api/v1/qmentor/jobs/{job['id']}")
+
+    events = client.get(f"/api/v1/qmentor/jobs/{job['id']}/events")
+    assert events.headers["content-type"].startswith("text/event-stream")
+    payloads = [
+        json.loads(line[len("data: "):])
+        for line in events.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert payloads[-1]["status"] == "succeeded"
+    assert payloads[-1]["result"]["target_role"] == "Engenheiro PQC"
+
+    polled = client.get(f"/api/v1/qmentor/jobs/{job['id']}").json()
+    assert polled["status"] == "succeeded"
+    assert polled["result"]["analysis"].startswith("resposta:")
+
+    assert client.get("/api/v1/qmentor/jobs/unknown").status_code == 404
+    assert client.get("/api/v1/qmentor/health").json()["jobs"]["succeeded"] >= 1
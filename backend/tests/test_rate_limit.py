@@ -0,0 +1,129 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import RateLimitMiddleware
+from app.core.rate_limit import Budget, InMemoryRateLimiter, RateLimiter
+from app.core.security import security_service
+
+
+def _limiter(now, per_minute=3, **options) -> RateLimiter:
+    backend = InMemoryRateLimiter(clock=lambda: now[0], **options)
+    budgets = {name: Budget.per_minute(per_minute) for name in ("auth", "mentor", "default")}
+    return RateLimiter(backend, budgets)
+
+
+def _app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.get("/api/v1/tracks/")
+    async def tracks():
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login")
+    async def login():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    return app
+
+
+async def test_bucket_refills_over_time():
+    now = [0.0]
+    backend = InMemoryRateLimiter(clock=lambda: now[0])
+    budget = Budget.per_minute(2)
+
+    assert (await backend.consume("k", budget))[0]
+    assert (await backend.consume("k", budget))[0]
+    allowed, retry_after = await backend.consume("k", budget)
+    assert not allowed
+    assert retry_after == 30
+
+    now[0] += 30
+    assert (await backend.consume("k", budget))[0]
+    assert not (await backend.consume("k", budget))[0]
+
+
+async def test_full_shards_prune_idle_buckets():
+    now = [0.0]
+    backend = InMemoryRateLimiter(shards=1, max_keys_per_shard=2, clock=lambda: now[0])
+    budget = Budget.per_minute(60)
+    for key in ("a", "b"):
+        await backend.consume(key, budget)
+
+    now[0] += 1  # "a" and "b" have refilled
+    await backend.consume("c", budget)
+    assert set(backend._shards[0]) == {"c"}
+
+
+async def test_pruning_uses_each_buckets_own_budget():
+    now = [0.0]
+    backend = InMemoryRateLimiter(shards=1, max_keys_per_shard=3, clock=lambda: now[0])
+    auth, default = Budget.per_minute(2), Budget.per_minute(600)
+    for _ in range(2):
+        await backend.consume("auth:ip", auth)  # drained, refills in a minute
+    await backend.consume("default:a", default)
+    await backend.consume("default:b", default)
+
+    now[0] += 1  # the default buckets have refilled, the auth one has not
+    await backend.consume("default:c", default)
+    assert set(backend._shards[0]) == {"auth:ip", "default:c"}
+    assert not (await backend.consume("auth:ip", auth))[0]
+
+    for key in ("default:d", "default:e"):
+        await backend.consume(key, default)  # shard full of active buckets
+    assert "auth:ip" in backend._shards[0]  # the throttled bucket is not evicted
+
+
+def test_429_with_retry_after_and_per_route_budgets():
+    with TestClient(_app(_limiter([0.0]))) as client:
+        for _ in range(3):
+            assert client.get("/api/v1/tracks/").status_code == 200
+        limited = client.get("/api/v1/tracks/")
+        assert limited.status_code == 429
+        assert limited.headers["retry-after"] == "20"
+
+        # Other route classes and exempt paths have their own budget
+        assert client.post("/api/v1/auth/login").status_code == 200
+        assert client.get("/health").status_code == 200
+
+
+def test_authenticated_users_have_their_own_bucket():
+    limiter = _limiter([0.0], per_minute=100)
+    limiter.budgets["default"] = Budget.per_minute(2)
+    token = security_service.create_access_token({"sub": "42"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestClient(_app(limiter)) as client:
+        assert client.get("/api/v1/tracks/", headers=headers).status_code == 200
+        # Same user from another address still spends the same user bucket
+        limiter.trust_forwarded = True
+        other_ip = {**headers, "X-Forwarded-For": "203.0.113.7"}
+        assert client.get("/api/v1/tracks/", headers=other_ip).status_code == 200
+        assert client.get("/api/v1/tracks/", headers=other_ip).status_code == 429
+        assert client.get("/api/v1/tracks/", headers={"X-Forwarded-For": "203.0.113.8"}).status_code == 200
+
+
+def test_untrusted_forwarded_header_is_ignored_and_warned_once(caplog):
+    limiter = _limiter([0.0])
+    limiter.warn_untrusted_forwarded = True
+    proxied = {"type": "http", "client": ("10.0.0.1", 5000), "headers": [(b"x-forwarded-for", b"203.0.113.7")]}
+
+    with caplog.at_level("WARNING", logger="app.core.rate_limit"):
+        assert limiter.client_ip(proxied) == "10.0.0.1"
+        assert limiter.client_ip(proxied) == "10.0.0.1"
+
+    warnings = [r for r in caplog.records if "RATE_LIMIT_TRUST_FORWARDED" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_app_limits_login_attempts(client: TestClient):
+    form = {"username": "nobody@example.com", "password": "wrong"}
+    statuses = [client.post("/api/v1/auth/login", data=form).status_code for _ in range(11)]
+
+    assert statuses[:10] == [401] * 10
+    assert statuses[10] == 429
+    assert client.get("/health").status_code == 200
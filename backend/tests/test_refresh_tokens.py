@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.core.security import security_service
+from app.models.models import RefreshToken
+from app.repositories.base import RefreshTokenRepository, UserRepository
+
+
+def _login(client: TestClient, user_credentials):
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": user_credentials["user"].email, "password": user_credentials["password"]},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _refresh(client: TestClient, refresh_token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_in_one_statement(client: TestClient, user_credentials, engine):
+    tokens = _login(client, user_credentials)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = _refresh(client, tokens["refresh_token"])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE REFRESH_TOKENS")
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.json()["email"] == user_credentials["user"].email
+
+
+async def test_reusing_a_rotated_token_revokes_the_family(client: TestClient, user_credentials, session):
+    first_session = _login(client, user_credentials)
+    other_session = _login(client, user_credentials)
+    rotated = _refresh(client, first_session["refresh_token"]).json()
+
+    assert _refresh(client, first_session["refresh_token"]).status_code == 401  # replayed
+    assert _refresh(client, rotated["refresh_token"]).status_code == 401  # family is gone
+    assert _refresh(client, other_session["refresh_token"]).status_code == 200
+
+    families = (await session.exec(select(RefreshToken).order_by(RefreshToken.created_at))).all()
+    assert [family.revoked_reason for family in families] == ["reuse", None]
+    assert families[0].generation == 1
+
+
+async def test_inactive_users_cannot_refresh(client: TestClient, user_credentials, session):
+    tokens = _login(client, user_credentials)
+    await UserRepository(session).delete(user_credentials["user"].id)
+
+    response = _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
+
+    family = (await session.exec(select(RefreshToken))).one()
+    assert family.revoked_at is None  # a failed refresh is not reuse
+
+
+async def test_password_reset_revokes_every_family(client: TestClient, user_credentials, session):
+    tokens = [_login(client, user_credentials) for _ in range(2)]
+    user = await UserRepository(session).get_by_email(user_credentials["user"].email)
+    reset_token = security_service.generate_password_reset_token(user.email)
+    user.password_reset_token = reset_token
+    await session.commit()
+
+    response = client.post(
+        "/api/v1/auth/reset-password", params={"token": reset_token, "new_password": "new-strong-password"}
+    )
+    assert response.status_code == 200
+
+    for session_tokens in tokens:
+        assert _refresh(client, session_tokens["refresh_token"]).status_code == 401
+    families = (await session.exec(select(RefreshToken))).all()
+    assert {family.revoked_reason for family in families} == {"password_reset"}
+
+
+async def test_purge_drops_expired_families(session, user_credentials):
+    repo = RefreshTokenRepository(session)
+    user_id = user_credentials["user"].id
+    await repo.create_family("old", user_id, "jti-old", "hash", datetime.utcnow() - timedelta(seconds=1))
+    await repo.create_family("live", user_id, "jti-live", "hash", datetime.utcnow() + timedelta(days=1))
+
+    assert await repo.purge_expired() == 1
+    assert [family.family_id for family in (await session.exec(select(RefreshToken))).all()] == ["live"]
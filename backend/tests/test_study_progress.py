@@ -0,0 +1,93 @@
+from datetime import date, datetime, time, timedelta
+
+from sqlmodel import select
+
+from app.models.models import StudyDailyRollup, StudySession
+from app.repositories.base import StudySessionRepository
+
+
+async def _add_sessions(session, user_id, entries):
+    repo = StudySessionRepository(session)
+    for day, minutes in entries:
+        await repo.log_session(
+            user_id, minutes, session_date=datetime.combine(day, time(hour=10))
+        )
+
+
+async def test_weekly_progress_and_streak_are_aggregated(session, user_credentials):
+    user_id = user_credentials["user"].id
+    reference = date(2025, 3, 13)  # Thursday
+    await _add_sessions(
+        session,
+        user_id,
+        [
+            (reference, 30),
+            (reference, 30),
+            (reference - timedelta(days=1), 90),
+            (reference - timedelta(days=2), 15),
+            # gap on the 10th breaks the streak
+            (reference - timedelta(days=4), 60),
+            (reference + timedelta(days=7), 45),  # next week, ignored
+        ],
+    )
+
+    progress = await StudySessionRepository(session).get_weekly_progress(user_id, reference)
+
+    assert [day.hours for day in progress.week] == [0.0, 0.25, 1.5, 1.0, 0.0, 0.0, 0.0]
+    assert progress.total_hours == 2.75
+    assert progress.streak == 3
+
+
+async def test_streak_is_zero_without_a_session_on_the_reference_day(session, user_credentials):
+    user_id = user_credentials["user"].id
+    reference = date(2025, 3, 13)
+    await _add_sessions(session, user_id, [(reference - timedelta(days=1), 25)])
+
+    repo = StudySessionRepository(session)
+    assert (await repo.get_weekly_progress(user_id, reference)).streak == 0
+    assert (await repo.get_weekly_progress(user_id, reference - timedelta(days=1))).streak == 1
+
+
+async def test_total_hours_sums_all_sessions(session, user_credentials):
+    user_id = user_credentials["user"].id
+    repo = StudySessionRepository(session)
+    assert await repo.get_total_hours(user_id) == 0.0
+
+    await _add_sessions(session, user_id, [(date(2024, 1, 1), 90), (date(2025, 1, 1), 45)])
+    assert await repo.get_total_hours(user_id) == 2.25
+
+
+async def test_log_session_upserts_daily_rollup(session, user_credentials):
+    user_id = user_credentials["user"].id
+    day = date(2025, 3, 13)
+    await _add_sessions(session, user_id, [(day, 25), (day, 50), (day + timedelta(days=1), 10)])
+
+    rollups = (await session.exec(
+        select(StudyDailyRollup).where(StudyDailyRollup.user_id == user_id).order_by(StudyDailyRollup.day)
+    )).all()
+    assert [(rollup.day, rollup.minutes, rollup.sessions) for rollup in rollups] == [
+        (day, 75, 2),
+        (day + timedelta(days=1), 10, 1),
+    ]
+
+
+async def test_rebuild_daily_rollups_backfills_history(session, user_credentials):
+    user_id = user_credentials["user"].id
+    day = date(2025, 3, 13)
+    for minutes in (20, 40):
+        session.add(
+            StudySession(
+                user_id=user_id,
+                duration_minutes=minutes,
+                session_date=datetime.combine(day, time(hour=23, minute=30)),
+            )
+        )
+    await session.commit()
+
+    repo = StudySessionRepository(session)
+    assert await repo.get_total_hours(user_id) == 0.0
+
+    assert await repo.rebuild_daily_rollups() == 1
+    assert await repo.rebuild_daily_rollups() == 1  # idempotent
+    assert await repo.get_total_hours(user_id) == 1.0
+    assert (await repo.get_weekly_progress(user_id, day)).streak == 1
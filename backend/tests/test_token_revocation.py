@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.core.bloom_filter import BloomFilter
+from app.repositories.base import RevokedTokenRepository
+from app.services.token_revocation import TokenRevocationService
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"member-{index}")
+
+    assert all(f"member-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+    assert not bloom.is_saturated
+
+
+def _login(client: TestClient, user_credentials):
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": user_credentials["user"].email, "password": user_credentials["password"]},
+    )
+    return response.json()
+
+
+def test_logout_revokes_access_and_refresh_tokens(client: TestClient, user_credentials):
+    tokens = _login(client, user_credentials)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    other_session = {"Authorization": f"Bearer {_login(client, user_credentials)['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.get("/api/v1/auth/me", headers=other_session).status_code == 200
+
+
+async def test_revocations_from_other_workers_arrive_on_refresh(session, user_credentials):
+    now = [0.0]
+    worker = TokenRevocationService(refresh_seconds=5, capacity=100, clock=lambda: now[0])
+    assert not await worker.is_revoked(session, "jti-1")  # initial load
+
+    expires_at = datetime.utcnow() + timedelta(minutes=30)
+    await RevokedTokenRepository(session).add("jti-1", expires_at, user_credentials["user"].id)
+    assert not await worker.is_revoked(session, "jti-1")  # filter not refreshed yet
+    assert worker.metrics()["exact_lookups"] == 0
+
+    now[0] += 5
+    assert await worker.is_revoked(session, "jti-1")
+    assert not await worker.is_revoked(session, "jti-2")
+    assert worker.metrics()["exact_lookups"] == 1
+
+
+async def test_purge_drops_only_expired_revocations(session):
+    repo = RevokedTokenRepository(session)
+    await repo.add("expired", datetime.utcnow() - timedelta(seconds=1))
+    await repo.add("live", datetime.utcnow() + timedelta(minutes=5))
+    await repo.add("live", datetime.utcnow() + timedelta(minutes=5))  # idempotent
+
+    assert await repo.purge_expired() == 1
+    assert [row.jti for row in await repo.revoked_since(None)] == ["live"]
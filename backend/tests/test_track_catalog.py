@@ -0,0 +1,124 @@
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.models.models import LearningTrack, TrackCatalogVersion, TrackLesson
+from app.repositories import base as repositories
+from app.repositories.base import DEFAULT_TRACKS, TRACK_CATALOG_VERSION, TrackRepository
+from app.repositories.track_catalog import TrackCatalogCache
+
+
+async def test_catalog_is_seeded_once_per_version(session):
+    repo = TrackRepository(session)
+
+    assert await repo.get_catalog_version() == TRACK_CATALOG_VERSION
+    assert await repo.ensure_defaults() is False
+
+    versions = (await session.exec(select(TrackCatalogVersion))).all()
+    assert len(versions) == 1
+
+    tracks = (await session.exec(select(LearningTrack))).all()
+    assert {track.slug for track in tracks} == {track["slug"] for track in DEFAULT_TRACKS}
+
+
+async def test_concurrent_seeds_and_rollbacks_keep_one_stamp_per_version(session, monkeypatch):
+    repo = TrackRepository(session)
+
+    async def not_seeded_yet():
+        return None  # as seen by a second worker that started at the same time
+
+    monkeypatch.setattr(repo, "get_catalog_version", not_seeded_yet)
+    assert await repo.ensure_defaults() is True
+    monkeypatch.undo()
+
+    monkeypatch.setattr(repositories, "TRACK_CATALOG_VERSION", "next-version")
+    assert await repo.ensure_defaults() is True
+    monkeypatch.setattr(repositories, "TRACK_CATALOG_VERSION", TRACK_CATALOG_VERSION)  # rolled back
+    assert await repo.ensure_defaults() is True
+
+    versions = (await session.exec(select(TrackCatalogVersion.version))).all()
+    assert sorted(versions) == sorted([TRACK_CATALOG_VERSION, "next-version"])
+    assert await repo.get_catalog_version() == TRACK_CATALOG_VERSION
+
+
+async def test_catalog_change_is_applied_in_place(session, monkeypatch):
+    changed = [dict(track) for track in DEFAULT_TRACKS]
+    changed[0] = {
+        **changed[0],
+        "name": "Computação Quântica Avançada",
+        "modules": [
+            {
+                **changed[0]["modules"][0],
+                "lessons": changed[0]["modules"][0]["lessons"]
+                + [{"slug": "q1l4", "title": "Números Complexos", "order": 4}],
+            }
+        ],
+    }
+    monkeypatch.setattr(repositories, "DEFAULT_TRACKS", changed)
+    monkeypatch.setattr(repositories, "TRACK_CATALOG_VERSION", "next-version")
+
+    repo = TrackRepository(session)
+    assert await repo.ensure_defaults() is True
+    assert await repo.get_catalog_version() == "next-version"
+
+    track = (await session.exec(select(LearningTrack).where(LearningTrack.slug == "quantum"))).one()
+    assert track.name == "Computação Quântica Avançada"
+    lesson = (await session.exec(select(TrackLesson).where(TrackLesson.slug == "q1l4"))).one()
+    assert lesson.order == 4
+
+
+async def test_catalog_snapshot_is_reused_until_version_changes(session, monkeypatch):
+    repo = TrackRepository(session)
+
+    snapshot = await repo.get_catalog()
+    assert snapshot.version == TRACK_CATALOG_VERSION
+    assert await repo.get_catalog() is snapshot
+    assert [track.slug for track in snapshot.tracks] == [track["slug"] for track in DEFAULT_TRACKS]
+
+    monkeypatch.setattr(repositories, "TRACK_CATALOG_VERSION", "next-version")
+    assert await repo.ensure_defaults() is True
+    refreshed = await repo.get_catalog()
+    assert refreshed is not snapshot
+    assert refreshed.version == "next-version"
+
+
+async def test_catalog_snapshot_survives_a_code_version_mismatch(session, engine, monkeypatch):
+    # e.g. a rolling deploy: this worker's code expects a catalog nobody seeded yet
+    monkeypatch.setattr(repositories, "TRACK_CATALOG_VERSION", "not-seeded")
+    now = [0.0]
+    cache = TrackCatalogCache(refresh_seconds=60, clock=lambda: now[0])
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    snapshot = await cache.get(session)
+    assert snapshot.version == TRACK_CATALOG_VERSION  # what the database has
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert await cache.get(session) is snapshot
+        assert statements == []
+
+        now[0] += 60
+        assert await cache.get(session) is snapshot  # version re-checked, tree kept
+        assert len(statements) == 1
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def test_track_progress_joins_catalog_with_user_progress(session, user_credentials):
+    test_user_id = user_credentials["user"].id
+    repo = TrackRepository(session)
+    snapshot = await repo.get_catalog()
+    module = snapshot.tracks[0].modules[0]
+
+    for lesson in module.lessons:
+        assert await repo.set_lesson_completion(test_user_id, lesson.id, True) is not None
+    assert await repo.set_lesson_completion(test_user_id, -1, True) is None
+
+    tracks = await repo.get_tracks_with_progress(test_user_id)
+    assert tracks[0].modules[0].progress == 100.0
+    assert all(lesson.completed for lesson in tracks[0].modules[0].lessons)
+
+    summary = await repo.get_track_summary(test_user_id)
+    assert summary[0].progress == tracks[0].progress
@@ -352,8 +352,12 @@ class ApiService {
   }
 
   async logout(): Promise<void> {
+    const refreshToken = localStorage.getItem('refresh_token');
     try {
-      await this.request('/auth/logout', { method: 'POST' });
+      await this.request('/auth/logout', {
+        method: 'POST',
+        body: refreshToken ? JSON.stringify({ refresh_token: refreshToken }) : undefined,
+      });
     } finally {
       this.clearToken();
     }
@@ -693,7 +697,10 @@ class ApiService {
 
   async logout(): Promise<void> {
     try {
-      await this.request('/auth/logout', { method: 'POST' });
+      await this.request('/auth/logout', {
+        method: 'POST',
+        body: this.refreshToken ? JSON.stringify({ refresh_token: this.refreshToken }) : undefined,
+      });
     } finally {
       this.clearTokens();
     }